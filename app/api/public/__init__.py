@@ -1,10 +1,19 @@
 import os
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
+from starlette.concurrency import run_in_threadpool
+
+from app.core.api.admission import admission_controller
 from app.core.api.base_controller import APIControllerFactory, BaseAPIController
+from app.core.api.exceptions import AdmissionRejectedException, RateLimitedException
+from app.core.api.rate_limit import get_client_host, rate_limiter
+from app.core.common.base_schema import APIRequestContext
+from app.core.common.config import config
+from app.core.schema.rate_limit import RateLimitCounterModel
 from app.services.authentication.provider import AuthenticationServiceProvider
 from app.services.authentication.service import AuthenticationService
+from app.services.rate_limit.service import MongoRateLimitBackend
 from app.services.tm_db.generate_index import MongoDBIndexService
 
 from app.services.tm_db.service import TMMongoDBServicePool
@@ -20,13 +29,17 @@ auth_service_provider: AuthenticationServiceProvider = AuthenticationServiceProv
 factory.set_mongodb_service_pool(tm_db_service_pool)
 auth_service_provider.set_auth_service(AuthenticationService(tm_db_service_pool))
 
+if config.RATE_LIMIT_BACKEND == 'mongo':
+    index_service.generate_indexes(schema=RateLimitCounterModel, service_from_factory=factory)
+    rate_limiter.set_backend(MongoRateLimitBackend(tm_db_service_pool))
+
 public_router: APIRouter = APIRouter()
 
 dir_path = os.path.dirname(__file__)
 controllers = [
     ctrl
     for ctrl in os.listdir(dir_path)
-    if os.path.isdir(os.path.join(dir_path, ctrl)) and ctrl != "__pycache__"
+    if os.path.isfile(os.path.join(dir_path, ctrl, 'controller.py'))
 ]
 print('Mounting controllers', controllers)
 
@@ -46,8 +59,21 @@ def route_builder(ctrl: BaseAPIController):
         schema=ctrl.get_request_type(),
         service_from_factory=factory
     )
-    def handler(req: ctrl.get_request_type()):  # type: ignore[valid-type]
-        return ctrl.invoke(req)
+    async def handler(req: ctrl.get_request_type(), http_request: Request, http_response: Response):  # type: ignore[valid-type]
+        context = APIRequestContext(
+            headers=dict(http_request.headers),
+            client_host=get_client_host(http_request)
+        )
+        # Requests over their rate limit are turned away before queueing, the database or any hashing,
+        # then requests wait for admission on the event loop, only admitted ones take a worker thread
+        try:
+            await rate_limiter.check(ctrl.get_controller_name(), ctrl.get_rate_limit_keys(req, context))
+            async with admission_controller.admit(ctrl.get_controller_name(), ctrl.admission_class, ctrl.max_concurrency):
+                output = await run_in_threadpool(ctrl.invoke, req, context)
+        except (AdmissionRejectedException, RateLimitedException) as e:
+            raise ctrl.on_error(e)
+        http_response.headers.update(context.response_headers)
+        return output
     handler.__name__ = f'{ctrl.get_controller_name()}_handler'
     return handler
 
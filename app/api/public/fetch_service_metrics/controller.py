@@ -0,0 +1,38 @@
+from http import HTTPMethod
+from typing import List
+
+from app.api.public.fetch_service_metrics.models import FetchServiceMetricsRequest, FetchServiceMetricsResponse
+from app.core.api.base_controller import BaseAPIController
+from app.core.common.metrics import metrics_registry
+
+
+class APIController(BaseAPIController[FetchServiceMetricsRequest, FetchServiceMetricsResponse]):
+    """
+    **Synchronous API endpoint for fetching the metrics of the service**
+
+    Returns the state of the circuit breaker of each MongoDB cluster and the load of the
+    admission gates, for dashboards and alerting. Public so it stays reachable while
+    the database, and with it authentication, is down, clusters are reported under a label
+    rather than their hosts (see `TMMongoDBServicePool.get_cluster_label`).
+
+    """
+    _full_dir: str = __file__
+    api_tags: List[str] = ['Synchronous API']
+
+    def get_path(self) -> str:
+        return '/fetch_service_metrics'
+
+    def get_method(self) -> str:
+        """
+        return HTTP method intended
+        """
+        return HTTPMethod.POST
+
+    def process_request(self, request: FetchServiceMetricsRequest) -> FetchServiceMetricsResponse:
+        return FetchServiceMetricsResponse(metrics=metrics_registry.snapshot())
+
+    def validate_request(self, request: FetchServiceMetricsRequest) -> bool:
+        """
+        Validate the request
+        """
+        return True
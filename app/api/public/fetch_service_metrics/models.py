@@ -0,0 +1,19 @@
+from typing import Any, Dict, Mapping
+
+from pydantic import BaseModel, Field
+
+
+class FetchServiceMetricsRequest(BaseModel):
+    """
+    Represents a request model for fetching the metrics of the service.
+    """
+
+
+class FetchServiceMetricsResponse(BaseModel):
+    """
+    Represents a response model for fetching the metrics of the service.
+
+    Attributes:
+        metrics: current metrics of each registered component, e.g. circuit_breakers and admission
+    """
+    metrics: Dict[str, Mapping[str, Any]] = Field(default_factory=dict)
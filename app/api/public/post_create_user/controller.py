@@ -1,5 +1,5 @@
 from http import HTTPMethod
-from typing import List
+from typing import List, Sequence
 
 from pymongo.collection import Collection
 from pymongo.errors import DuplicateKeyError
@@ -24,6 +24,8 @@ class APIController(
     """
     _full_dir: str = __file__
     api_tags: List[str] = ['Synchronous API']
+    admission_class: str = 'auth'
+    rate_limit_keys: Sequence[str] = ('ip',)
 
     def get_path(self) -> str:
         return '/post_create_user'
@@ -1,20 +1,23 @@
 import hashlib
 import bcrypt
-from datetime import datetime
 from http import HTTPMethod
-from typing import List
-
-from pymongo.collection import Collection
+from typing import List, Sequence
 
 from app.api.public.post_refresh_token.models import RefreshTokenRequest, RefreshTokenResponse
 from app.core.api.base_controller import BaseAPIController
-from app.core.common.config import config
-from app.services.tm_db.provider import TMMongoDBServiceProvider
+from app.services.authentication.revocation import revocation_list
+from app.services.authentication.tokens import (
+    decode_signed_token,
+    encode_signed_token,
+    get_token_expiry,
+    is_signed_token
+)
+from app.services.credentials.provider import CredentialRepositoryProvider
 
 
 class APIController(
     BaseAPIController[RefreshTokenRequest, RefreshTokenResponse],
-    TMMongoDBServiceProvider
+    CredentialRepositoryProvider
 ):
     """
     **Synchronous API endpoint for fetching completeness summary**
@@ -26,6 +29,8 @@ class APIController(
     """
     _full_dir: str = __file__
     api_tags: List[str] = ['Synchronous API']
+    admission_class: str = 'auth'
+    rate_limit_keys: Sequence[str] = ('ip', 'email')
 
     def get_path(self) -> str:
         return '/post_refresh_token'
@@ -41,26 +46,26 @@ class APIController(
         return hashlib.sha256(token+bcrypt.gensalt()).hexdigest()
 
     def process_request(self, request: RefreshTokenRequest) -> RefreshTokenResponse:
-        try:
-            nosql_service: Collection = self.get_mongodb_service_from_collection(request.collection)
-            user = nosql_service.find_one({'auth_token': request.token})
+        token_expires = get_token_expiry()
 
-            if not user:
+        # A signed token is replaced by a new one for the same credentials, and revoked
+        if is_signed_token(request.token):
+            claims = decode_signed_token(request.token)
+            if not claims or revocation_list.is_revoked(claims.token_id):
                 raise Exception('Invalid token. Please sign in again.')
 
-            auth_token = self._generate_auth_token(user.get('token'))
-            token_expires = datetime.utcnow().timestamp() + config.AUTH_TOKEN_EXPIRY
-
-            nosql_service.update_one(
-                {'auth_token': request.token},
-                {'$set': {
-                    'auth_token': auth_token,
-                    'token_expires': token_expires
-                }}
-            )
+            auth_token = encode_signed_token(claims.subject, token_expires, claims.company_code)
+            revocation_list.revoke(self.get_mongodb_service_pool(), claims)
+            self.get_credential_repository().refresh_session(request.token, auth_token, token_expires)
             return RefreshTokenResponse(auth_token=auth_token, token_expires=token_expires)
-        except Exception as e:
-            raise e
+
+        # The new token is seeded from the current one, so the rotation is a single write
+        auth_token = self._generate_auth_token(request.token.encode('utf-8'))
+
+        if not self.get_credential_repository().refresh_session(request.token, auth_token, token_expires):
+            raise Exception('Invalid token. Please sign in again.')
+
+        return RefreshTokenResponse(auth_token=auth_token, token_expires=token_expires)
 
     def validate_request(self, request: RefreshTokenRequest) -> bool:
         """
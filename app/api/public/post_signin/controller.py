@@ -1,20 +1,23 @@
-import hashlib
-import bcrypt
-from datetime import datetime
+import logging
 from http import HTTPMethod
-from typing import List
+from typing import List, Sequence
 
-from pymongo.collection import Collection
+from pymongo.errors import PyMongoError
 
-from app.api.public.post_signin.models import SignInRequest, SignInResponse, CollectionEnum
+from app.api.public.post_signin.exceptions import InvalidCredentialsException
+from app.api.public.post_signin.models import SignInRequest, SignInResponse
 from app.core.api.base_controller import BaseAPIController
 from app.core.common.config import config
-from app.services.tm_db.provider import TMMongoDBServiceProvider
+from app.services.authentication.tokens import get_token_expiry, issue_auth_token
+from app.services.credentials.hashing import get_current_params, hash_password, needs_rehash, new_salt, verify_password
+from app.services.credentials.provider import CredentialRepositoryProvider
+
+logger = logging.getLogger('uvicorn')
 
 
 class APIController(
     BaseAPIController[SignInRequest, SignInResponse],
-    TMMongoDBServiceProvider
+    CredentialRepositoryProvider
 ):
     """
     **Synchronous API endpoint for fetching completeness summary**
@@ -26,6 +29,8 @@ class APIController(
     """
     _full_dir: str = __file__
     api_tags: List[str] = ['Synchronous API']
+    admission_class: str = 'signin'
+    rate_limit_keys: Sequence[str] = ('ip', 'email')
 
     def get_path(self) -> str:
         return '/post_signin'
@@ -36,48 +41,48 @@ class APIController(
         """
         return HTTPMethod.POST
 
-    @staticmethod
-    def _password_match(text_plain_password: bytes, salt: bytes, hashed_password: bytes) -> bool:
-        return bcrypt.checkpw(
-            hashlib.pbkdf2_hmac('sha256', text_plain_password, salt, 14),
-            hashed_password
+    def get_request_timeout(self) -> float:
+        """
+        Get the time budget of the request, with room for verifying the password and rehashing it on top of the database operations.
+        """
+        return super().get_request_timeout() + 2 * config.PASSWORD_HASH_TIMEOUT_SECONDS
+
+    def process_request(self, request: SignInRequest) -> SignInResponse:
+        credential_repository = self.get_credential_repository()
+        user_cred = credential_repository.find_by_email(request.email)
+
+        password: bytes = request.password.encode('utf-8')
+
+        if not user_cred or not verify_password(password, user_cred):
+            raise InvalidCredentialsException('Invalid email or password.')
+
+        # The plain text password is only at hand now, outdated hashes are upgraded one sign-in at a time
+        if needs_rehash(user_cred):
+            self._rehash_password(user_cred, password)
+
+        token_expires = get_token_expiry()
+        auth_token = issue_auth_token(
+            str(user_cred['_id']), user_cred.get('token'), token_expires, user_cred.get('company_code')
         )
 
-    @staticmethod
-    def _generate_auth_token(token: bytes) -> str:
-        return hashlib.sha256(token+bcrypt.gensalt()).hexdigest()
+        credential_repository.create_session(user_cred, auth_token, token_expires)
+
+        return SignInResponse(auth_token=auth_token, token_expires=token_expires)
+
+    def _rehash_password(self, user_cred: dict, password: bytes) -> None:
+        params = get_current_params()
+        salt: bytes = new_salt()
 
-    def process_request(self, request: SignInRequest) -> SignInResponse:
         try:
-            nosql_service: Collection = self.get_mongodb_service_from_collection(CollectionEnum.AuthCredentials.value)
-            user_cred = nosql_service.find_one({'email': request.email})
-
-            if not self._password_match(
-                    request.password.encode('utf-8'),
-                    user_cred.get('salt'),
-                    user_cred.get('password')
-            ):
-                raise Exception('Invalid password')
-
-            auth_token = self._generate_auth_token(user_cred.get('token'))
-            token_expires = datetime.utcnow().timestamp() + config.AUTH_TOKEN_EXPIRY
-
-            nosql_service.update_one(
-                {'email': request.email},
-                {'$set': {
-                    'auth_token': auth_token,
-                    'token_expires': token_expires,
-                    'is_signed_in': True
-                }}
+            self.get_credential_repository().update_password_hash(
+                user_cred, hash_password(password, salt, params), salt, params
             )
-            return SignInResponse(auth_token=auth_token, token_expires=token_expires)
-        except Exception as e:
-            raise e
+        except PyMongoError as e:
+            logger.warning(f'Rehashing the password of {user_cred["email"]} failed, retrying on next sign-in: {str(e)}')
 
     def validate_request(self, request: SignInRequest) -> bool:
         """
-        Validate the email  field if it has record on Users and Auth collection.
+        Validate the request, the credential lookup in `process_request` tells whether the email exists.
         """
-        nosql_service: Collection = self.get_mongodb_service_from_collection(CollectionEnum.Users.value)
-        return bool(nosql_service.find_one({'email': request.email}))
+        return True
 
@@ -0,0 +1,13 @@
+from app.core.common.base_exception import BaseCustomException
+
+
+class PostSignInException(BaseCustomException):
+    """
+    Base exception for post_signin
+    """
+
+
+class InvalidCredentialsException(PostSignInException):
+    """
+    Raise when the email is unknown or the password doesn't match.
+    """
@@ -1,21 +1,20 @@
-import hashlib
 from http import HTTPMethod
-from typing import List
+from typing import List, Sequence
 
-import bcrypt
-from pymongo.collection import Collection
 from pymongo.errors import DuplicateKeyError
 
 from app.api.public.post_signup.exceptions import PostSignUpException, SignUpException
 from app.api.public.post_signup.models import AuthCredentialCreateRequest, AuthCredentialCreateResponse
 from app.core.api.base_controller import BaseAPIController
+from app.core.common.config import config
 from app.core.schema.auth import PrivateAuthInfo
-from app.services.tm_db.provider import TMMongoDBServiceProvider
+from app.services.credentials.hashing import get_current_params, hash_password
+from app.services.credentials.provider import CredentialRepositoryProvider
 
 
 class APIController(
     BaseAPIController[AuthCredentialCreateRequest, AuthCredentialCreateResponse],
-    TMMongoDBServiceProvider
+    CredentialRepositoryProvider
 ):
     """
     **Synchronous API endpoint for fetching completeness summary**
@@ -27,6 +26,8 @@ class APIController(
     """
     _full_dir: str = __file__
     api_tags: List[str] = ['Synchronous API']
+    admission_class: str = 'signin'
+    rate_limit_keys: Sequence[str] = ('ip', 'email')
 
     def get_path(self) -> str:
         return '/post_signup'
@@ -37,21 +38,19 @@ class APIController(
         """
         return HTTPMethod.POST
 
-    @staticmethod
-    def _generate_password(text_plain_password: bytes, salt: bytes) -> bytes:
-        return bcrypt.hashpw(
-            hashlib.pbkdf2_hmac('sha256', text_plain_password, salt, 14),
-            bcrypt.gensalt(14)
-        )
+    def get_request_timeout(self) -> float:
+        """
+        Get the time budget of the request, with room for hashing the password on top of the database operations.
+        """
+        return super().get_request_timeout() + config.PASSWORD_HASH_TIMEOUT_SECONDS
 
     def process_request(self, request: AuthCredentialCreateRequest) -> AuthCredentialCreateResponse:
         try:
-            auth_request: PrivateAuthInfo = PrivateAuthInfo(**request.model_dump())
-
-            nosql_service: Collection = self.get_mongodb_service_from_collection(auth_request.collection)
-            auth_request.password = self._generate_password(auth_request.password, auth_request.salt)
+            params = get_current_params()
+            auth_request: PrivateAuthInfo = PrivateAuthInfo(**request.model_dump(), password_params=params)
+            auth_request.password = hash_password(auth_request.password, auth_request.salt, params)
 
-            nosql_service.insert_one(auth_request.model_dump())
+            self.get_credential_repository().create(auth_request)
 
             return AuthCredentialCreateResponse(message='User created successfully')
 
@@ -65,5 +64,4 @@ class APIController(
         """
         Validate the email and user_id fields if it has record on Users collection.
         """
-        nosql_service: Collection = self.get_mongodb_service_from_collection('Users')
-        return bool(nosql_service.find_one({'email': request.email}))
+        return self.get_credential_repository().user_exists(request.email)
@@ -1,13 +1,36 @@
+import asyncio
 import os
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
 
+from starlette.concurrency import run_in_threadpool
+
+from app.core.api.admission import admission_controller
 from app.core.api.base_controller import APIControllerFactory, BaseAPIController
+from app.core.api.exceptions import AdmissionRejectedException, RateLimitedException
+from app.core.api.rate_limit import get_client_host, rate_limiter
+from app.core.common.base_schema import APIRequestContext, DeferredJobResponse
+from app.core.common.batch_models import BatchEntry, BatchEntryResult, BatchRequest, BatchResponse
+from app.core.common.config import config
+from app.core.schema.auth import RevokedTokenModel, SessionModel
+from app.core.schema.company import CompanyVersionModel, TombstoneModel
+from app.core.schema.idempotency import IdempotencyKeyModel
+from app.core.schema.job import JobModel
+from app.core.schema.outbox import OutboxEventModel
 from app.services.authentication.provider import AuthenticationServiceProvider
-from app.services.authentication.service import AuthenticationService
+from app.services.authentication.revocation import revocation_list
+from app.services.authentication.service import AuthenticationService, Principal
+from app.services.outbox.relay import outbox_relay
 from app.services.tm_db.generate_index import MongoDBIndexService
+from app.services.tm_db.migrations import run_migrations
+from app.services.tm_events.provider import TMEventBrokerProvider
 
 from app.services.tm_db.service import TMMongoDBServicePool
+from app.services.tm_db.tenant import tenant_scope
 
 
 VERSION: str = 'v1'
@@ -16,10 +39,35 @@ index_service: MongoDBIndexService = MongoDBIndexService()
 factory: APIControllerFactory = APIControllerFactory()
 tm_db_service_pool: TMMongoDBServicePool = TMMongoDBServicePool()
 auth_service_provider: AuthenticationServiceProvider = AuthenticationServiceProvider()
+event_broker_provider: TMEventBrokerProvider = TMEventBrokerProvider()
 
 factory.set_mongodb_service_pool(tm_db_service_pool)
 auth_service_provider.set_auth_service(AuthenticationService(tm_db_service_pool))
 
+if event_broker_provider.get_event_broker().uses_change_stream:
+    event_broker_provider.get_event_broker().start_change_stream(tm_db_service_pool)
+
+# Collections owned by services rather than by a single controller
+index_service.generate_indexes(schema=CompanyVersionModel, service_from_factory=factory)
+index_service.generate_indexes(schema=TombstoneModel, service_from_factory=factory)
+index_service.generate_indexes(schema=IdempotencyKeyModel, service_from_factory=factory)
+index_service.generate_indexes(schema=RevokedTokenModel, service_from_factory=factory)
+index_service.generate_indexes(schema=SessionModel, service_from_factory=factory)
+index_service.generate_indexes(schema=OutboxEventModel, service_from_factory=factory)
+index_service.generate_indexes(schema=JobModel, service_from_factory=factory)
+
+# Task queries and the sharded layout rely on every task carrying its company id, delta sync
+# pages on the change sequence every write stamps. Each backfill runs once, then is recorded
+run_migrations(tm_db_service_pool)
+
+# Signed tokens are checked in-process, every worker mirrors the revocations
+if config.AUTH_TOKEN_MODE == 'signed':
+    revocation_list.start_poller(tm_db_service_pool)
+
+# The events the write controllers leave in the outbox are published to the job queue
+if config.OUTBOX_RELAY:
+    outbox_relay.start(tm_db_service_pool)
+
 private_router: APIRouter = APIRouter(
     dependencies=[Depends(auth_service_provider.get_auth_service().authenticate)]
 )
@@ -28,11 +76,25 @@ dir_path = os.path.dirname(__file__)
 controllers = [
     ctrl
     for ctrl in os.listdir(dir_path)
-    if os.path.isdir(os.path.join(dir_path, ctrl)) and ctrl != "__pycache__"
+    if os.path.isfile(os.path.join(dir_path, ctrl, 'controller.py'))
 ]
 print('Mounting controllers', controllers)
 
 
+async def execute(ctrl: BaseAPIController, req: Any, context: APIRequestContext) -> Any:
+    """
+    Run a request through the rate limits, the admission gates and its controller.
+    """
+    # Requests over their rate limit are turned away before queueing, the database or any hashing,
+    # then requests wait for admission on the event loop, only admitted ones take a worker thread
+    try:
+        await rate_limiter.check(ctrl.get_controller_name(), ctrl.get_rate_limit_keys(req, context))
+        async with admission_controller.admit(ctrl.get_controller_name(), ctrl.admission_class, ctrl.max_concurrency):
+            return await run_in_threadpool(ctrl.invoke, req, context)
+    except (AdmissionRejectedException, RateLimitedException) as e:
+        raise ctrl.on_error(e)
+
+
 def route_builder(ctrl: BaseAPIController):
     """
     Builds the API route for the given controller.
@@ -42,14 +104,30 @@ def route_builder(ctrl: BaseAPIController):
         methods=[ctrl.get_method()],
         response_model=ctrl.get_response_type(),
         description=ctrl.__doc__,
-        tags=ctrl.api_tags
+        tags=ctrl.api_tags,
+        responses={HTTPStatus.ACCEPTED: {'model': DeferredJobResponse}} if ctrl.execution_mode != 'sync' else None
     )
     @index_service.generate_indexes(
         schema=ctrl.get_request_type(),
         service_from_factory=factory
     )
-    def handler(req: ctrl.get_request_type()):  # type: ignore[valid-type]
-        return ctrl.invoke(req)
+    async def handler(req: ctrl.get_request_type(), http_request: Request, http_response: Response):  # type: ignore[valid-type]
+        principal: Principal = http_request.state.principal
+        context = APIRequestContext(
+            headers=dict(http_request.headers),
+            client_host=get_client_host(http_request),
+            user_id=principal.user_id,
+            company_code=principal.company_code
+        )
+        output = await execute(ctrl, req, context)
+        http_response.headers.update(context.response_headers)
+
+        # Deferred requests are answered with their job, not with the response model of the controller
+        if isinstance(output, DeferredJobResponse):
+            return JSONResponse(
+                output.model_dump(mode='json'), status_code=HTTPStatus.ACCEPTED, headers=context.response_headers
+            )
+        return output
     handler.__name__ = f'{ctrl.get_controller_name()}_handler'
     return handler
 
@@ -59,3 +137,158 @@ for controller in controllers:
     Dynamically build the API routes for each controller.
     """
     route_builder(factory.get_controller(controller, VERSION))
+
+
+@private_router.get('/subscribe_company_events', tags=['Streaming API'])
+async def subscribe_company_events(company_id: str, http_request: Request) -> StreamingResponse:
+    """
+    Push the board and task changes of a company as server-sent events, instead of polling
+    fetch_companies. A `resync` event means events were dropped for this connection and
+    the client must catch up through fetch_changes_since.
+
+    Only the events of the caller's tenant are pushed, a request naming another tenant in the
+    `X-Company-Code` header gets 403 as it would from any controller.
+    """
+    principal: Principal = http_request.state.principal
+    context = APIRequestContext(
+        headers=dict(http_request.headers), user_id=principal.user_id, company_code=principal.company_code
+    )
+    try:
+        company_code: Optional[str] = BaseAPIController.get_company_code(None, context)
+    except Exception as e:
+        raise BaseAPIController.on_error(e)
+
+    event_broker = event_broker_provider.get_event_broker()
+    with tenant_scope(company_code):
+        subscription = event_broker.subscribe(company_id, asyncio.get_running_loop())
+
+    async def stream():
+        try:
+            while not await http_request.is_disconnected():
+                event = await subscription.get(config.EVENTS_KEEPALIVE_SECONDS)
+                yield event.to_server_sent_event() if event else ': keepalive\n\n'
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+# Headers belonging to a single request, the entries of a batch don't inherit them
+_ENTRY_SCOPED_HEADERS = frozenset({'content-length', 'content-type', 'idempotency-key', 'if-none-match', 'prefer'})
+
+
+async def run_batch_entry(
+        entry_id: str,
+        entry: BatchEntry,
+        dependencies: List['asyncio.Task[BatchEntryResult]'],
+        headers: Dict[str, str],
+        client_host: Optional[str],
+        principal: Principal
+) -> BatchEntryResult:
+    """
+    Run an entry of a batch once the entries it depends on succeeded, it resumes from their
+    causal token so it reads their writes.
+    """
+    headers = dict(headers)
+    for dependency in dependencies:
+        result: BatchEntryResult = await dependency
+        if result.status_code >= HTTPStatus.BAD_REQUEST:
+            return BatchEntryResult(
+                id=entry_id,
+                controller=entry.controller,
+                status_code=HTTPStatus.FAILED_DEPENDENCY,
+                error=f'Entry {result.id} failed.'
+            )
+        if result.headers.get('X-Causal-Token'):
+            headers['x-causal-token'] = result.headers['X-Causal-Token']
+
+    if entry.controller not in controllers:
+        return BatchEntryResult(
+            id=entry_id,
+            controller=entry.controller,
+            status_code=HTTPStatus.NOT_FOUND,
+            error=f'Unknown controller {entry.controller!r}.'
+        )
+
+    ctrl: BaseAPIController = factory.get_controller(entry.controller, VERSION)
+    try:
+        req = ctrl.get_request_type().model_validate(entry.payload)
+    except ValidationError as e:
+        return BatchEntryResult(
+            id=entry_id, controller=entry.controller, status_code=HTTPStatus.UNPROCESSABLE_ENTITY, error=str(e)
+        )
+
+    context = APIRequestContext(
+        headers=headers, client_host=client_host, user_id=principal.user_id, company_code=principal.company_code
+    )
+    try:
+        output = await execute(ctrl, req, context)
+    except HTTPException as e:
+        return BatchEntryResult(
+            id=entry_id,
+            controller=entry.controller,
+            status_code=e.status_code,
+            error=str(e.detail) if e.detail else None,
+            headers={**context.response_headers, **(e.headers or {})}
+        )
+
+    return BatchEntryResult(
+        id=entry_id,
+        controller=entry.controller,
+        status_code=HTTPStatus.ACCEPTED if isinstance(output, DeferredJobResponse) else HTTPStatus.OK,
+        body=[item.model_dump(mode='json') for item in output] if isinstance(output, list)
+        else output.model_dump(mode='json'),
+        headers=context.response_headers
+    )
+
+
+@private_router.post('/batch', response_model=BatchResponse, tags=['Batch API'])
+async def batch(batch_request: BatchRequest, http_request: Request) -> BatchResponse:
+    """
+    Run several controller calls in one HTTP request, authenticated once. Each entry goes
+    through the rate limits, the admission gates and its controller as if it was sent on its
+    own, entries run concurrently unless they list earlier entries in `depends_on`. The
+    outcome of each entry, success or error, comes back in `results`, in the order of the entries.
+    """
+    if len(batch_request.entries) > config.BATCH_MAX_ENTRIES:
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail=f'A batch carries at most {config.BATCH_MAX_ENTRIES} entries.'
+        )
+
+    headers: Dict[str, str] = {
+        key: value for key, value in http_request.headers.items() if key not in _ENTRY_SCOPED_HEADERS
+    }
+    client_host: Optional[str] = get_client_host(http_request)
+
+    # Entries may only depend on earlier ones, so dependencies never form a cycle
+    entry_ids: List[str] = []
+    for index, entry in enumerate(batch_request.entries):
+        entry_id: str = entry.id or str(index)
+        if entry_id in entry_ids:
+            raise HTTPException(status_code=HTTPStatus.UNPROCESSABLE_ENTITY, detail=f'Duplicate entry id {entry_id!r}.')
+
+        unknown: List[str] = [dependency for dependency in entry.depends_on if dependency not in entry_ids]
+        if unknown:
+            raise HTTPException(
+                status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+                detail=f'Entry {entry_id!r} depends on {", ".join(unknown)}, not an earlier entry.'
+            )
+        entry_ids.append(entry_id)
+
+    tasks: Dict[str, 'asyncio.Task[BatchEntryResult]'] = {}
+    for entry_id, entry in zip(entry_ids, batch_request.entries):
+        tasks[entry_id] = asyncio.create_task(run_batch_entry(
+            entry_id,
+            entry,
+            [tasks[dependency] for dependency in entry.depends_on],
+            headers,
+            client_host,
+            http_request.state.principal
+        ))
+
+    return BatchResponse(results=list(await asyncio.gather(*tasks.values())))
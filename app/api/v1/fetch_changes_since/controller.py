@@ -0,0 +1,185 @@
+from http import HTTPMethod
+from typing import List, Optional, Tuple, Mapping, Any
+
+from bson import ObjectId
+from pymongo import ASCENDING
+from pymongo.collection import Collection
+
+from app.api.v1.fetch_changes_since.exceptions import FetchChangesSinceException
+from app.api.v1.fetch_changes_since.models import (
+    FetchChangesSinceRequest,
+    FetchChangesSinceResponse,
+    Board,
+    Task,
+    Tombstone
+)
+from app.core.api.base_controller import BaseAPIController
+from app.core.api.collections import DBCollectionEnum
+from app.services.company_version.provider import CompanyVersionServiceProvider
+
+
+class APIController(
+    BaseAPIController[FetchChangesSinceRequest, FetchChangesSinceResponse],
+    CompanyVersionServiceProvider
+):
+    """
+    **Synchronous API endpoint for fetching the changes of a company since a cursor**
+
+    Returns the boards and tasks created or updated after `since` and the tombstones
+    of the ones deleted, served from the `(company_id, change_seq, _id)` indexes.
+    Every write stamps the company version it bumped as `change_seq`, so the cursor
+    follows a server-assigned sequence rather than the clock of the API hosts, and `_id`
+    breaks the ties of documents written before it existed.
+    Pass the returned `next_cursor` as `since` on the next call.
+
+    API request attributes:
+        company_id (str): The id of the company.
+        since (str): The opaque cursor of the previous call, omit it for a full sync.
+        limit (int): The maximum number of boards, tasks and tombstones returned each.
+
+    """
+    _full_dir: str = __file__
+    api_tags: List[str] = ['Synchronous API']
+    read_preference: str = 'secondaryPreferred'
+
+    def get_path(self) -> str:
+        return '/fetch_changes_since'
+
+    def get_method(self) -> str:
+        """
+        return HTTP method intended
+        """
+        return HTTPMethod.POST
+
+    @staticmethod
+    def get_position(document: Mapping[str, Any]) -> Tuple[int, Any]:
+        """
+        Get the `(change_seq, _id)` position of a document in the change sequence.
+        """
+        return document.get('change_seq') or 0, document.get('_id')
+
+    @staticmethod
+    def format_cursor(position: Optional[Tuple[int, Any]]) -> Optional[str]:
+        """
+        Format a `(change_seq, _id)` position as the opaque cursor sent to clients.
+        """
+        return f'{position[0]}:{position[1]}' if position else None
+
+    @staticmethod
+    def parse_cursor(cursor: Optional[str]) -> Optional[Tuple[int, Any]]:
+        """
+        Parse an opaque cursor back into its `(change_seq, _id)` position.
+
+        Raises:
+        - ValueError: The cursor wasn't returned by this endpoint.
+        """
+        if not cursor:
+            return None
+        change_seq, _, document_id = cursor.partition(':')
+        if not document_id:
+            raise ValueError(cursor)
+        return int(change_seq), ObjectId(document_id) if ObjectId.is_valid(document_id) else document_id
+
+    @staticmethod
+    def _get_changes(nosql_service: Collection,
+                     company_id: str,
+                     since: Optional[Tuple[int, Any]],
+                     limit: int) -> Tuple[List[Mapping[str, Any]], bool]:
+        """
+        Get the documents of a company after the cursor in `(change_seq, _id)` order.
+        One extra document is read to tell whether the page was truncated.
+        """
+        query = {'company_id': company_id}
+        if since:
+            change_seq, document_id = since
+            query['$or'] = [
+                {'change_seq': {'$gt': change_seq}},
+                {'change_seq': change_seq, '_id': {'$gt': document_id}}
+            ]
+        documents = list(
+            nosql_service.find(query).sort([('change_seq', ASCENDING), ('_id', ASCENDING)]).limit(limit + 1)
+        )
+        return documents[:limit], len(documents) > limit
+
+    def process_request(self, request: FetchChangesSinceRequest) -> FetchChangesSinceResponse:
+        try:
+            # Read the version first, changes landing while we page are picked up by the next call
+            version = self.get_company_version_service().get_version(request.company_id)
+
+            since = self.parse_cursor(request.since)
+            pages = {
+                collection: self._get_changes(
+                    self.get_mongodb_service_from_collection(collection.value),
+                    request.company_id,
+                    since,
+                    request.limit
+                )
+                for collection in (DBCollectionEnum.BOARDS, DBCollectionEnum.TASKS, DBCollectionEnum.TOMBSTONES)
+            }
+
+            # A truncated page caps the cursor at its last document, the other pages are
+            # re-sent from there on the next call, which clients apply idempotently
+            truncated = [self.get_position(documents[-1]) for documents, has_more in pages.values() if has_more]
+            latest = [self.get_position(document) for documents, _ in pages.values() for document in documents]
+            next_cursor = min(truncated) if truncated else max(latest, default=since)
+
+            boards, _ = pages[DBCollectionEnum.BOARDS]
+            tasks, _ = pages[DBCollectionEnum.TASKS]
+            tombstones, _ = pages[DBCollectionEnum.TOMBSTONES]
+
+            return FetchChangesSinceResponse(
+                company_id=request.company_id,
+                version=version,
+                boards=[
+                    Board(
+                        id=str(board.get('_id')),
+                        position=board.get('position'),
+                        name=board.get('name'),
+                        description=board.get('description'),
+                        version=board.get('version', 0),
+                        company_id=board.get('company_id'),
+                        date_created=board.get('date_created'),
+                        date_updated=board.get('date_updated')
+                    )
+                    for board in boards
+                ],
+                tasks=[
+                    Task(
+                        id=str(task.get('_id')),
+                        position=task.get('position'),
+                        name=task.get('name'),
+                        description=task.get('description'),
+                        version=task.get('version', 0),
+                        board_id=task.get('board_id'),
+                        date_created=task.get('date_created'),
+                        date_updated=task.get('date_updated')
+                    )
+                    for task in tasks
+                ],
+                deleted=[
+                    Tombstone(
+                        entity=tombstone.get('entity'),
+                        entity_id=tombstone.get('entity_id'),
+                        date_deleted=tombstone.get('date_deleted')
+                    )
+                    for tombstone in tombstones
+                ],
+                next_cursor=self.format_cursor(next_cursor),
+                has_more=bool(truncated)
+            )
+        except Exception as e:
+            raise e
+
+    def validate_request(self, request: FetchChangesSinceRequest) -> bool:
+        """
+        Validate the request
+        """
+        if not request.company_id:
+            raise FetchChangesSinceException('Company id is required.')
+        if request.limit < 1:
+            raise FetchChangesSinceException('Limit must be a positive number.')
+        try:
+            self.parse_cursor(request.since)
+        except ValueError:
+            raise FetchChangesSinceException('Invalid cursor, pass the next_cursor of a previous call.')
+        return True
@@ -0,0 +1,7 @@
+from app.core.common.base_exception import BaseCustomException
+
+
+class FetchChangesSinceException(BaseCustomException):
+    """
+    Base exception for fetch_changes_since
+    """
@@ -0,0 +1,102 @@
+from datetime import datetime
+from typing import Optional, List
+
+from pydantic import BaseModel
+
+
+class Task(BaseModel):
+    """
+    Represents a changed task.
+
+    Attributes:
+        id: task id
+        position: task position
+        name: task name
+        description: task description
+        board_id: board id
+        version: task version, sent back as expected_version on update
+        date_created: date created
+        date_updated: date updated
+    """
+    id: str
+    position: int
+    name: str
+    description: str
+    board_id: str
+    version: int = 0
+    date_created: Optional[datetime] = None
+    date_updated: Optional[datetime] = None
+
+
+class Board(BaseModel):
+    """
+    Represents a changed board, without its tasks.
+
+    Attributes:
+        id: board id
+        position: board position
+        name: board name
+        description: board description
+        company_id: company id
+        version: board version, sent back as expected_version on update
+        date_created: date created
+        date_updated: date updated
+    """
+    id: str
+    position: int
+    name: str
+    description: str
+    company_id: str
+    version: int = 0
+    date_created: Optional[datetime] = None
+    date_updated: Optional[datetime] = None
+
+
+class Tombstone(BaseModel):
+    """
+    Represents a deleted board or task.
+
+    Attributes:
+        entity: collection of the deleted entity, e.g. 'Boards' or 'Tasks'
+        entity_id: id of the deleted entity
+        date_deleted: date deleted
+    """
+    entity: str
+    entity_id: str
+    date_deleted: datetime
+
+
+class FetchChangesSinceRequest(BaseModel):
+    """
+    Represents a request model for fetching the changes of a company.
+
+    Attributes:
+        company_id: company id
+        since: opaque cursor returned by the previous call, omit it for a full sync
+        limit: maximum number of boards, tasks and tombstones returned each
+    """
+    company_id: str
+    since: Optional[str] = None
+    limit: int = 500
+
+
+class FetchChangesSinceResponse(BaseModel):
+    """
+    Represents a response model for fetching the changes of a company.
+
+    Attributes:
+        company_id: company id
+        version: version of the company read before the changes
+        boards: boards created or updated after the cursor
+        tasks: tasks created or updated after the cursor
+        deleted: boards and tasks deleted after the cursor
+        next_cursor: opaque cursor to pass as `since` on the next call
+        has_more: whether a page was truncated and the next call returns more changes
+    """
+    company_id: str
+    version: int
+    boards: List[Board] = []
+    tasks: List[Task] = []
+    deleted: List[Tombstone] = []
+    next_cursor: Optional[str] = None
+    has_more: bool = False
@@ -1,17 +1,19 @@
 from http import HTTPMethod
-from typing import List
+from typing import List, Optional
 
 from pymongo.collection import Collection
 
 from app.api.v1.fetch_companies.models import FetchCompaniesResponse, Task, Board, Company, FetchCompaniesRequest
 from app.core.api.base_controller import BaseAPIController
 from app.core.api.collections import DBCollectionEnum
-from app.services.tm_db.provider import TMMongoDBServiceProvider
+from app.services.company_version.provider import CompanyVersionServiceProvider
+from app.services.deferred.provider import DeferredJobServiceProvider
 
 
 class APIController(
     BaseAPIController[FetchCompaniesRequest, FetchCompaniesResponse],
-    TMMongoDBServiceProvider
+    CompanyVersionServiceProvider,
+    DeferredJobServiceProvider
 ):
     """
     **Synchronous API endpoint for fetching completeness summary**
@@ -22,7 +24,14 @@ class APIController(
 
     """
     _full_dir: str = __file__
+    is_cacheable: bool = True
     api_tags: List[str] = ['Synchronous API']
+    read_preference: str = 'secondaryPreferred'
+    # The fan-out over boards and tasks must not hold a worker for longer than this
+    request_timeout_seconds: float = 5.0
+    max_concurrency: int = 8
+    # Exports of many companies can be sent with `Prefer: respond-async` and polled through fetch_job_status
+    execution_mode: str = 'optional'
 
     def get_path(self) -> str:
         return '/fetch_companies'
@@ -33,11 +42,31 @@ class APIController(
         """
         return HTTPMethod.POST
 
-    def _get_tasks(self, board_id: str) -> List[Task]:
+    def get_version_token(self, request: FetchCompaniesRequest) -> Optional[str]:
         """
-        Get the list of tasks.
+        Version the requested page of companies from the per-company version counters,
+        without building the company tree.
         """
-        nosql_service: Collection = self.get_mongodb_service_from_collection(DBCollectionEnum.TASKS.value)
+        nosql_service: Collection = self.get_mongodb_service_from_collection(DBCollectionEnum.COMPANIES.value)
+        company_ids: List[str] = [
+            str(company.get('_id'))
+            for company in nosql_service.find({}, {'_id': 1})
+            .skip((request.page - 1) * request.page_size)
+            .limit(request.page_size)
+        ]
+        versions = self.get_company_version_service().get_versions(company_ids)
+
+        return f'{nosql_service.estimated_document_count()}|' + ','.join(
+            f'{company_id}={versions[company_id]}' for company_id in company_ids
+        )
+
+    def _get_tasks(self, company_id: str, board_id: str) -> List[Task]:
+        """
+        Get the list of tasks, targeted at the shard owning the board.
+        """
+        nosql_service = self.get_shard_targeted_collection(
+            DBCollectionEnum.TASKS.value, company_id=company_id, board_id=board_id
+        )
         q_response = nosql_service.find({'board_id': board_id})
 
         tasks: List[Task] = [
@@ -46,6 +75,7 @@ class APIController(
                 position=task.get('position'),
                 name=task.get('name'),
                 description=task.get('description'),
+                version=task.get('version', 0),
                 board_id=task.get('board_id'),
                 date_created=task.get('date_created'),
                 date_updated=task.get('date_updated')
@@ -56,9 +86,9 @@ class APIController(
 
     def _get_boards(self, company_id: str) -> List[Board]:
         """
-        Get the list of boards.
+        Get the list of boards, targeted at the shard owning the company.
         """
-        nosql_service: Collection = self.get_mongodb_service_from_collection(DBCollectionEnum.BOARDS.value)
+        nosql_service = self.get_shard_targeted_collection(DBCollectionEnum.BOARDS.value, company_id=company_id)
         q_response = nosql_service.find({'company_id': company_id})
 
         boards: List[Board] = [
@@ -67,8 +97,9 @@ class APIController(
                 position=board.get('position'),
                 name=board.get('name'),
                 description=board.get('description'),
+                version=board.get('version', 0),
                 company_id=board.get('company_id'),
-                tasks=self._get_tasks(board_id=str(board.get('_id')))
+                tasks=self._get_tasks(company_id=company_id, board_id=str(board.get('_id')))
             )
             for board in q_response
         ]
@@ -12,6 +12,7 @@ class Task(BaseModel):
         name: task name
         description: task description
         position: task position
+        version: task version, sent back as expected_version on update
         date_created: date created
         date_updated: date updated
     """
@@ -19,6 +20,7 @@ class Task(BaseModel):
     name: str
     description: str
     board_id: str
+    version: int = 0
     date_created: datetime = datetime.now()
     date_updated: Optional[datetime] = None
 
@@ -31,6 +33,7 @@ class Board(BaseModel):
         position: board position
         name: board name
         description: board description
+        version: board version, sent back as expected_version on update
         date_created: date created
         date_updated: date updated
         tasks: tasks
@@ -39,6 +42,7 @@ class Board(BaseModel):
     name: str
     description: str
     company_id: str
+    version: int = 0
     date_created: datetime = datetime.now()
     date_updated: Optional[datetime] = None
     tasks: Sequence[Task] = []
@@ -0,0 +1,49 @@
+from http import HTTPMethod
+from typing import List
+
+from app.api.v1.fetch_company_version.models import FetchCompanyVersionRequest, FetchCompanyVersionResponse
+from app.core.api.base_controller import BaseAPIController
+from app.services.company_version.provider import CompanyVersionServiceProvider
+
+
+class APIController(
+    BaseAPIController[FetchCompanyVersionRequest, FetchCompanyVersionResponse],
+    CompanyVersionServiceProvider
+):
+    """
+    **Synchronous API endpoint for fetching the version of a company**
+
+    The version is incremented on every board or task write, clients compare it
+    with the last version they saw before re-downloading the company tree.
+
+    API request attributes:
+        company_id (str): The id of the company.
+
+    """
+    _full_dir: str = __file__
+    api_tags: List[str] = ['Synchronous API']
+    read_preference: str = 'secondaryPreferred'
+
+    def get_path(self) -> str:
+        return '/fetch_company_version'
+
+    def get_method(self) -> str:
+        """
+        return HTTP method intended
+        """
+        return HTTPMethod.POST
+
+    def process_request(self, request: FetchCompanyVersionRequest) -> FetchCompanyVersionResponse:
+        try:
+            return FetchCompanyVersionResponse(
+                company_id=request.company_id,
+                version=self.get_company_version_service().get_version(request.company_id)
+            )
+        except Exception as e:
+            raise e
+
+    def validate_request(self, request: FetchCompanyVersionRequest) -> bool:
+        """
+        Validate the request
+        """
+        return True
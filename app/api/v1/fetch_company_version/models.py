@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+
+
+class FetchCompanyVersionRequest(BaseModel):
+    """
+    Represents a request model for fetching the version of a company.
+
+    Attributes:
+        company_id: company id
+    """
+    company_id: str
+
+
+class FetchCompanyVersionResponse(BaseModel):
+    """
+    Represents a response model for fetching the version of a company.
+
+    Attributes:
+        company_id: company id
+        version: version incremented on every board or task write of the company
+    """
+    company_id: str
+    version: int
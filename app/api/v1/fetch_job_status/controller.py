@@ -0,0 +1,74 @@
+from http import HTTPMethod
+from typing import List
+
+from app.api.v1.fetch_job_status.models import FetchJobStatusRequest, FetchJobStatusResponse
+from app.core.api.base_controller import BaseAPIController
+from app.core.api.exceptions import JobNotFoundException
+from app.core.common.base_schema import APIRequestContext, DefaultAPIResponseStatus
+from app.core.schema.job import DONE, FAILED
+from app.services.deferred.provider import DeferredJobServiceProvider
+
+
+class APIController(
+    BaseAPIController[FetchJobStatusRequest, FetchJobStatusResponse],
+    DeferredJobServiceProvider
+):
+    """
+    **Synchronous API endpoint for fetching the status of a deferred request**
+
+    Controllers answering `202` process the request on the queue workers, the client polls
+    this endpoint with the returned job id until the status is OK or ERROR. A job is only
+    visible to the API key that enqueued it.
+
+    API request attributes:
+        job_id (str): The id of the job.
+
+    """
+    _full_dir: str = __file__
+    api_tags: List[str] = ['Synchronous API']
+
+    def get_path(self) -> str:
+        return '/fetch_job_status'
+
+    def get_method(self) -> str:
+        """
+        return HTTP method intended
+        """
+        return HTTPMethod.POST
+
+    def _process_request(self, request: FetchJobStatusRequest, context: APIRequestContext) -> FetchJobStatusResponse:
+        """
+        Look the job up for the caller of the request.
+        """
+        job = self.get_deferred_job_service().get(request.job_id, self.get_caller(context))
+        if job is None:
+            raise JobNotFoundException(f'Job {request.job_id} does not exist.')
+
+        status: DefaultAPIResponseStatus = DefaultAPIResponseStatus.ENQUEUE
+        if job.state == DONE:
+            status = DefaultAPIResponseStatus.OK
+        elif job.state == FAILED:
+            status = DefaultAPIResponseStatus.ERROR
+
+        return FetchJobStatusResponse(
+            job_id=job.id,
+            controller=job.request.controller_name,
+            state=job.state,
+            status=status,
+            status_code=job.status_code,
+            result=job.result,
+            error=job.error,
+            date_created=job.date_created,
+            date_finished=job.date_finished
+        )
+
+    def validate_request(self, request: FetchJobStatusRequest) -> bool:
+        """
+        Validate the request
+
+        Required fields:
+            - job_id
+        """
+        if not request.job_id:
+            raise JobNotFoundException('Job id is required.')
+        return True
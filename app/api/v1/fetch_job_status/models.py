@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+from app.core.common.base_schema import APIResponse
+
+
+class FetchJobStatusRequest(BaseModel):
+    """
+    Represents a request model for fetching the status of a deferred job.
+
+    Attributes:
+        job_id: job id, returned with the 202 answer of the deferred request
+    """
+    job_id: str
+
+
+class FetchJobStatusResponse(APIResponse):
+    """
+    Represents a response model for fetching the status of a deferred job.
+
+    Attributes:
+        job_id: job id
+        controller: controller processing the request, e.g. fetch_companies
+        state: queued, running, done or failed
+        status: ENQUEUE until the job is done (OK) or failed (ERROR)
+        status_code: HTTP status the request ended with
+        result: response of the request, once done
+        error: error of the request, once failed
+        date_created: date enqueued
+        date_finished: date done or failed
+    """
+    job_id: str
+    controller: str
+    state: str
+    status_code: Optional[int] = None
+    result: Optional[Any] = None
+    date_created: datetime
+    date_finished: Optional[datetime] = None
@@ -1,5 +1,5 @@
 from http import HTTPMethod
-from typing import List
+from typing import List, Optional
 
 from pymongo.collection import Collection
 
@@ -21,7 +21,9 @@ class APIController(
 
     """
     _full_dir: str = __file__
+    is_cacheable: bool = True
     api_tags: List[str] = ['Synchronous API']
+    read_preference: str = 'secondaryPreferred'
 
     def get_path(self) -> str:
         return '/fetch_user_by_email'
@@ -32,6 +34,14 @@ class APIController(
         """
         return HTTPMethod.POST
 
+    def get_version_token(self, request: FetchUserRequest) -> Optional[str]:
+        """
+        Users are immutable once created, so the id from the unique email index versions the response.
+        """
+        nosql_service: Collection = self.get_mongodb_service_from_collection(request.collection)
+        user = nosql_service.find_one({'email': request.email}, {'_id': 1})
+        return str(user.get('_id')) if user else None
+
     def process_request(self, request: FetchUserRequest) -> FetchUserResponse:
         try:
             nosql_service: Collection = self.get_mongodb_service_from_collection(request.collection)
@@ -1,18 +1,24 @@
+from datetime import datetime
 from http import HTTPMethod
 from typing import List
 
-from pymongo.collection import Collection
 from pymongo.errors import DuplicateKeyError
 
 from app.api.v1.post_create_board.exceptions import PostCreateBoardException, CreateBoardException
 from app.api.v1.post_create_board.models import PostCreateBoardRequest, PostCreateBoardResponse
 from app.core.api.base_controller import BaseAPIController
-from app.services.tm_db.provider import TMMongoDBServiceProvider
+from app.core.api.collections import DBCollectionEnum
+from app.core.common.event_models import CompanyEvent, EventTypeOptions
+from app.services.company_version.provider import CompanyVersionServiceProvider
+from app.services.idempotency.provider import IdempotencyServiceProvider
+from app.services.outbox.provider import OutboxServiceProvider
 
 
 class APIController(
     BaseAPIController[PostCreateBoardRequest, PostCreateBoardResponse],
-    TMMongoDBServiceProvider
+    CompanyVersionServiceProvider,
+    IdempotencyServiceProvider,
+    OutboxServiceProvider
 ):
     """
     **Synchronous API endpoint for fetching completeness summary**
@@ -36,17 +42,37 @@ class APIController(
 
     def process_request(self, request: PostCreateBoardRequest) -> PostCreateBoardResponse:
         try:
-            nosql_service: Collection = self.get_mongodb_service_from_collection(request.collection)
-            inserted_board_id = nosql_service.insert_one(request.model_dump()).inserted_id.__str__()
-
-            return PostCreateBoardResponse(
-                id=inserted_board_id,
-                name=request.name,
-                description=request.description,
-                company_id=request.company_id,
-                position=request.position,
-                date_created=request.date_created,
-                date_updated=request.date_updated,
+            date_updated: datetime = datetime.now()
+
+            nosql_service = self.get_shard_targeted_collection(request.collection, company_id=request.company_id)
+            # Runs again when a concurrent write to the same company aborts the transaction
+            def write() -> PostCreateBoardResponse:
+                # Stamp the company version on the write, delta sync pages on (company_id, change_seq, _id)
+                change_seq = self.get_company_version_service().bump(request.company_id)
+                inserted_board_id = nosql_service.insert_one(
+                    {**request.model_dump(), 'version': 1, 'change_seq': change_seq, 'date_updated': date_updated}
+                ).inserted_id.__str__()
+
+                response = PostCreateBoardResponse(
+                    id=inserted_board_id,
+                    name=request.name,
+                    description=request.description,
+                    company_id=request.company_id,
+                    position=request.position,
+                    version=1,
+                    date_created=request.date_created,
+                    date_updated=date_updated,
+                )
+                self.get_outbox_service().record(CompanyEvent(
+                    event_type=EventTypeOptions.BOARD_CREATED,
+                    company_id=request.company_id,
+                    entity_id=inserted_board_id,
+                    payload=response.model_dump(mode='json')
+                ))
+                return response
+
+            return self.get_outbox_service().run_in_transaction(
+                [request.collection, DBCollectionEnum.COMPANY_VERSIONS.value], write
             )
         except DuplicateKeyError:
             raise PostCreateBoardException('Board already exists.')
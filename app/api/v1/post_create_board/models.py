@@ -28,7 +28,7 @@ class PostCreateBoardBaseModel(BaseModel):
             indexes (List[str]): The list of fields to be indexed.
         """
         indexes: Mapping[str, Optional[Sequence]] = {
-            'index': None,
+            'index': [('company_id', ASCENDING), ('change_seq', ASCENDING), ('_id', ASCENDING)],
             'unique_index': None,
             'composite_index': [
                 ('name', ASCENDING),
@@ -65,6 +65,7 @@ class PostCreateBoardResponse(BaseModel):
         name: board name
         position: board position
         description: board description
+        version: version of the board, sent back as expected_version on update
         date_created: date created
         date_updated: date updated
     """
@@ -73,5 +74,6 @@ class PostCreateBoardResponse(BaseModel):
     name: str
     description: str
     company_id: str
+    version: int
     date_created: datetime
     date_updated: Optional[datetime] = None
@@ -5,12 +5,15 @@ from pymongo.collection import Collection
 
 from app.api.v1.post_create_company.models import PostCreateCompanyRequest, PostCreateCompanyResponse
 from app.core.api.base_controller import BaseAPIController
-from app.services.tm_db.provider import TMMongoDBServiceProvider
+from app.core.common.event_models import CompanyEvent, EventTypeOptions
+from app.services.idempotency.provider import IdempotencyServiceProvider
+from app.services.outbox.provider import OutboxServiceProvider
 
 
 class APIController(
     BaseAPIController[PostCreateCompanyRequest, PostCreateCompanyResponse],
-    TMMongoDBServiceProvider
+    IdempotencyServiceProvider,
+    OutboxServiceProvider
 ):
     """
     **Synchronous API endpoint for fetching completeness summary**
@@ -35,15 +38,28 @@ class APIController(
     def process_request(self, request: PostCreateCompanyRequest) -> PostCreateCompanyResponse:
         try:
             nosql_service: Collection = self.get_mongodb_service_from_collection(request.collection)
-            inserted_company_id = nosql_service.insert_one(request.model_dump()).inserted_id.__str__()
-
-            return PostCreateCompanyResponse(
-                id=inserted_company_id,
-                name=request.name,
-                email=request.email,
-                description=request.description,
-                date_created=request.date_created,
-                date_updated=request.date_updated
+            # Runs again when a concurrent write to the same company aborts the transaction
+            def write() -> PostCreateCompanyResponse:
+                inserted_company_id = nosql_service.insert_one(request.model_dump()).inserted_id.__str__()
+
+                response = PostCreateCompanyResponse(
+                    id=inserted_company_id,
+                    name=request.name,
+                    email=request.email,
+                    description=request.description,
+                    date_created=request.date_created,
+                    date_updated=request.date_updated
+                )
+                self.get_outbox_service().record(CompanyEvent(
+                    event_type=EventTypeOptions.COMPANY_CREATED,
+                    company_id=inserted_company_id,
+                    entity_id=inserted_company_id,
+                    payload=response.model_dump(mode='json')
+                ))
+                return response
+
+            return self.get_outbox_service().run_in_transaction(
+                [request.collection], write
             )
         except Exception as e:
             raise e
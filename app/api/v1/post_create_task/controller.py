@@ -1,16 +1,23 @@
+from datetime import datetime
 from http import HTTPMethod
 from typing import List
 
-from pymongo.collection import Collection
 
+from app.api.v1.post_create_task.exceptions import PostCreateTaskException
 from app.api.v1.post_create_task.models import PostCreateTaskResponse, PostCreateTasksRequest
 from app.core.api.base_controller import BaseAPIController
-from app.services.tm_db.provider import TMMongoDBServiceProvider
+from app.core.api.collections import DBCollectionEnum
+from app.core.common.event_models import CompanyEvent, EventTypeOptions
+from app.services.company_version.provider import CompanyVersionServiceProvider
+from app.services.idempotency.provider import IdempotencyServiceProvider
+from app.services.outbox.provider import OutboxServiceProvider
 
 
 class APIController(
     BaseAPIController[PostCreateTasksRequest, PostCreateTaskResponse],
-    TMMongoDBServiceProvider
+    CompanyVersionServiceProvider,
+    IdempotencyServiceProvider,
+    OutboxServiceProvider
 ):
     """
     **Synchronous API endpoint for fetching completeness summary**
@@ -34,17 +41,45 @@ class APIController(
 
     def process_request(self, request: PostCreateTasksRequest) -> PostCreateTaskResponse:
         try:
-            nosql_service: Collection = self.get_mongodb_service_from_collection(request.collection)
-            inserted_task_id = nosql_service.insert_one(request.model_dump()).inserted_id.__str__()
-
-            return PostCreateTaskResponse(
-                id=inserted_task_id,
-                position=request.position,
-                name=request.name,
-                description=request.description,
-                board_id=request.board_id,
-                date_created=request.date_created,
-                date_updated=request.date_updated
+            company_id = self.get_company_version_service().get_board_company_id(request.board_id)
+
+            if not company_id:
+                raise PostCreateTaskException('Board does not exist.')
+
+            date_updated: datetime = datetime.now()
+
+            nosql_service = self.get_shard_targeted_collection(
+                request.collection, company_id=company_id, board_id=request.board_id
+            )
+            # Runs again when a concurrent write to the same company aborts the transaction
+            def write() -> PostCreateTaskResponse:
+                # Stamp the company version on the write, delta sync pages on (company_id, change_seq, _id)
+                change_seq = self.get_company_version_service().bump(company_id)
+                inserted_task_id = nosql_service.insert_one(
+                    {**request.model_dump(), 'version': 1, 'change_seq': change_seq, 'date_updated': date_updated}
+                ).inserted_id.__str__()
+
+                response = PostCreateTaskResponse(
+                    id=inserted_task_id,
+                    position=request.position,
+                    name=request.name,
+                    description=request.description,
+                    board_id=request.board_id,
+                    company_id=company_id,
+                    version=1,
+                    date_created=request.date_created,
+                    date_updated=date_updated
+                )
+                self.get_outbox_service().record(CompanyEvent(
+                    event_type=EventTypeOptions.TASK_CREATED,
+                    company_id=company_id,
+                    entity_id=inserted_task_id,
+                    payload=response.model_dump(mode='json')
+                ))
+                return response
+
+            return self.get_outbox_service().run_in_transaction(
+                [request.collection, DBCollectionEnum.COMPANY_VERSIONS.value], write
             )
         except Exception as e:
             raise e
@@ -1,10 +1,12 @@
 
 from app.core.api.base_delegate import BaseAPIControllerDelegate
 from app.core.common.base_schema import APIProcessReport
+from app.core.common.event_models import CompanyEvent, EventTypeOptions
 from app.core.common.log_models import LogTypeOptions
+from app.services.tm_events.provider import TMEventBrokerProvider
 
 
-class APIControllerDelegate(BaseAPIControllerDelegate):
+class APIControllerDelegate(BaseAPIControllerDelegate, TMEventBrokerProvider):
     """
     Delegate class for handling when an API invocation to get the list of tasks
     either succeed or fail.
@@ -28,3 +30,11 @@ class APIControllerDelegate(BaseAPIControllerDelegate):
         if self._sentry_enabled:
             pass
             # self.get_sentry_service().send_log(_rm_log)
+
+        if report.response and report.response.company_id:
+            self.publish_event(CompanyEvent(
+                event_type=EventTypeOptions.TASK_CREATED,
+                company_id=report.response.company_id,
+                entity_id=report.response.id,
+                payload=report.response.model_dump(mode='json')
+            ))
@@ -0,0 +1,13 @@
+from app.core.common.base_exception import BaseCustomException
+
+
+class PostCreateTaskException(BaseCustomException):
+    """
+    Base exception for post_create_task
+    """
+
+
+class CreateTaskException(PostCreateTaskException):
+    """
+    Raise when error occurs during creating task.
+    """
@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Mapping, Sequence
 
 from pydantic import BaseModel
+from pymongo import ASCENDING
 
 from app.core.api.collections import DBCollectionEnum
 
@@ -19,6 +20,19 @@ class PostCreateTasksBaseModel(BaseModel):
     def collection(self) -> str:
         return self._collection
 
+    class Config:
+        """
+        Pydantic model configuration.
+
+        Attributes:
+            indexes (List[str]): The list of fields to be indexed.
+        """
+        indexes: Mapping[str, Optional[Sequence]] = {
+            'index': [('company_id', ASCENDING), ('change_seq', ASCENDING), ('_id', ASCENDING)],
+            'unique_index': None,
+            'composite_index': None,
+        }
+
 
 class PostCreateTasksRequest(PostCreateTasksBaseModel):
     """
@@ -49,6 +63,8 @@ class PostCreateTaskResponse(BaseModel):
         name: task name
         description: task description
         board_id: board id
+        company_id: company id owning the board
+        version: version of the task, sent back as expected_version on update
         date_created: date created
         date_updated: date updated
 
@@ -58,5 +74,7 @@ class PostCreateTaskResponse(BaseModel):
     name: str
     description: str
     board_id: str
+    company_id: Optional[str] = None
+    version: int
     date_created: datetime
     date_updated: Optional[datetime] = None
@@ -1,16 +1,16 @@
 from http import HTTPMethod
 from typing import List
 
-from pymongo.collection import Collection
-
 from app.api.v1.post_signout.models import SignOutUserRequest, SignOutUserResponse
 from app.core.api.base_controller import BaseAPIController
-from app.services.tm_db.provider import TMMongoDBServiceProvider
+from app.services.authentication.revocation import revocation_list
+from app.services.authentication.tokens import decode_signed_token, is_signed_token
+from app.services.credentials.provider import CredentialRepositoryProvider
 
 
 class APIController(
     BaseAPIController[SignOutUserRequest, SignOutUserResponse],
-    TMMongoDBServiceProvider
+    CredentialRepositoryProvider
 ):
     """
     **Synchronous API endpoint for fetching completeness summary**
@@ -33,25 +33,21 @@ class APIController(
         return HTTPMethod.POST
 
     def process_request(self, request: SignOutUserRequest) -> SignOutUserResponse:
-        try:
-            nosql_service: Collection = self.get_mongodb_service_from_collection(request.collection)
-            user_cred = nosql_service.find_one({'auth_token': request.token})
-
-            if not user_cred:
+        # A signed token stays valid until it expires unless it is revoked on every worker
+        if is_signed_token(request.token):
+            claims = decode_signed_token(request.token)
+            if not claims:
                 raise Exception('Invalid token')
 
-            nosql_service.update_one(
-                {'auth_token': request.token},
-                {'$set': {
-                    'auth_token': 'NOT_SET',
-                    'token_expires': 0.00,
-                    'is_signed_in': False
-                }}
-            )
-
-            return SignOutUserResponse(message=f'User {user_cred.get("email")} has been signed out.')
-        except Exception as e:
-            raise e
+            revocation_list.revoke(self.get_mongodb_service_pool(), claims)
+
+        # Only the session of this token ends, the user's other sessions stay open
+        email = self.get_credential_repository().end_session(request.token)
+
+        if not email:
+            raise Exception('Invalid token')
+
+        return SignOutUserResponse(message=f'User {email} has been signed out.')
 
     def validate_request(self, request: SignOutUserRequest) -> bool:
         """
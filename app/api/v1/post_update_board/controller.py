@@ -1,18 +1,24 @@
+from datetime import datetime
 from http import HTTPMethod
 from typing import List
 
-from pymongo.collection import Collection
+from pymongo import ReturnDocument
 from pymongo.errors import OperationFailure
 
 from app.api.v1.post_update_board.exceptions import PostUpdateBoardException, UpdateBoardException
 from app.api.v1.post_update_board.models import PostUpdateBoardRequest, PostUpdateBoardResponse
 from app.core.api.base_controller import BaseAPIController
-from app.services.tm_db.provider import TMMongoDBServiceProvider
+from app.core.api.collections import DBCollectionEnum
+from app.core.api.exceptions import VersionConflictException
+from app.core.common.event_models import CompanyEvent, EventTypeOptions
+from app.services.company_version.provider import CompanyVersionServiceProvider
+from app.services.outbox.provider import OutboxServiceProvider
 
 
 class APIController(
     BaseAPIController[PostUpdateBoardRequest, PostUpdateBoardResponse],
-    TMMongoDBServiceProvider
+    CompanyVersionServiceProvider,
+    OutboxServiceProvider
 ):
     """
     **Synchronous API endpoint for fetching completeness summary**
@@ -36,31 +42,68 @@ class APIController(
 
     def process_request(self, request: PostUpdateBoardRequest) -> PostUpdateBoardResponse:
         try:
-            nosql_service: Collection = self.get_mongodb_service_from_collection(request.collection)
-            q_response = nosql_service.update_one(
-                {'_id': request.id},
-                {
-                    '$set': {
-                        'position': request.position,
-                        'name': request.name,
-                        'description': request.description,
-                        'date_updated': request.date_updated
-                    }
-                }
-            )
+            # Clients not sending the company id pay a board lookup, the write is stamped with its version
+            company_id = request.company_id or self.get_company_version_service().get_board_company_id(request.id)
+            nosql_service = self.get_shard_targeted_collection(request.collection, company_id=company_id)
+
+            date_updated: datetime = datetime.now()
+
+            # A client sending the version it read gets a conditional write, no read beforehand
+            # The write only matches a board of the company named, whatever the client sent
+            owner = {'_id': self.get_object_id(request.id), 'company_id': company_id}
+            query = dict(owner)
+            if request.expected_version is not None:
+                query['version'] = self.get_version_filter(request.expected_version)
+
+            # Runs again when a concurrent write to the same company aborts the transaction
+            def write() -> PostUpdateBoardResponse:
+                board = nosql_service.find_one_and_update(
+                    query,
+                    {
+                        '$set': {**request.get_changes(), 'date_updated': date_updated},
+                        '$inc': {'version': 1}
+                    },
+                    projection={'position': 1, 'name': 1, 'description': 1, 'company_id': 1, 'version': 1, 'date_created': 1},
+                    return_document=ReturnDocument.AFTER
+                )
+
+                if not board:
+                    # Only a failed conditional write pays the lookup telling a conflict from a missing board
+                    if request.expected_version is not None and nosql_service.count_documents(owner, limit=1):
+                        raise VersionConflictException(
+                            f'Board {request.id} was modified since version {request.expected_version}.'
+                        )
+                    raise PostUpdateBoardException('No record updated.')
 
-            if q_response.modified_count == 0:
-                raise PostUpdateBoardException('No record updated.')
-
-            return PostUpdateBoardResponse(
-                id=request.id,
-                position=request.position,
-                name=request.name,
-                description=request.description,
-                company_id=request.company_id,
-                date_created=request.date_created,
-                date_updated=request.date_updated
+                # Only the company owning the board moves, once the write matched. Delta sync pages on
+                # (company_id, change_seq, _id), inside the transaction the stamp commits with the write
+                change_seq = self.get_company_version_service().bump(company_id)
+                nosql_service.update_one({'_id': board['_id']}, {'$max': {'change_seq': change_seq}})
+
+                response = PostUpdateBoardResponse(
+                    id=request.id,
+                    position=board.get('position'),
+                    name=board.get('name'),
+                    description=board.get('description'),
+                    company_id=board.get('company_id'),
+                    version=board.get('version'),
+                    date_created=board.get('date_created', request.date_created),
+                    date_updated=date_updated
+                )
+                self.get_outbox_service().record(CompanyEvent(
+                    event_type=EventTypeOptions.BOARD_UPDATED,
+                    company_id=response.company_id,
+                    entity_id=request.id,
+                    payload=response.model_dump(mode='json')
+                ))
+                return response
+
+            return self.get_outbox_service().run_in_transaction(
+                [request.collection, DBCollectionEnum.COMPANY_VERSIONS.value], write
             )
+        except VersionConflictException:
+            raise
+
         except OperationFailure:
             raise PostUpdateBoardException('Error occurred during updating board.')
 
@@ -70,5 +113,19 @@ class APIController(
     def validate_request(self, request: PostUpdateBoardRequest) -> bool:
         """
         Validate the request
+
+        Required fields:
+            - id
+            - at least one of position, name and description, none of them null
+            - a non-empty name, position 0 and an empty description are valid
         """
+        if not request.id:
+            raise PostUpdateBoardException('Board id is required.')
+
+        changes = request.get_changes()
+        if not changes:
+            raise PostUpdateBoardException('Nothing to update.')
+        for field, value in changes.items():
+            if value is None or (field == 'name' and not value):
+                raise PostUpdateBoardException(f'Board {field} is required.')
         return True
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from pydantic import BaseModel
 
@@ -24,20 +24,32 @@ class PostUpdateBoardRequest(PostUpdateBoardBaseModel):
     """
     Represents a request model for creating a company task board.
 
+    Only the fields the client sends are written, the others are left untouched.
+
     Attributes:
         position: board position
         name: board name
         description: board description
+        company_id: company id owning the board, targets its shard
+        expected_version: version the client read, the update fails with 409 if the board changed since
         date_created: date created
         date_updated: date updated
     """
     id: str
-    position: int
-    name: str
-    description: str
+    position: Optional[int] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    company_id: Optional[str] = None
+    expected_version: Optional[int] = None
     date_created: datetime = datetime.now()
     date_updated: Optional[datetime] = None
 
+    def get_changes(self) -> Dict[str, Any]:
+        """
+        Get the fields the client sent, the only ones written by the update.
+        """
+        return self.model_dump(include={'position', 'name', 'description'}, exclude_unset=True)
+
 
 class PostUpdateBoardResponse(BaseModel):
     """
@@ -47,6 +59,7 @@ class PostUpdateBoardResponse(BaseModel):
         name: board name
         position: board position
         description: board description
+        version: version of the board after the update
         date_created: date created
         date_updated: date updated
     """
@@ -55,5 +68,6 @@ class PostUpdateBoardResponse(BaseModel):
     name: str
     description: str
     company_id: str
+    version: int
     date_created: datetime
     date_updated: Optional[datetime] = None
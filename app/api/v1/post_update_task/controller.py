@@ -1,19 +1,24 @@
+from datetime import datetime
 from http import HTTPMethod
 from typing import List
 
-from pymongo.collection import Collection
+from pymongo import ReturnDocument
 from pymongo.errors import OperationFailure
-from pymongo.results import UpdateResult
 
 from app.api.v1.post_update_board.exceptions import PostUpdateBoardException, UpdateBoardException
 from app.api.v1.post_update_task.models import PostUpdateTaskRequest, PostUpdateTaskResponse
 from app.core.api.base_controller import BaseAPIController
-from app.services.tm_db.provider import TMMongoDBServiceProvider
+from app.core.api.collections import DBCollectionEnum
+from app.core.api.exceptions import VersionConflictException
+from app.core.common.event_models import CompanyEvent, EventTypeOptions
+from app.services.company_version.provider import CompanyVersionServiceProvider
+from app.services.outbox.provider import OutboxServiceProvider
 
 
 class APIController(
     BaseAPIController[PostUpdateTaskRequest, PostUpdateTaskResponse],
-    TMMongoDBServiceProvider
+    CompanyVersionServiceProvider,
+    OutboxServiceProvider
 ):
     """
     **Synchronous API endpoint for fetching completeness summary**
@@ -37,31 +42,73 @@ class APIController(
 
     def process_request(self, request: PostUpdateTaskRequest) -> PostUpdateTaskResponse:
         try:
-            nosql_service: Collection = self.get_mongodb_service_from_collection(request.collection)
-            q_response: UpdateResult = nosql_service.update_one(
-                {'_id': request.id},
-                {
-                    '$set': {
-                        'position': request.position,
-                        'name': request.name,
-                        'description': request.description,
-                        'date_updated': request.date_updated
-                    }
-                }
+            # Target the shard owning the task, clients not sending the company id pay a board lookup
+            company_id = request.company_id or self.get_company_version_service().get_board_company_id(
+                request.board_id
             )
+            nosql_service = self.get_shard_targeted_collection(
+                request.collection, company_id=company_id, board_id=request.board_id
+            )
+
+            date_updated: datetime = datetime.now()
+
+            # A client sending the version it read gets a conditional write, no read beforehand
+            # The write only matches a task of the company and board named, whatever the client sent
+            owner = {'_id': self.get_object_id(request.id), 'company_id': company_id, 'board_id': request.board_id}
+            query = dict(owner)
+            if request.expected_version is not None:
+                query['version'] = self.get_version_filter(request.expected_version)
+
+            # Runs again when a concurrent write to the same company aborts the transaction
+            def write() -> PostUpdateTaskResponse:
+                task = nosql_service.find_one_and_update(
+                    query,
+                    {
+                        '$set': {**request.get_changes(), 'date_updated': date_updated},
+                        '$inc': {'version': 1}
+                    },
+                    projection={'position': 1, 'name': 1, 'description': 1, 'version': 1, 'date_created': 1},
+                    return_document=ReturnDocument.AFTER
+                )
+
+                if not task:
+                    # Only a failed conditional write pays the lookup telling a conflict from a missing task
+                    if request.expected_version is not None and nosql_service.count_documents(owner, limit=1):
+                        raise VersionConflictException(
+                            f'Task {request.id} was modified since version {request.expected_version}.'
+                        )
+                    raise PostUpdateBoardException('No record updated.')
 
-            if q_response.modified_count == 0:
-                raise PostUpdateBoardException('No record updated.')
-
-            return PostUpdateTaskResponse(
-                id=request.id,
-                position=request.position,
-                name=request.name,
-                description=request.description,
-                company_id=request.company_id,
-                date_created=request.date_created,
-                date_updated=request.date_updated
+                # Only the company owning the task moves, once the write matched. Delta sync pages on
+                # (company_id, change_seq, _id), inside the transaction the stamp commits with the write
+                change_seq = self.get_company_version_service().bump(company_id)
+                nosql_service.update_one({'_id': task['_id']}, {'$max': {'change_seq': change_seq}})
+
+                response = PostUpdateTaskResponse(
+                    id=request.id,
+                    position=task.get('position'),
+                    name=task.get('name'),
+                    description=task.get('description'),
+                    board_id=request.board_id,
+                    company_id=company_id,
+                    version=task.get('version'),
+                    date_created=task.get('date_created', request.date_created),
+                    date_updated=date_updated
+                )
+                self.get_outbox_service().record(CompanyEvent(
+                    event_type=EventTypeOptions.TASK_UPDATED,
+                    company_id=company_id,
+                    entity_id=request.id,
+                    payload=response.model_dump(mode='json')
+                ))
+                return response
+
+            return self.get_outbox_service().run_in_transaction(
+                [request.collection, DBCollectionEnum.COMPANY_VERSIONS.value], write
             )
+        except VersionConflictException:
+            raise
+
         except OperationFailure:
             raise PostUpdateBoardException('Error occurred during updating board.')
 
@@ -74,19 +121,19 @@ class APIController(
 
         Required fields:
             - id
-            - position
-            - name
-            - description
             - board_id
+            - at least one of position, name and description, none of them null
+            - a non-empty name, position 0 and an empty description are valid
         """
         if not request.id:
             raise PostUpdateBoardException('Task id is required.')
-        if not request.position:
-            raise PostUpdateBoardException('Task position is required.')
-        if not request.name:
-            raise PostUpdateBoardException('Task name is required.')
-        if not request.description:
-            raise PostUpdateBoardException('Task description is required.')
+
+        changes = request.get_changes()
+        if not changes:
+            raise PostUpdateBoardException('Nothing to update.')
+        for field, value in changes.items():
+            if value is None or (field == 'name' and not value):
+                raise PostUpdateBoardException(f'Task {field} is required.')
         if not request.board_id:
             raise PostUpdateBoardException('Task board id is required.')
         return True
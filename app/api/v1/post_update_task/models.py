@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from pydantic import BaseModel
 
@@ -24,23 +24,35 @@ class PostUpdateTaskRequest(PostUpdateTaskBaseModel):
     """
     Represents a request model for creating a company task board.
 
+    Only the fields the client sends are written, the others are left untouched.
+
     Attributes:
         id: task id
         name: task name
         description: task description
         position: task position
         board_id: board id
+        company_id: company id owning the board, targets the shard without a board lookup
+        expected_version: version the client read, the update fails with 409 if the task changed since
         date_created: date created
         date_updated: date updated
     """
     id: str
-    position: int
-    name: str
-    description: str
+    position: Optional[int] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
     board_id: str
+    company_id: Optional[str] = None
+    expected_version: Optional[int] = None
     date_created: datetime = datetime.now()
     date_updated: Optional[datetime] = None
 
+    def get_changes(self) -> Dict[str, Any]:
+        """
+        Get the fields the client sent, the only ones written by the update.
+        """
+        return self.model_dump(include={'position', 'name', 'description'}, exclude_unset=True)
+
 
 class PostUpdateTaskResponse(BaseModel):
     """
@@ -51,6 +63,8 @@ class PostUpdateTaskResponse(BaseModel):
         name: task name
         description: task description
         board_id: board id
+        company_id: company id owning the board
+        version: version of the task after the update
         date_created: date created
         date_updated: date updated
     """
@@ -59,5 +73,7 @@ class PostUpdateTaskResponse(BaseModel):
     name: str
     description: str
     board_id: str
+    company_id: Optional[str] = None
+    version: int
     date_created: datetime
     date_updated: Optional[datetime] = None
@@ -0,0 +1,190 @@
+import asyncio
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+
+from app.core.api.exceptions import AdmissionRejectedException
+from app.core.common.config import config
+from app.core.common.metrics import metrics_registry
+
+
+class AdmissionGate:
+    """
+    A concurrency limit with a bounded wait queue.
+
+    Requests beyond the limit wait in FIFO order, without holding a worker thread, and are
+    rejected when the queue is full or their wait exceeds the queue timeout. The gate is
+    shared by every event loop of the process, its state is guarded by a lock.
+
+    Attributes:
+        name (str): The name of the gate, used in rejection messages.
+        max_concurrency (int): The number of requests admitted at once.
+        max_queue (int): The number of requests allowed to wait for a slot.
+        queue_timeout_seconds (float): How long a request may wait for a slot.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout_seconds: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self._active = 0
+        self._rejected = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._lock = threading.Lock()
+
+    def _reject(self, reason: str) -> AdmissionRejectedException:
+        self._rejected += 1
+        return AdmissionRejectedException(
+            f'{self.name} is overloaded, {reason}.', retry_after=config.ADMISSION_RETRY_AFTER_SECONDS
+        )
+
+    async def acquire(self) -> None:
+        """
+        Wait for a slot.
+
+        Raises:
+        - AdmissionRejectedException: If the queue is full or the wait times out.
+        """
+        with self._lock:
+            if self._active < self.max_concurrency and not self._waiters:
+                self._active += 1
+                return
+
+            if len(self._waiters) >= self.max_queue:
+                raise self._reject('queue full')
+
+            loop = asyncio.get_running_loop()
+            waiter: Tuple[asyncio.AbstractEventLoop, asyncio.Future] = (loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(waiter[1], self.queue_timeout_seconds)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+            # A slot handed over while timing out is ours to give back, unless the grant
+            # is still pending, it then finds the future cancelled and gives it back itself
+            if waiter[1].done() and not waiter[1].cancelled():
+                self.release()
+
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise self._reject('timed out waiting for a slot')
+
+    def release(self) -> None:
+        """
+        Free a slot, handing it over to the oldest waiting request if any.
+        """
+        with self._lock:
+            if not self._waiters:
+                self._active -= 1
+                return
+
+            loop, future = self._waiters.popleft()
+
+        loop.call_soon_threadsafe(self._grant, future)
+
+    def _grant(self, future: asyncio.Future) -> None:
+        if future.done():
+            self.release()
+        else:
+            future.set_result(True)
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Get the current load of the gate.
+        """
+        with self._lock:
+            return {
+                'active': self._active,
+                'waiting': len(self._waiters),
+                'rejected': self._rejected,
+                'max_concurrency': self.max_concurrency,
+                'max_queue': self.max_queue,
+            }
+
+
+class AdmissionController:
+    """
+    Admission control in front of the controllers.
+
+    Each controller belongs to a priority class with its own gate, so a sign-in storm
+    spending its time hashing passwords can't starve the rest of the API and the other way
+    around. Controllers may add their own, tighter, concurrency limit on top.
+
+    Attributes:
+        _class_gates (Dict[str, AdmissionGate]): The gate of each priority class.
+        _controller_gates (Dict[str, AdmissionGate]): The gate of each controller with its own limit.
+    """
+
+    def __init__(self):
+        self._class_gates: Dict[str, AdmissionGate] = {}
+        self._controller_gates: Dict[str, AdmissionGate] = {}
+        self._lock = threading.Lock()
+
+    def _get_class_gate(self, admission_class: str) -> AdmissionGate:
+        with self._lock:
+            if admission_class not in self._class_gates:
+                self._class_gates[admission_class] = AdmissionGate(
+                    admission_class,
+                    config.ADMISSION_CONCURRENCY.get(admission_class, config.ADMISSION_CONCURRENCY['default']),
+                    config.ADMISSION_QUEUE.get(admission_class, config.ADMISSION_QUEUE['default']),
+                    config.ADMISSION_QUEUE_TIMEOUT_SECONDS
+                )
+            return self._class_gates[admission_class]
+
+    def _get_controller_gate(self, name: str, max_concurrency: Optional[int]) -> Optional[AdmissionGate]:
+        if not max_concurrency:
+            return None
+
+        with self._lock:
+            if name not in self._controller_gates:
+                self._controller_gates[name] = AdmissionGate(
+                    name, max_concurrency, max_concurrency * 2, config.ADMISSION_QUEUE_TIMEOUT_SECONDS
+                )
+            return self._controller_gates[name]
+
+    @asynccontextmanager
+    async def admit(self, name: str, admission_class: str, max_concurrency: Optional[int] = None) -> AsyncIterator[None]:
+        """
+        Admit a request for the duration of the block.
+
+        Parameters:
+        - name (str): The name of the controller.
+        - admission_class (str): The priority class of the controller.
+        - max_concurrency (Optional[int]): The concurrency limit of the controller, None for none.
+
+        Raises:
+        - AdmissionRejectedException: If the controller or its class is overloaded.
+        """
+        gates = [
+            gate
+            for gate in (self._get_controller_gate(name, max_concurrency), self._get_class_gate(admission_class))
+            if gate is not None
+        ]
+        acquired = []
+
+        try:
+            for gate in gates:
+                await gate.acquire()
+                acquired.append(gate)
+            yield
+        finally:
+            for gate in reversed(acquired):
+                gate.release()
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the current load of every gate.
+        """
+        with self._lock:
+            gates = {**self._class_gates, **self._controller_gates}
+        return {name: gate.snapshot() for name, gate in gates.items()}
+
+
+admission_controller: AdmissionController = AdmissionController()
+metrics_registry.register('admission', admission_controller.snapshot)
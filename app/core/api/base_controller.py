@@ -1,18 +1,49 @@
+import hashlib
 import importlib
 import os
 import logging
 from abc import ABC
+from datetime import datetime, timedelta
 from http import HTTPStatus
 from fastapi import HTTPException
-from typing import TypeVar, Generic, get_args, Optional, List, Union
+import pymongo
+from pymongo.errors import ConnectionFailure, PyMongoError, ServerSelectionTimeoutError
+from typing import Dict, TypeVar, Generic, get_args, Optional, List, Sequence, Union
+from uuid import uuid4
 
+from app.services.deferred.provider import DeferredJobServiceProvider
+from app.services.idempotency.provider import IdempotencyServiceProvider
 from app.services.tm_db.provider import TMMongoDBServiceProvider
-from app.core.common.base_schema import APIRequest, APIResponse, APIProcessReport
+from app.services.tm_db.circuit_breaker import circuit_breaker_scope
+from app.services.tm_db.consistency import ReadPolicy, consistency_scope
+from app.services.tm_db.tenant import is_valid_company_code, tenant_scope
+from app.core.api.exceptions import (
+    DatabaseUnavailableException,
+    DeadlineExceededException,
+    InvalidCompanyCodeException,
+    TenantForbiddenException
+)
+from app.core.common.config import config
+from app.core.common.base_schema import (
+    APIRequest,
+    APIResponse,
+    APIProcessReport,
+    APIRequestContext,
+    DeferredJobResponse
+)
+from app.core.common.queue_model import APIToLoadRequestModel
+from app.core.schema.job import JobModel
 from app.core.api.base_delegate import BaseAPIControllerDelegate
 from app.core.api.http_exceptions import (
+    HTTP_CODE_403_EXCEPTION_LIST,
+    HTTP_CODE_404_EXCEPTION_LIST,
+    HTTP_CODE_409_EXCEPTION_LIST,
+    HTTP_CODE_429_EXCEPTION_LIST,
     HTTP_CODE_424_EXCEPTION_LIST,
     HTTP_CODE_422_EXCEPTION_LIST,
-    HTTP_CODE_500_EXCEPTION_LIST
+    HTTP_CODE_500_EXCEPTION_LIST,
+    HTTP_CODE_503_EXCEPTION_LIST,
+    HTTP_CODE_504_EXCEPTION_LIST
 )
 
 logger = logging.getLogger('uvicorn')
@@ -31,8 +62,26 @@ class BaseAPIController(Generic[IT, OT], ABC):
             determining the controller name later.
         delegate (APIControllerDelegate): The delegate responsible
             for handling API controller actions.
-        is_cacheable (bool): Flag to determine if the response is cacheable.
+        is_cacheable (bool): Flag to determine if the response is cacheable. Cacheable
+            controllers answer with an ETag and honour `If-None-Match`.
         api_tags (List[str]): List of tags for the API controller.
+        read_preference (str): Where the reads of the controller are served from, 'primary',
+            'primaryPreferred', 'secondary', 'secondaryPreferred' or 'nearest'. Read-only
+            controllers tolerating replication lag move their load off the primary.
+        max_staleness_seconds (Optional[int]): How far behind the primary a secondary serving
+            the controller may be, at least 90 seconds, None for no limit.
+        request_timeout_seconds (Optional[float]): Time budget shared by every database operation
+            of a request, `REQUEST_TIMEOUT_SECONDS` when None.
+        admission_class (str): Priority class of the controller, each class has its own
+            concurrency limit and wait queue, see `app.core.api.admission`.
+        max_concurrency (Optional[int]): Requests of the controller processed at once, on top of
+            the limit of its class, None for no limit of its own.
+        rate_limit_keys (Sequence[str]): Kinds of keys the requests of the controller are rate
+            limited on, 'ip' and/or 'email', see `app.core.api.rate_limit`.
+        execution_mode (str): 'sync' to process requests while the client waits, 'deferred' to
+            answer `202` with a job id and process them on the queue workers, 'optional' to defer
+            only the requests sent with `Prefer: respond-async`. Only controllers inheriting
+            `DeferredJobServiceProvider` defer, clients poll fetch_job_status for the result.
 
     Methods:
         __init__(self, delegate: APIControllerDelegate) -> None:
@@ -52,7 +101,19 @@ class BaseAPIController(Generic[IT, OT], ABC):
                             Process the API request and return the response.
         validate_request(request: IT) -> bool:
                             Validate the API request data.
-        invoke(request: IT) -> OT:
+        get_version_token(request: IT) -> Optional[str]:
+                            Get a cheap token that changes whenever the response changes.
+        get_etag(request: IT) -> Optional[str]:
+                            Get the strong ETag of the response for the request.
+        get_company_code(request: IT, context: APIRequestContext) -> Optional[str]:
+                            Get the tenant the request is routed to.
+        get_idempotency_key(request: IT, context: APIRequestContext) -> Optional[str]:
+                            Get the scoped `Idempotency-Key` of the request.
+        get_rate_limit_keys(request: IT, context: APIRequestContext) -> Dict[str, str]:
+                            Get the value of each kind of key the request is rate limited on.
+        should_defer(context: APIRequestContext) -> bool:
+                            Check the request is processed on the queue workers.
+        invoke(request: IT, context: APIRequestContext) -> OT:
                             Invoke the API request and return the response.
 
     Note:
@@ -63,6 +124,13 @@ class BaseAPIController(Generic[IT, OT], ABC):
     _full_dir: str = __file__
     is_cacheable: bool = False
     api_tags: List[str] = []
+    read_preference: str = 'primary'
+    max_staleness_seconds: Optional[int] = None
+    request_timeout_seconds: Optional[float] = None
+    admission_class: str = 'default'
+    max_concurrency: Optional[int] = None
+    rate_limit_keys: Sequence[str] = ()
+    execution_mode: str = 'sync'
     delegate: BaseAPIControllerDelegate
 
     def __init__(self, delegate: BaseAPIControllerDelegate) -> None:
@@ -103,6 +171,12 @@ class BaseAPIController(Generic[IT, OT], ABC):
         path, filename = os.path.split(full_path)
         return path.split(os.sep)[-1:][0]
 
+    def get_version(self) -> str:
+        """
+        Get the API version of the controller, the package its folder is stored in.
+        """
+        return os.path.realpath(self._full_dir).split(os.sep)[-3]
+
     def get_api_tags(self) -> List[str]:
         """
         Get the tags for the API controller.
@@ -160,15 +234,328 @@ class BaseAPIController(Generic[IT, OT], ABC):
         """
         raise NotImplementedError
 
+    def get_version_token(self, request: IT) -> Optional[str]:
+        """
+        Get a cheap token that changes whenever the response for the request would change.
+
+        Cacheable controllers override this with a lookup that is cheaper than
+        building the response, e.g. the max `date_updated` of the documents involved.
+
+        Args:
+            request (IT): The API request data.
+
+        Returns:
+            Optional[str]: The version token, or None if the response can't be versioned.
+
+        """
+        return None
+
+    def get_etag(self, request: IT) -> Optional[str]:
+        """
+        Get the strong ETag of the response for the request.
+
+        The ETag is derived from the controller name, the version token and the
+        request payload, so the response body doesn't have to be built first.
+
+        Args:
+            request (IT): The API request data.
+
+        Returns:
+            Optional[str]: The quoted ETag, or None if the controller isn't cacheable.
+
+        """
+        if not self.is_cacheable:
+            return None
+
+        version_token: Optional[str] = self.get_version_token(request)
+        if version_token is None:
+            return None
+
+        fingerprint: str = f'{self.get_controller_name()}:{version_token}:{request.model_dump_json()}'
+        return f'"{hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:32]}"'
+
+    @staticmethod
+    def get_company_code(request: IT, context: APIRequestContext) -> Optional[str]:
+        """
+        Get the tenant the request is routed to, the one of the authenticated credentials.
+
+        Clients may still name it in the `company_code` of the request or the `X-Company-Code`
+        header, both are client-set and only accepted when they match the credentials.
+
+        Args:
+            request (IT): The API request data.
+            context (APIRequestContext): The transport-level context of the request.
+
+        Returns:
+            Optional[str]: The company_code, or None for the shared database.
+
+        Raises:
+            TenantForbiddenException: If the request names a tenant other than the one of its credentials.
+            InvalidCompanyCodeException: If the company_code can't be part of a database name.
+
+        """
+        requested: Optional[str] = getattr(request, 'company_code', None) or context.headers.get('x-company-code')
+        company_code: Optional[str] = context.company_code
+
+        if requested and requested != company_code:
+            raise TenantForbiddenException(f'The credentials of the request do not grant company_code {requested!r}.')
+
+        if company_code and not is_valid_company_code(company_code):
+            raise InvalidCompanyCodeException(f'Invalid company_code {company_code!r}.')
+
+        return company_code
+
+    def get_idempotency_key(self, request: IT, context: APIRequestContext) -> Optional[str]:
+        """
+        Get the `Idempotency-Key` of the request, scoped to the controller and the caller so
+        keys picked by different clients never collide.
+
+        Only controllers inheriting `IdempotencyServiceProvider` accept the header.
+
+        Args:
+            request (IT): The API request data.
+            context (APIRequestContext): The transport-level context of the request.
+
+        Returns:
+            Optional[str]: The scoped key, or None if the request doesn't carry one.
+
+        """
+        idempotency_key: Optional[str] = context.headers.get('idempotency-key')
+
+        if not idempotency_key or not isinstance(self, IdempotencyServiceProvider):
+            return None
+
+        return f'{self.get_controller_name()}:{self.get_caller(context)}:{idempotency_key[:255]}'
+
     @staticmethod
-    def on_error(e: Exception) -> HTTPException:
+    def get_caller(context: APIRequestContext) -> str:
+        """
+        Get a stable identifier of the caller, the id of its authenticated credentials, so it
+        survives token refreshes and is shared by the sessions of the user. Unauthenticated
+        requests are told apart by the hash of their API key.
+
+        Args:
+            context (APIRequestContext): The transport-level context of the request.
+
+        Returns:
+            str: The identifier of the caller.
+
+        """
+        if context.user_id:
+            return context.user_id
+        return hashlib.sha256(context.headers.get('x-api-key', '').encode('utf-8')).hexdigest()[:16]
+
+    def get_rate_limit_keys(self, request: IT, context: APIRequestContext) -> Dict[str, str]:
+        """
+        Get the value of each kind of key in `rate_limit_keys` for the request, the kinds the
+        request doesn't carry are left out.
+
+        Args:
+            request (IT): The API request data.
+            context (APIRequestContext): The transport-level context of the request.
+
+        Returns:
+            Dict[str, str]: The value of each kind of key, e.g. {'ip': '10.0.0.1', 'email': 'a@b.c'}.
+
+        """
+        values: Dict[str, Optional[str]] = {
+            'ip': context.client_host,
+            'email': str(getattr(request, 'email', '') or '').strip().lower(),
+        }
+        return {kind: values[kind] for kind in self.rate_limit_keys if values.get(kind)}
+
+    def should_defer(self, context: APIRequestContext) -> bool:
+        """
+        Check the request is answered with `202` and processed on the queue workers, according
+        to `execution_mode`. A request processed for its job is never deferred again.
+
+        Args:
+            context (APIRequestContext): The transport-level context of the request.
+
+        Returns:
+            bool: Whether the request is deferred.
+
+        """
+        if context.job_id or not isinstance(self, DeferredJobServiceProvider):
+            return False
+
+        if self.execution_mode == 'deferred':
+            return True
+
+        return self.execution_mode == 'optional' and 'respond-async' in context.headers.get('prefer', '').lower()
+
+    def _defer(self, request: IT, context: APIRequestContext) -> DeferredJobResponse:
+        """
+        Enqueue the request for the queue workers. Repeats carrying the same `Idempotency-Key`
+        get the job enqueued first.
+
+        Args:
+            request (IT): The API request data.
+            context (APIRequestContext): The transport-level context of the request.
+
+        Returns:
+            DeferredJobResponse: The id of the job.
+
+        """
+        caller: str = self.get_caller(context)
+        idempotency_key: Optional[str] = context.headers.get('idempotency-key')
+        job_id: str = hashlib.sha256(
+            f'{self.get_controller_name()}:{caller}:{idempotency_key[:255]}'.encode('utf-8')
+        ).hexdigest()[:32] if idempotency_key else uuid4().hex
+
+        now: datetime = datetime.utcnow()
+        job: JobModel = self.get_deferred_job_service().enqueue(JobModel(
+            _id=job_id,
+            request=APIToLoadRequestModel(
+                class_name=self.get_request_type().__name__,
+                controller_name=self.get_controller_name(),
+                request_model_path=self.get_request_type().__module__,
+                version=self.get_version(),
+                payload=request.model_dump(mode='json')
+            ),
+            company_code=self.get_company_code(request, context),
+            caller=caller,
+            date_created=now,
+            expires_at=now + timedelta(seconds=config.DEFERRED_JOB_TTL_SECONDS)
+        ))
+
+        if 'respond-async' in context.headers.get('prefer', '').lower():
+            context.response_headers['Preference-Applied'] = 'respond-async'
+        return DeferredJobResponse(job_id=job.id)
+
+    def _process_request(self, request: IT, context: APIRequestContext) -> Union[OT, List[OT]]:
+        """
+        Process the request at most once per `Idempotency-Key`, repeats get the stored response.
+
+        Args:
+            request (IT): The API request data.
+            context (APIRequestContext): The transport-level context of the request.
+
+        Returns:
+            OT: The API response data.
+
+        """
+        idempotency_key: Optional[str] = self.get_idempotency_key(request, context)
+        if not idempotency_key:
+            return self.process_request(request)
+
+        idempotency_service = self.get_idempotency_service()
+        fingerprint: str = hashlib.sha256(request.model_dump_json().encode('utf-8')).hexdigest()
+
+        stored_response = idempotency_service.claim(idempotency_key, fingerprint)
+        if stored_response is not None:
+            context.replayed = True
+            context.response_headers['Idempotent-Replayed'] = 'true'
+            return self.get_response_type().model_validate(stored_response)
+
+        try:
+            output: OT = self.process_request(request)
+        except BaseException:
+            idempotency_service.release(idempotency_key)
+            raise
+
+        try:
+            idempotency_service.complete(idempotency_key, output.model_dump(mode='json'))
+        except Exception as e:
+            # The write is committed, failing now would only make the client retry it. The key stays
+            # in flight, a retry after its lease expires takes it over and runs the request again
+            logger.error(
+                f'{self.get_controller_name()} could not store the response of Idempotency-Key '
+                f'{idempotency_key}, a retry after {config.IDEMPOTENCY_LEASE_SECONDS}s runs it again: {str(e)}'
+            )
+        return output
+
+    @staticmethod
+    def _etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+        """
+        Check the ETag against the `If-None-Match` header (weak comparison, RFC 9110).
+
+        :param etag:
+        :param if_none_match:
+        :return:
+        """
+        if not if_none_match:
+            return False
+
+        candidates: List[str] = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in candidates or etag in [tag[2:] if tag.startswith('W/') else tag for tag in candidates]
+
+    def get_request_timeout(self) -> float:
+        """
+        Get the time budget of the database operations of a request.
+
+        Returns:
+            float: The budget in seconds.
+
+        """
+        return self.request_timeout_seconds or config.REQUEST_TIMEOUT_SECONDS
+
+    @staticmethod
+    def _translate_database_error(e: Exception) -> Exception:
+        """
+        Translate a database timeout or outage into the matching controller exception.
+
+        Controllers often wrap database errors into their own exceptions, the whole chain
+        of causes is inspected. Driver messages list the hosts and topology of the cluster,
+        they are logged and the client gets a fixed message.
+
+        :param e:
+        :return:
+        """
+        cause: Optional[BaseException] = e
+
+        while cause is not None:
+            if isinstance(cause, ServerSelectionTimeoutError):
+                logger.warning(f'Database unreachable: {str(cause)}')
+                return DatabaseUnavailableException(
+                    'The database can not be reached.', retry_after=config.DATABASE_RETRY_AFTER_SECONDS
+                )
+
+            if isinstance(cause, PyMongoError) and cause.timeout:
+                logger.warning(f'Database operation timed out: {str(cause)}')
+                return DeadlineExceededException('The request ran out of time waiting for the database.')
+
+            if isinstance(cause, ConnectionFailure):
+                logger.warning(f'Database connection failed: {str(cause)}')
+                return DatabaseUnavailableException(
+                    'The database can not be reached.', retry_after=config.DATABASE_RETRY_AFTER_SECONDS
+                )
+
+            cause = cause.__cause__ or cause.__context__
+
+        return e
+
+    @classmethod
+    def on_error(cls, e: Exception) -> HTTPException:
         """
         Standardize return statement when api failed
 
         :param e:
         :return:
         """
-        if isinstance(e, HTTP_CODE_424_EXCEPTION_LIST):
+        e = cls._translate_database_error(e)
+        retry_after: Optional[int] = getattr(e, 'retry_after', None)
+        headers: Optional[dict] = {'Retry-After': str(retry_after)} if retry_after else None
+
+        if isinstance(e, HTTP_CODE_503_EXCEPTION_LIST):
+            return HTTPException(status_code=503, detail=str(e), headers=headers)
+
+        elif isinstance(e, HTTP_CODE_504_EXCEPTION_LIST):
+            return HTTPException(status_code=504, detail=str(e), headers=headers)
+
+        elif isinstance(e, HTTP_CODE_403_EXCEPTION_LIST):
+            return HTTPException(status_code=403, detail=str(e))
+
+        elif isinstance(e, HTTP_CODE_404_EXCEPTION_LIST):
+            return HTTPException(status_code=404, detail=str(e))
+
+        elif isinstance(e, HTTP_CODE_409_EXCEPTION_LIST):
+            return HTTPException(status_code=409, detail=str(e), headers=headers)
+
+        elif isinstance(e, HTTP_CODE_429_EXCEPTION_LIST):
+            return HTTPException(status_code=429, detail=str(e), headers=headers)
+
+        elif isinstance(e, HTTP_CODE_424_EXCEPTION_LIST):
             return HTTPException(status_code=424, detail=str(e))
 
         elif isinstance(e, HTTP_CODE_422_EXCEPTION_LIST):
@@ -180,34 +567,79 @@ class BaseAPIController(Generic[IT, OT], ABC):
         else:
             return HTTPException(status_code=500, detail=str(e))
 
-    def invoke(self, request: IT) -> Optional[Union[OT, List[OT]]]:
+    def invoke(self, request: IT, context: Optional[APIRequestContext] = None) -> Optional[Union[OT, List[OT]]]:
         """
         Invoke the API request and return the response.
 
         Args:
             request (IT): The API request data.
+            context (APIRequestContext): The transport-level context of the request.
+
+        The request runs in causally consistent sessions resuming from the `X-Causal-Token`
+        of the client's previous response, so reads served by secondaries still see the
+        client's own writes. Its database operations share the budget of `get_request_timeout`,
+        sent to the server as `maxTimeMS`, a request running out of it fails with 504.
+        Controllers accepting an `Idempotency-Key` process each key at most once. Deferred
+        requests are validated, then enqueued rather than processed, see `should_defer`.
 
         Returns:
-            OT: The API response data.
+            OT: The API response data, or the `DeferredJobResponse` of a deferred request.
+
+        Raises:
+            HTTPException: 304 when the client already holds the current representation,
+                503 when the database can't be reached, 504 when the time budget runs out.
 
         """
+        context = context or APIRequestContext()
         output: Optional[APIResponse] = None
+        read_policy = ReadPolicy(self.read_preference, self.max_staleness_seconds)
 
         try:
-            self.validate_request(request)
-
-            output: Union[OT, List[OT]] = self.process_request(request)
-
-            self.delegate.on_process_finished(
-                APIProcessReport(
-                    status_code=HTTPStatus.OK,
-                    response=output,
-                    message=None,
-                    request=request
-                )
-            )
-
-            return output
+            with tenant_scope(self.get_company_code(request, context)), \
+                    consistency_scope(read_policy, context.headers.get('x-causal-token')) as scope, \
+                    pymongo.timeout(self.get_request_timeout()), \
+                    circuit_breaker_scope():
+                self.validate_request(request)
+
+                if self.should_defer(context):
+                    return self._defer(request, context)
+
+                etag: Optional[str] = self.get_etag(request)
+                if etag:
+                    context.response_headers['ETag'] = etag
+
+                    if self._etag_matches(etag, context.headers.get('if-none-match')):
+                        self.delegate.on_process_finished(
+                            APIProcessReport(
+                                status_code=HTTPStatus.NOT_MODIFIED,
+                                response=None,
+                                message=None,
+                                request=request
+                            )
+                        )
+                        raise HTTPException(status_code=HTTPStatus.NOT_MODIFIED, headers={'ETag': etag})
+
+                output: Union[OT, List[OT]] = self._process_request(request, context)
+
+                causal_token: Optional[str] = scope.get_causal_token()
+                if causal_token:
+                    context.response_headers['X-Causal-Token'] = causal_token
+
+                # A replay already had its side effects, e.g. the events published by the delegate
+                if not context.replayed:
+                    self.delegate.on_process_finished(
+                        APIProcessReport(
+                            status_code=HTTPStatus.OK,
+                            response=output,
+                            message=None,
+                            request=request
+                        )
+                    )
+
+                return output
+
+        except HTTPException:
+            raise
 
         except Exception as e:
             http_exception: HTTPException = self.on_error(e)
@@ -18,9 +18,27 @@ class DBCollectionEnum(Enum):
         COMPANIES: companies collection
         BOARDS: boards collection
         TASKS: tasks collection
+        COMPANY_VERSIONS: per-company change counters collection
+        TOMBSTONES: deleted boards and tasks, read by delta sync
+        IDEMPOTENCY_KEYS: requests made with an Idempotency-Key and their responses
+        REVOKED_TOKENS: signed access tokens revoked before their expiry
+        SESSIONS: signed-in sessions, several per user, deleted once expired
+        RATE_LIMITS: request counters of the shared rate limit store, deleted once their window is over
+        OUTBOX: change events written with the data, relayed to the job queue
+        JOBS: deferred requests, their state and result, deleted once expired
+        MIGRATIONS: data migrations applied to the shared database
     """
     USERS: str = 'Users'
     AUTH_CREDENTIALS: str = 'AuthCredentials'
     COMPANIES: str = 'Companies'
     BOARDS: str = 'Boards'
     TASKS: str = 'Tasks'
+    COMPANY_VERSIONS: str = 'CompanyVersions'
+    TOMBSTONES: str = 'Tombstones'
+    IDEMPOTENCY_KEYS: str = 'IdempotencyKeys'
+    REVOKED_TOKENS: str = 'RevokedTokens'
+    SESSIONS: str = 'Sessions'
+    RATE_LIMITS: str = 'RateLimits'
+    OUTBOX: str = 'Outbox'
+    JOBS: str = 'Jobs'
+    MIGRATIONS: str = 'Migrations'
@@ -0,0 +1,89 @@
+from typing import Optional
+
+from app.core.common.base_exception import BaseCustomException
+
+
+class APIControllerException(BaseCustomException):
+    """
+    Base exception for errors raised by the controller framework itself.
+
+    Attributes:
+        retry_after (Optional[int]): Seconds the client should wait before retrying, sent as `Retry-After`.
+    """
+    retry_after: Optional[int] = None
+
+    def __init__(self, message: str, retry_after: Optional[int] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class InvalidCompanyCodeException(APIControllerException):
+    """
+    Raise when the company_code of a request can't be used to route it to a tenant.
+    """
+
+
+class TenantForbiddenException(APIControllerException):
+    """
+    Raise when a request asks for a tenant other than the one of its authenticated credentials.
+    """
+
+
+class ScatterGatherQueryException(APIControllerException):
+    """
+    Raise when a query on a sharded collection doesn't target its shard key, with SHARD_QUERY_CHECK=raise.
+    """
+
+
+class DeadlineExceededException(APIControllerException):
+    """
+    Raise when a request runs out of its time budget before completing.
+    """
+
+
+class DatabaseUnavailableException(APIControllerException):
+    """
+    Raise when no database server can be reached to serve the request.
+    """
+
+
+class QueueUnavailableException(APIControllerException):
+    """
+    Raise when the queue broker didn't confirm a published message.
+    """
+
+
+class AdmissionRejectedException(APIControllerException):
+    """
+    Raise when a request is shed because its controller or priority class is overloaded.
+    """
+
+
+class RateLimitedException(APIControllerException):
+    """
+    Raise when a client made more requests than its rate limit allows.
+    """
+
+
+class VersionConflictException(APIControllerException):
+    """
+    Raise when a document was modified since the version the client read.
+    """
+
+
+class IdempotencyKeyReusedException(APIControllerException):
+    """
+    Raise when an Idempotency-Key is reused for a request with another payload.
+    """
+
+
+class IdempotencyKeyInProgressException(APIControllerException):
+    """
+    Raise when the request holding an Idempotency-Key is still being processed.
+    """
+
+
+class JobNotFoundException(APIControllerException):
+    """
+    Raise when a deferred job doesn't exist, expired or was enqueued by another caller.
+    """
@@ -1,9 +1,49 @@
 from typing import Tuple
 
+from app.core.api.exceptions import (
+    AdmissionRejectedException,
+    DatabaseUnavailableException,
+    DeadlineExceededException,
+    IdempotencyKeyInProgressException,
+    IdempotencyKeyReusedException,
+    InvalidCompanyCodeException,
+    JobNotFoundException,
+    QueueUnavailableException,
+    RateLimitedException,
+    ScatterGatherQueryException,
+    TenantForbiddenException,
+    VersionConflictException
+)
+
 
 # This status code indicates that the server understands the content type of the request entity,
 # and the syntax of the request is correct, but it was unable to process the contained instructions.
-HTTP_CODE_422_EXCEPTION_LIST: Tuple = ()
+HTTP_CODE_422_EXCEPTION_LIST: Tuple = (
+    IdempotencyKeyReusedException,
+    InvalidCompanyCodeException,
+)
+
+# The credentials of the caller don't grant access to the requested resource, e.g. another tenant.
+HTTP_CODE_403_EXCEPTION_LIST: Tuple = (
+    TenantForbiddenException,
+)
+
+# The requested resource doesn't exist, or isn't visible to the caller.
+HTTP_CODE_404_EXCEPTION_LIST: Tuple = (
+    JobNotFoundException,
+)
+
+# The request conflicts with the current state of the target resource, e.g. another request
+# holding the same Idempotency-Key is still in progress, or the document was modified since it was read.
+HTTP_CODE_409_EXCEPTION_LIST: Tuple = (
+    IdempotencyKeyInProgressException,
+    VersionConflictException,
+)
+
+# The client sent too many requests in a given amount of time, and may retry after the delay in `Retry-After`.
+HTTP_CODE_429_EXCEPTION_LIST: Tuple = (
+    RateLimitedException,
+)
 
 # This status code means that the method could not be performed on the resource because the
 # requested action depended on another action and that action failed.
@@ -11,4 +51,18 @@ HTTP_CODE_424_EXCEPTION_LIST: Tuple = ()
 
 # This indicates that the server has encountered a situation it doesn't know how to handle
 HTTP_CODE_500_EXCEPTION_LIST: Tuple = (
+    ScatterGatherQueryException,
+)
+
+# The server is currently unable to handle the request, e.g. it is overloaded or its database can't be reached,
+# and the client may retry after the delay in `Retry-After`.
+HTTP_CODE_503_EXCEPTION_LIST: Tuple = (
+    AdmissionRejectedException,
+    DatabaseUnavailableException,
+    QueueUnavailableException,
+)
+
+# The server didn't complete the request within its time budget.
+HTTP_CODE_504_EXCEPTION_LIST: Tuple = (
+    DeadlineExceededException,
 )
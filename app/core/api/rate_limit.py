@@ -0,0 +1,177 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Mapping, NamedTuple, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+
+from app.core.api.exceptions import RateLimitedException
+from app.core.common.config import config
+from app.core.common.metrics import metrics_registry
+
+
+def get_client_host(http_request: Request) -> Optional[str]:
+    """
+    Get the address of the client, the key of the per-IP limits.
+
+    Behind `TRUSTED_PROXY_HOPS` reverse proxies the peer is the nearest proxy, each of them appends
+    the address it saw to `X-Forwarded-For`, so the client is the entry that many from the end.
+    Entries further left are sent by the client and can't be trusted.
+
+    Parameters:
+    - http_request (Request): The HTTP request.
+
+    Returns:
+    - Optional[str]: The address of the client, None if unknown.
+    """
+    peer: Optional[str] = http_request.client.host if http_request.client else None
+    hops: int = config.TRUSTED_PROXY_HOPS
+    if hops <= 0:
+        return peer
+
+    forwarded: List[str] = [
+        address.strip() for address in http_request.headers.get('x-forwarded-for', '').split(',') if address.strip()
+    ]
+    if len(forwarded) < hops:
+        # The request didn't go through every proxy, e.g. it reached the app directly
+        return peer
+
+    return forwarded[-hops]
+
+
+class RateLimit(NamedTuple):
+    """
+    A limit of `limit` requests per `window_seconds`.
+    """
+    limit: int
+    window_seconds: float
+
+
+class RateLimitBackend:
+    """
+    Storage of the rate limit state, the memory backend only limits a single node.
+
+    Attributes:
+        blocking (bool): Whether `hit` does I/O, it is then called from a worker thread.
+    """
+    blocking: bool = False
+
+    def hit(self, key: str, rate_limit: RateLimit) -> Optional[float]:
+        """
+        Count a request against the limit of a key.
+
+        Parameters:
+        - key (str): The key being limited, e.g. 'post_signin:ip:10.0.0.1'.
+        - rate_limit (RateLimit): The limit of the key.
+
+        Returns:
+        - Optional[float]: None if the request is allowed, otherwise the seconds until it would be.
+        """
+        raise NotImplementedError
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Token buckets in memory, refilled continuously at `limit / window_seconds` tokens per second.
+
+    At most `RATE_LIMIT_MAX_KEYS` buckets are kept, the least recently hit are dropped first,
+    a dropped bucket comes back full.
+    """
+
+    def __init__(self):
+        self._buckets: 'OrderedDict[str, List[float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, rate_limit: RateLimit) -> Optional[float]:
+        now: float = time.monotonic()
+        refill_rate: float = rate_limit.limit / rate_limit.window_seconds
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(rate_limit.limit), now]
+                while len(self._buckets) > config.RATE_LIMIT_MAX_KEYS:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(float(rate_limit.limit), bucket[0] + (now - bucket[1]) * refill_rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return None
+
+            return (1 - bucket[0]) / refill_rate
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RateLimiter:
+    """
+    Rate limits in front of the controllers, checked before admission so rejected attempts
+    never queue, read the database or hash a password.
+
+    Controllers list the kinds of keys they are limited on in `rate_limit_keys`, e.g. 'ip'
+    and 'email', each kind has its own limit in `RATE_LIMITS`.
+
+    Attributes:
+        _backend (RateLimitBackend): The storage of the rate limit state.
+        _rejected (Dict[str, int]): The rejected requests per kind of key.
+    """
+
+    def __init__(self, backend: Optional[RateLimitBackend] = None):
+        self._backend: RateLimitBackend = backend or MemoryRateLimitBackend()
+        self._rejected: Dict[str, int] = {}
+
+    def set_backend(self, backend: RateLimitBackend) -> None:
+        """
+        Replace the storage of the rate limit state, e.g. by one shared between nodes.
+        """
+        self._backend = backend
+
+    def _hit(self, name: str, keys: Mapping[str, str]) -> None:
+        for kind, value in keys.items():
+            limit = config.RATE_LIMITS.get(kind)
+            if not limit or not value:
+                continue
+
+            retry_after: Optional[float] = self._backend.hit(f'{name}:{kind}:{value}', RateLimit(*limit))
+            if retry_after is not None:
+                self._rejected[kind] = self._rejected.get(kind, 0) + 1
+                raise RateLimitedException(
+                    f'Too many requests for this {kind}.', retry_after=max(1, int(retry_after + 0.999))
+                )
+
+    async def check(self, name: str, keys: Mapping[str, str]) -> None:
+        """
+        Count a request against the limit of each of its keys, the first key over its limit rejects it.
+
+        Parameters:
+        - name (str): The name of the controller.
+        - keys (Mapping[str, str]): The value of each kind of key of the request, e.g. {'ip': '10.0.0.1'}.
+
+        Raises:
+        - RateLimitedException: If a key is over its limit.
+        """
+        if not keys:
+            return
+
+        if self._backend.blocking:
+            await run_in_threadpool(self._hit, name, keys)
+        else:
+            self._hit(name, keys)
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Get the backend in use and the rejected requests per kind of key.
+        """
+        return {
+            'backend': type(self._backend).__name__,
+            'rejected': dict(self._rejected),
+        }
+
+
+rate_limiter: RateLimiter = RateLimiter()
+metrics_registry.register('rate_limits', rate_limiter.snapshot)
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional, TypeVar, Generic
+from typing import Optional, TypeVar, Generic, Dict
 
 from pydantic import BaseModel, Field
 
@@ -35,6 +35,28 @@ class APIRequest(BaseModel):
     company_code: str
 
 
+class APIRequestContext(BaseModel):
+    """
+    Represents the transport-level context of a single API invocation.
+
+    Attributes:
+        headers (Dict[str, str]): The request headers, keys are lower-cased.
+        client_host (Optional[str]): The address of the calling client, if known.
+        response_headers (Dict[str, str]): Headers the controller wants attached to the response.
+        job_id (Optional[str]): The deferred job the request is processed for, None while the client waits.
+        user_id (Optional[str]): The id of the authenticated credentials, None on public routes.
+        company_code (Optional[str]): The tenant of the authenticated credentials, None for the shared database.
+        replayed (bool): Whether the response is the stored one of an earlier request with the same Idempotency-Key.
+    """
+    headers: Dict[str, str] = Field(default_factory=dict)
+    client_host: Optional[str] = None
+    response_headers: Dict[str, str] = Field(default_factory=dict)
+    job_id: Optional[str] = None
+    user_id: Optional[str] = None
+    company_code: Optional[str] = None
+    replayed: bool = False
+
+
 class APIListRequest(BaseModel):
     """
     Represents a request object for API calls that involve pagination.
@@ -61,6 +83,17 @@ class APIResponse(BaseModel):
     status: DefaultAPIResponseStatus = Field(default=DefaultAPIResponseStatus.OK)
 
 
+class DeferredJobResponse(APIResponse):
+    """
+    Represents the `202` answer of a deferred request, its result is fetched through fetch_job_status.
+
+    Attributes:
+        job_id (str): The id of the job processing the request.
+    """
+    job_id: str
+    status: DefaultAPIResponseStatus = Field(default=DefaultAPIResponseStatus.ENQUEUE)
+
+
 class APIListResponse(APIResponse):
     """
     Base class for representing API responses.
@@ -0,0 +1,59 @@
+from typing import Any, Dict, List, Mapping, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BatchEntry(BaseModel):
+    """
+    Model for a controller call of a batch
+
+    Attributes:
+        id (Optional[str]): The id of the entry within the batch, its position by default
+        controller (str): The name of the controller, e.g. fetch_companies
+        payload (Mapping[str, Any]): The request of the controller
+        depends_on (List[str]): The ids of earlier entries the entry runs after, it is skipped if one failed
+    """
+    id: Optional[str] = None
+    controller: str
+    payload: Mapping[str, Any] = Field(default_factory=dict)
+    depends_on: List[str] = Field(default_factory=list)
+
+
+class BatchRequest(BaseModel):
+    """
+    Model for a batch of controller calls made in one HTTP request
+
+    Attributes:
+        entries (List[BatchEntry]): The controller calls, run concurrently unless they depend on each other
+    """
+    entries: List[BatchEntry]
+
+
+class BatchEntryResult(BaseModel):
+    """
+    Model for the outcome of a controller call of a batch
+
+    Attributes:
+        id (str): The id of the entry
+        controller (str): The name of the controller
+        status_code (int): The HTTP status the call would have been answered with
+        body (Optional[Any]): The response of the controller, when the call succeeded
+        error (Optional[str]): The error of the call, when it failed
+        headers (Dict[str, str]): The response headers of the call, e.g. ETag or X-Causal-Token
+    """
+    id: str
+    controller: str
+    status_code: int
+    body: Optional[Any] = None
+    error: Optional[str] = None
+    headers: Dict[str, str] = Field(default_factory=dict)
+
+
+class BatchResponse(BaseModel):
+    """
+    Model for the outcomes of a batch, in the order of its entries
+
+    Attributes:
+        results (List[BatchEntryResult]): The outcome of each entry
+    """
+    results: List[BatchEntryResult]
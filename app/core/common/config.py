@@ -1,3 +1,5 @@
+from typing import Dict, List
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,6 +15,64 @@ class ConfigReader(BaseSettings):
         NOSQL_DB: str: NoSQL database
         NOSQL_USER: str: NoSQL user
         NOSQL_PWD: str: NoSQL password
+        ALGORITHM: str: HMAC algorithm of signed auth tokens, 'HS256', 'HS384' or 'HS512'
+        AUTH_TOKEN_EXPIRY: int: Lifetime of an auth token in seconds
+        AUTH_TOKEN_MODE: str: Kind of auth tokens issued, 'opaque' (checked against the database) or 'signed'
+        REVOCATION_SYNC_SECONDS: float: How often a worker pulls the signed tokens revoked on other workers
+        REVOCATION_BLOOM_CAPACITY: int: Revoked tokens the bloom filter is sized for, it grows past it
+        REVOCATION_BLOOM_ERROR_RATE: float: Target false-positive rate of the bloom filter
+        CREDENTIAL_NEGATIVE_CACHE_SECONDS: float: How long an email without credentials is remembered, per process
+        CREDENTIAL_NEGATIVE_CACHE_SIZE: int: Emails without credentials remembered at most, 0 to disable the cache
+        PASSWORD_PBKDF2_ITERATIONS: int: Iterations of the PBKDF2 pre-hash of new password hashes
+        PASSWORD_BCRYPT_ROUNDS: int: bcrypt cost factor of new password hashes, see `python -m benchmarks calibrate`
+        PASSWORD_HASH_TIMEOUT_SECONDS: float: Time allowed per password hash, added to the request budget of the controllers hashing passwords
+        EVENTS_SOURCE: str: Producer of company events, 'delegate' or 'change_stream'
+        EVENTS_BUFFER_SIZE: int: Events buffered per subscriber before it is asked to resync
+        EVENTS_KEEPALIVE_SECONDS: float: Interval of keepalive comments on idle event streams
+        TENANT_ROUTING_MODE: str: Placement of tenant collections, 'shared' or 'database' (one database per company_code)
+        TENANT_URI_MAP: Dict[str, str]: Dedicated cluster URI per company_code, as JSON, used in 'database' mode
+        SHARDING_ENABLED: bool: Whether Boards and Tasks are sharded, filters then carry the shard key
+        SHARD_QUERY_CHECK: str: Handling of queries not targeting the shard key, 'off', 'warn' or 'raise'
+        REQUEST_TIMEOUT_SECONDS: float: Default time budget of the database operations of a request
+        DATABASE_RETRY_AFTER_SECONDS: int: Retry-After sent when the database can't be reached
+        NOSQL_SERVER_SELECTION_TIMEOUT_MS: int: How long an operation waits for a reachable server
+        CIRCUIT_BREAKER_FAILURE_THRESHOLD: int: Consecutive failed requests opening the circuit breaker of a cluster
+        CIRCUIT_BREAKER_RESET_SECONDS: float: How long an open circuit breaker fails requests fast
+        CIRCUIT_BREAKER_HALF_OPEN_PROBES: int: Requests let through at once to probe a recovering cluster
+        IDEMPOTENCY_STORE: str: Store of the idempotency keys, 'mongo' or 'memory' (single node only)
+        IDEMPOTENCY_TTL_SECONDS: int: How long the response of an idempotency key is kept
+        IDEMPOTENCY_LEASE_SECONDS: int: How long an in-flight idempotency key is held before it can be taken over
+        IDEMPOTENCY_WAIT_SECONDS: float: How long a repeat waits for the in-flight request holding its key
+        ADMISSION_CONCURRENCY: Dict[str, int]: Requests processed at once per priority class, as JSON
+        ADMISSION_QUEUE: Dict[str, int]: Requests waiting for a slot per priority class, as JSON
+        ADMISSION_QUEUE_TIMEOUT_SECONDS: float: How long a request may wait for a slot before being shed
+        ADMISSION_RETRY_AFTER_SECONDS: int: Retry-After sent with shed requests
+        RATE_LIMIT_BACKEND: str: Store of the rate limit state, 'memory' (per process) or 'mongo' (shared by every node)
+        RATE_LIMITS: Dict[str, List[float]]: Requests allowed per kind of key, as JSON [limit, window in seconds]
+        RATE_LIMIT_MAX_KEYS: int: Keys tracked at most by the memory store, the least recently seen are dropped
+        TRUSTED_PROXY_HOPS: int: Reverse proxies in front of the app, the client IP is then read from X-Forwarded-For
+        QUEUE_BROKER: str: Broker of the job queues, 'sqlite'
+        QUEUE_SQLITE_PATH: str: Database file of the SQLite broker, shared by the API and its workers, or ':memory:'
+        QUEUE_PREFETCH: int: Unacked messages a worker holds at once
+        QUEUE_WORKER_CONCURRENCY: int: Jobs a worker process runs at once
+        QUEUE_VISIBILITY_TIMEOUT_SECONDS: float: How long a worker holds a message before it is delivered again
+        QUEUE_MAX_ATTEMPTS: int: Deliveries of a message before it is dead-lettered
+        QUEUE_RETRY_DELAY_SECONDS: float: Backoff before a failed job is delivered again, doubled on each attempt
+        QUEUE_POLL_SECONDS: float: How often an idle worker polls for messages published by other processes
+        QUEUE_PUBLISH_RETRIES: int: Attempts at publishing a message before giving up
+        QUEUE_RETRY_AFTER_SECONDS: int: Retry-After sent when the queue broker can't be reached
+        OUTBOX_RELAY: bool: Whether this process relays the outbox to the job queue
+        OUTBOX_RELAY_SECONDS: float: How often the relay looks for pending events
+        OUTBOX_BATCH_SIZE: int: Events the relay publishes at once
+        OUTBOX_LEASE_SECONDS: float: How long a relay holds the events it claimed before another may claim them
+        OUTBOX_RETENTION_SECONDS: int: How long sent events are kept
+        DEFERRED_JOB_TTL_SECONDS: int: How long deferred jobs and their results are kept
+        DEFERRED_JOB_MAX_RESULT_BYTES: int: Largest response stored in a job, larger ones fail the job with 507
+        BATCH_MAX_ENTRIES: int: Controller calls a single /v1/batch request may carry
+        SMTP_HOST: str: Server the send_email job relays through, emails are only logged when empty
+        SMTP_PORT: int: Port of the SMTP server
+        SMTP_SENDER: str: From address of the emails sent
+        EVENTS_WEBHOOK_URL: str: Endpoint the company_event job POSTs each outbox event to, events are only logged when empty
     """
     model_config = SettingsConfigDict(env_file='.env', env_file_encoding='utf-8', extra='ignore')
 
@@ -25,7 +85,80 @@ class ConfigReader(BaseSettings):
     NOSQL_USER: str
     NOSQL_PWD: str
 
+    ALGORITHM: str = 'HS256'
     AUTH_TOKEN_EXPIRY: int
+    AUTH_TOKEN_MODE: str = 'opaque'
+    REVOCATION_SYNC_SECONDS: float = 5.0
+    REVOCATION_BLOOM_CAPACITY: int = 100000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    CREDENTIAL_NEGATIVE_CACHE_SECONDS: float = 60.0
+    CREDENTIAL_NEGATIVE_CACHE_SIZE: int = 10000
+    # Passwords hashed with other parameters are rehashed on their next sign-in
+    PASSWORD_PBKDF2_ITERATIONS: int = 14
+    PASSWORD_BCRYPT_ROUNDS: int = 14
+    # Hashing runs inside the request budget, this keeps it from eating the time of the database operations
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 2.0
+
+    EVENTS_SOURCE: str = 'delegate'
+    EVENTS_BUFFER_SIZE: int = 100
+    EVENTS_KEEPALIVE_SECONDS: float = 15.0
+
+    TENANT_ROUTING_MODE: str = 'shared'
+    TENANT_URI_MAP: Dict[str, str] = {}
+
+    SHARDING_ENABLED: bool = False
+    SHARD_QUERY_CHECK: str = 'off'
+
+    REQUEST_TIMEOUT_SECONDS: float = 10.0
+    DATABASE_RETRY_AFTER_SECONDS: int = 5
+
+    # Well below the 30s driver default, a failover elects a new primary within ~12s
+    NOSQL_SERVER_SELECTION_TIMEOUT_MS: int = 3000
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_RESET_SECONDS: float = 5.0
+    CIRCUIT_BREAKER_HALF_OPEN_PROBES: int = 1
+
+    IDEMPOTENCY_STORE: str = 'mongo'
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_LEASE_SECONDS: int = 30
+    IDEMPOTENCY_WAIT_SECONDS: float = 5.0
+
+    # The classes share the 40 threads of the FastAPI threadpool
+    ADMISSION_CONCURRENCY: Dict[str, int] = {'default': 28, 'auth': 4, 'signin': 8}
+    ADMISSION_QUEUE: Dict[str, int] = {'default': 64, 'auth': 16, 'signin': 16}
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
+    RATE_LIMIT_BACKEND: str = 'memory'
+    RATE_LIMITS: Dict[str, List[float]] = {'ip': [30, 60], 'email': [10, 300]}
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    TRUSTED_PROXY_HOPS: int = 0
+
+    QUEUE_BROKER: str = 'sqlite'
+    QUEUE_SQLITE_PATH: str = 'tm_queue.sqlite3'
+    QUEUE_PREFETCH: int = 16
+    QUEUE_WORKER_CONCURRENCY: int = 4
+    QUEUE_VISIBILITY_TIMEOUT_SECONDS: float = 60.0
+    QUEUE_MAX_ATTEMPTS: int = 5
+    QUEUE_RETRY_DELAY_SECONDS: float = 5.0
+    QUEUE_POLL_SECONDS: float = 1.0
+    QUEUE_PUBLISH_RETRIES: int = 3
+    QUEUE_RETRY_AFTER_SECONDS: int = 5
+
+    OUTBOX_RELAY: bool = True
+    OUTBOX_RELAY_SECONDS: float = 1.0
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_LEASE_SECONDS: float = 30.0
+    OUTBOX_RETENTION_SECONDS: int = 86400
+
+    DEFERRED_JOB_TTL_SECONDS: int = 86400
+    DEFERRED_JOB_MAX_RESULT_BYTES: int = 4 * 1024 * 1024
+    BATCH_MAX_ENTRIES: int = 20
+
+    SMTP_HOST: str = ''
+    SMTP_PORT: int = 25
+    SMTP_SENDER: str = 'no-reply@ticket-management.local'
+    EVENTS_WEBHOOK_URL: str = ''
 
 
 config = ConfigReader()
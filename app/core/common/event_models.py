@@ -0,0 +1,58 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional, Mapping, Any
+
+from pydantic import BaseModel, Field, field_serializer
+
+
+class EventTypeOptions(Enum):
+    """
+    Enum for the different types of company events pushed to subscribers
+
+    Attributes:
+        BOARD_CREATED (str): A board was created
+        BOARD_UPDATED (str): A board was updated
+        TASK_CREATED (str): A task was created
+        TASK_UPDATED (str): A task was updated
+        ENTITY_DELETED (str): A board or task was deleted
+        COMPANY_CREATED (str): A company was created
+        RESYNC (str): Events were dropped, the subscriber must resync through fetch_changes_since
+    """
+    BOARD_CREATED: str = 'board_created'
+    BOARD_UPDATED: str = 'board_updated'
+    TASK_CREATED: str = 'task_created'
+    TASK_UPDATED: str = 'task_updated'
+    ENTITY_DELETED: str = 'entity_deleted'
+    COMPANY_CREATED: str = 'company_created'
+    RESYNC: str = 'resync'
+
+
+class CompanyEvent(BaseModel):
+    """
+    Model for a change event of a company pushed to its subscribers
+
+    Attributes:
+        timestamp (datetime): The timestamp of the event
+        event_type (EventTypeOptions): The type of the event
+        company_id (str): The company the changed entity belongs to
+        entity_id (Optional[str]): The id of the changed board or task
+        payload (Mapping[str, Any]): The changed entity
+    """
+    timestamp: datetime = Field(default_factory=datetime.now)
+    event_type: EventTypeOptions
+    company_id: str
+    entity_id: Optional[str] = None
+    payload: Mapping[str, Any] = Field(default_factory=dict)
+
+    @field_serializer('event_type')
+    def serialize_event_type(self, event_type: EventTypeOptions) -> str:
+        """
+        Serialize the event type of the event
+        """
+        return event_type.value
+
+    def to_server_sent_event(self) -> str:
+        """
+        Format the event as a server-sent event frame
+        """
+        return f'event: {self.event_type.value}\ndata: {self.model_dump_json()}\n\n'
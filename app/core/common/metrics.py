@@ -0,0 +1,38 @@
+import threading
+from typing import Any, Callable, Dict, Mapping
+
+
+class MetricsRegistry:
+    """
+    Registry of the components exposing their state as metrics, e.g. the circuit breakers
+    of the MongoDB pool or the admission gates.
+
+    Attributes:
+        _sources (Dict[str, Callable[[], Mapping[str, Any]]]): The snapshot function of each component.
+    """
+
+    def __init__(self):
+        self._sources: Dict[str, Callable[[], Mapping[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, source: Callable[[], Mapping[str, Any]]) -> None:
+        """
+        Register a component, replacing any component registered under the same name.
+
+        Parameters:
+        - name (str): The name of the component.
+        - source (Callable): Returns the current metrics of the component.
+        """
+        with self._lock:
+            self._sources[name] = source
+
+    def snapshot(self) -> Dict[str, Mapping[str, Any]]:
+        """
+        Get the current metrics of every registered component.
+        """
+        with self._lock:
+            sources = dict(self._sources)
+        return {name: source() for name, source in sources.items()}
+
+
+metrics_registry: MetricsRegistry = MetricsRegistry()
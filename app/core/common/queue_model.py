@@ -1,6 +1,8 @@
 from abc import ABC
-from typing import Dict, Generic, TypeVar, Optional, Union, Sequence
-from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Generic, TypeVar, Optional, Union, Sequence
+from uuid import uuid4
+from pydantic import BaseModel, Field
 
 from app.core.common.log_models import LogTypeOptions
 
@@ -60,3 +62,18 @@ class LoadDataProcessReport(BaseModel, Generic[OT]):
     log_type: LogTypeOptions
     controller_name: str
 
+
+class QueueMessageModel(BaseModel):
+    """
+    Represents a job published to a queue, run by a worker.
+
+    Attributes:
+    - job (str): The name of the job, see `app.services.tm_queue.jobs`.
+    - payload (Dict[str, Any]): The arguments of the job.
+    - message_id (str): The unique id of the message, jobs use it to skip redeliveries they already ran.
+    - published_at (datetime): When the message was published.
+    """
+    job: str
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    message_id: str = Field(default_factory=lambda: uuid4().hex)
+    published_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,11 +1,13 @@
 import binascii
 import os
+from datetime import datetime
 from typing import Mapping, Sequence, Optional
 
-import bcrypt
-from pydantic import EmailStr, BaseModel
+from pydantic import EmailStr, BaseModel, Field
 from pymongo import ASCENDING
 
+from app.core.api.collections import DBCollectionEnum
+
 
 class BaseAuthCredential(BaseModel):
     """
@@ -34,7 +36,7 @@ class BaseAuthCredential(BaseModel):
             indexes (Mapping[str, Optional[Sequence]]): The list of fields to be indexed.
         """
         indexes: Mapping[str, Optional[Sequence]] = {
-            'index': [('user_id', ASCENDING), ('auth_token', ASCENDING)],
+            'index': None,
             'unique_index': [[('email', ASCENDING)], ],
             'composite_index': None,
         }
@@ -52,19 +54,110 @@ class PublicAuthInfo(BaseAuthCredential):
     password: bytes
 
 
+class PasswordHashParams(BaseModel):
+    """
+    Represents the parameters a password was hashed with, stored with the hash.
+
+    Attributes:
+        scheme (str): The hashing scheme, a PBKDF2-SHA256 pre-hash fed to bcrypt.
+        pbkdf2_iterations (int): The iterations of the PBKDF2 pre-hash.
+        bcrypt_rounds (int): The bcrypt cost factor, log2 of its key expansion rounds.
+    """
+    scheme: str = 'pbkdf2_sha256+bcrypt'
+    pbkdf2_iterations: int
+    bcrypt_rounds: int
+
+
 class PrivateAuthInfo(PublicAuthInfo):
     """
     Represents the private information of a user including the user's information.
 
     Attributes:
-        salt (bytes): The salt used for hashing the password.
-        token (bytes): The token used for authentication.
-        auth_token (str): The access token used for authentication.
-        token_expires (int): The token expiration time.
-        is_signed_in (bool): The flag indicating if the user is signed in.
+        salt (bytes): The salt used for hashing the password, unique per credential.
+        token (bytes): The token used for authentication, unique per credential.
+        password_params (Optional[PasswordHashParams]): The parameters the password was hashed with,
+            None for credentials created before they were stored.
+        company_code (Optional[str]): The tenant the credentials may access, None for the shared database.
+            Assigned by operators, never by the user signing up.
+
+    The access tokens live in the `Sessions` collection, see `SessionModel`.
+    """
+    token: bytes = Field(default_factory=lambda: binascii.hexlify(os.urandom(20)))
+    salt: bytes = Field(default_factory=lambda: binascii.hexlify(os.urandom(16)))
+    password_params: Optional[PasswordHashParams] = None
+    company_code: Optional[str] = None
+
+
+class RevokedTokenModel(BaseModel):
+    """
+    Represents a signed access token revoked before its expiry.
+
+    Attributes:
+        _collection (str): The collection/table name.
+        id (str): The unique id of the token (its `jti` claim).
+        expires_at (datetime): The expiry of the token, the record is deleted by a TTL index after it.
+        date_revoked (datetime): When the token was revoked, workers sync the revocations incrementally on it.
+    """
+    _collection: str = DBCollectionEnum.REVOKED_TOKENS.value
+    id: str = Field(alias='_id')
+    expires_at: datetime
+    date_revoked: datetime
+
+    @property
+    def collection(self):
+        return self._collection
+
+    class Config:
+        """
+        Pydantic model configuration.
+
+        Attributes:
+            indexes (Mapping[str, Optional[Sequence]]): The list of fields to be indexed.
+        """
+        populate_by_name = True
+        indexes: Mapping[str, Optional[Sequence]] = {
+            'index': [('date_revoked', ASCENDING)],
+            'unique_index': None,
+            'composite_index': None,
+            'ttl_index': [('expires_at', 0)],
+        }
+
+
+class SessionModel(BaseModel):
+    """
+    Represents a signed-in session, a user holds one per device or client signed in.
+
+    Attributes:
+        _collection (str): The collection/table name.
+        user_id (str): The id of the credentials of the user.
+        email (EmailStr): The email address of the user.
+        auth_token (str): The access token of the session.
+        company_code (Optional[str]): The tenant of the credentials, copied at sign-in.
+        expires_at (datetime): The expiry of the access token, the session is deleted by a TTL index after it.
+        date_created (datetime): When the session was opened.
     """
-    token: bytes = binascii.hexlify(os.urandom(20))
-    salt: bytes = bcrypt.gensalt(14)
-    auth_token: str = 'NOT_SET'
-    token_expires: float = 0.00
-    is_signed_in: bool = False
+    _collection: str = DBCollectionEnum.SESSIONS.value
+    user_id: str
+    email: EmailStr
+    auth_token: str
+    company_code: Optional[str] = None
+    expires_at: datetime
+    date_created: datetime
+
+    @property
+    def collection(self):
+        return self._collection
+
+    class Config:
+        """
+        Pydantic model configuration.
+
+        Attributes:
+            indexes (Mapping[str, Optional[Sequence]]): The list of fields to be indexed.
+        """
+        indexes: Mapping[str, Optional[Sequence]] = {
+            'index': [('user_id', ASCENDING)],
+            'unique_index': [[('auth_token', ASCENDING)], ],
+            'composite_index': None,
+            'ttl_index': [('expires_at', 0)],
+        }
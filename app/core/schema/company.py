@@ -0,0 +1,81 @@
+from datetime import datetime
+from typing import Mapping, Optional, Sequence
+
+from pydantic import BaseModel
+from pymongo import ASCENDING
+
+from app.core.api.collections import DBCollectionEnum
+
+
+class CompanyVersionModel(BaseModel):
+    """
+    Represents the aggregate change marker of a company.
+
+    Every write to the boards or tasks of a company increments `version`, so
+    clients and caches can detect changes with a single indexed point read.
+
+    Attributes:
+        _collection (str): The collection/table name.
+        company_id (str): The id of the company.
+        version (int): The monotonically increasing version of the company.
+    """
+    _collection: str = DBCollectionEnum.COMPANY_VERSIONS.value
+    company_id: str
+    version: int = 0
+
+    @property
+    def collection(self):
+        return self._collection
+
+    class Config:
+        """
+        Pydantic model configuration.
+
+        Attributes:
+            indexes (Mapping[str, Optional[Sequence]]): The list of fields to be indexed.
+        """
+        indexes: Mapping[str, Optional[Sequence]] = {
+            'index': None,
+            'unique_index': [[('company_id', ASCENDING)], ],
+            'composite_index': None,
+        }
+
+
+class TombstoneModel(BaseModel):
+    """
+    Represents the deletion of a board or task, kept so delta sync can report deletes.
+
+    A delete controller writes it in the outbox transaction of the delete, stamped with the
+    company version it bumped, like any other write.
+
+    Attributes:
+        _collection (str): The collection/table name.
+        company_id (str): The id of the company owning the deleted entity.
+        entity (str): The collection of the deleted entity, e.g. 'Boards' or 'Tasks'.
+        entity_id (str): The id of the deleted entity.
+        change_seq (int): The company version of the deletion, delta sync pages on it.
+        date_deleted (datetime): The time of the deletion.
+    """
+    _collection: str = DBCollectionEnum.TOMBSTONES.value
+    company_id: str
+    entity: str
+    entity_id: str
+    change_seq: int = 0
+    date_deleted: datetime
+
+    @property
+    def collection(self):
+        return self._collection
+
+    class Config:
+        """
+        Pydantic model configuration.
+
+        Attributes:
+            indexes (Mapping[str, Optional[Sequence]]): The list of fields to be indexed.
+        """
+        indexes: Mapping[str, Optional[Sequence]] = {
+            'index': [('company_id', ASCENDING), ('change_seq', ASCENDING), ('_id', ASCENDING)],
+            'unique_index': None,
+            'composite_index': None,
+        }
@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import Any, Mapping, Optional, Sequence
+
+from pydantic import BaseModel, Field
+
+from app.core.api.collections import DBCollectionEnum
+
+
+class IdempotencyKeyModel(BaseModel):
+    """
+    Represents a request made with an `Idempotency-Key`, and its response once completed.
+
+    Attributes:
+        _collection (str): The collection/table name.
+        id (str): The idempotency key, scoped to the controller and the caller.
+        fingerprint (str): The hash of the request payload, a key can't be reused for another payload.
+        state (str): 'in_flight' while the request is processed, 'completed' once its response is stored.
+        response (Optional[Mapping[str, Any]]): The stored response of the completed request.
+        lease_expires (datetime): When an in-flight request is considered lost and may be taken over.
+        expires_at (datetime): When the key is forgotten, enforced by a TTL index.
+    """
+    _collection: str = DBCollectionEnum.IDEMPOTENCY_KEYS.value
+    id: str = Field(alias='_id')
+    fingerprint: str
+    state: str
+    response: Optional[Mapping[str, Any]] = None
+    lease_expires: datetime
+    expires_at: datetime
+
+    @property
+    def collection(self):
+        return self._collection
+
+    class Config:
+        """
+        Pydantic model configuration.
+
+        Attributes:
+            indexes (Mapping[str, Optional[Sequence]]): The list of fields to be indexed.
+        """
+        populate_by_name = True
+        indexes: Mapping[str, Optional[Sequence]] = {
+            'index': None,
+            'unique_index': None,
+            'composite_index': None,
+            'ttl_index': [('expires_at', 0)],
+        }
@@ -0,0 +1,67 @@
+from datetime import datetime
+from typing import Any, Mapping, Optional, Sequence
+
+from pydantic import BaseModel, Field
+
+from app.core.api.collections import DBCollectionEnum
+from app.core.common.queue_model import APIToLoadRequestModel
+
+QUEUED: str = 'queued'
+RUNNING: str = 'running'
+DONE: str = 'done'
+FAILED: str = 'failed'
+
+
+class JobModel(BaseModel):
+    """
+    Represents a deferred request, processed by a queue worker, and its outcome.
+
+    Attributes:
+        _collection (str): The collection/table name.
+        id (str): The id of the job, returned to the client with `202`.
+        request (APIToLoadRequestModel): The controller and the payload of the request.
+        company_code (Optional[str]): The tenant the request is routed to.
+        caller (str): The user that enqueued the job, the only one allowed to read it.
+        state (str): 'queued', 'running', 'done' or 'failed'.
+        attempts (int): The times a worker started the job.
+        status_code (Optional[int]): The HTTP status the request ended with.
+        result (Optional[Any]): The response of the request, once done.
+        error (Optional[str]): The error of the request, once failed.
+        date_created (datetime): When the job was enqueued.
+        date_started (Optional[datetime]): When a worker last started the job.
+        date_finished (Optional[datetime]): When the job was done or failed.
+        expires_at (datetime): When the job is forgotten, enforced by a TTL index.
+    """
+    _collection: str = DBCollectionEnum.JOBS.value
+    id: str = Field(alias='_id')
+    request: APIToLoadRequestModel
+    company_code: Optional[str] = None
+    caller: str
+    state: str = QUEUED
+    attempts: int = 0
+    status_code: Optional[int] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    date_created: datetime
+    date_started: Optional[datetime] = None
+    date_finished: Optional[datetime] = None
+    expires_at: datetime
+
+    @property
+    def collection(self):
+        return self._collection
+
+    class Config:
+        """
+        Pydantic model configuration.
+
+        Attributes:
+            indexes (Mapping[str, Optional[Sequence]]): The list of fields to be indexed.
+        """
+        populate_by_name = True
+        indexes: Mapping[str, Optional[Sequence]] = {
+            'index': None,
+            'unique_index': None,
+            'composite_index': None,
+            'ttl_index': [('expires_at', 0)],
+        }
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.core.api.collections import DBCollectionEnum
+
+
+class MigrationModel(BaseModel):
+    """
+    Represents a data migration applied to the shared database, it is not run again.
+
+    Attributes:
+        _collection (str): The collection/table name.
+        id (str): The name of the migration.
+        updated (int): The documents the migration updated.
+        date_applied (datetime): When the migration was applied.
+    """
+    _collection: str = DBCollectionEnum.MIGRATIONS.value
+    id: str = Field(alias='_id')
+    updated: int = 0
+    date_applied: datetime
+
+    @property
+    def collection(self):
+        return self._collection
@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import Any, Mapping, Optional, Sequence
+
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING
+
+from app.core.api.collections import DBCollectionEnum
+
+
+class OutboxEventModel(BaseModel):
+    """
+    Represents a change event written alongside the change itself, until the relay published it.
+
+    Attributes:
+        _collection (str): The collection/table name.
+        event (Mapping[str, Any]): The `CompanyEvent`, as published to the queue.
+        state (str): 'pending' until the relay published the event, 'sent' afterwards.
+        claim (Optional[str]): The batch of the relay publishing the event.
+        lease_expires (datetime): When a claimed event is considered lost and may be claimed again.
+        date_created (datetime): When the event was written.
+        date_sent (Optional[datetime]): When the event was published.
+        expires_at (Optional[datetime]): When a sent event is deleted, enforced by a TTL index.
+    """
+    _collection: str = DBCollectionEnum.OUTBOX.value
+    event: Mapping[str, Any] = Field(default_factory=dict)
+    state: str
+    claim: Optional[str] = None
+    lease_expires: datetime
+    date_created: datetime
+    date_sent: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+    @property
+    def collection(self):
+        return self._collection
+
+    class Config:
+        """
+        Pydantic model configuration.
+
+        Attributes:
+            indexes (Mapping[str, Optional[Sequence]]): The list of fields to be indexed.
+        """
+        indexes: Mapping[str, Optional[Sequence]] = {
+            'index': [('state', ASCENDING), ('lease_expires', ASCENDING)],
+            'unique_index': None,
+            'composite_index': None,
+            'ttl_index': [('expires_at', 0)],
+        }
@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Mapping, Optional, Sequence
+
+from pydantic import BaseModel, Field
+
+from app.core.api.collections import DBCollectionEnum
+
+
+class RateLimitCounterModel(BaseModel):
+    """
+    Represents the requests counted against a rate limit key during one window.
+
+    Attributes:
+        _collection (str): The collection/table name.
+        id (str): The rate limit key and the start of its window.
+        count (int): The requests counted during the window.
+        expires_at (datetime): When the window is over, enforced by a TTL index.
+    """
+    _collection: str = DBCollectionEnum.RATE_LIMITS.value
+    id: str = Field(alias='_id')
+    count: int
+    expires_at: datetime
+
+    @property
+    def collection(self):
+        return self._collection
+
+    class Config:
+        """
+        Pydantic model configuration.
+
+        Attributes:
+            indexes (Mapping[str, Optional[Sequence]]): The list of fields to be indexed.
+        """
+        populate_by_name = True
+        indexes: Mapping[str, Optional[Sequence]] = {
+            'index': None,
+            'unique_index': None,
+            'composite_index': None,
+            'ttl_index': [('expires_at', 0)],
+        }
@@ -19,7 +19,8 @@ app.add_middleware(
     allow_origins=origins,  # Allows specified origins to make requests
     allow_credentials=True,  # Allows cookies to be included in cross-origin HTTP requests
     allow_methods=['GET', 'POST', 'OPTIONS'],  # Specifies the allowed HTTP methods
-    allow_headers=['Authorization', 'Content-Type', 'x-api-key'],  # Specifies the allowed headers
+    allow_headers=['Authorization', 'Content-Type', 'x-api-key', 'If-None-Match', 'X-Company-Code', 'X-Causal-Token', 'Idempotency-Key'],  # Specifies the allowed headers
+    expose_headers=['ETag', 'X-Causal-Token', 'Idempotent-Replayed'],  # Specifies the response headers readable by the frontend
 )
 
 app.include_router(v1.private_router, prefix=f'/{v1.VERSION}')
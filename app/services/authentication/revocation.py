@@ -0,0 +1,275 @@
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from pymongo.errors import PyMongoError
+
+from app.core.api.collections import DBCollectionEnum
+from app.core.api.exceptions import DatabaseUnavailableException
+from app.core.common.config import config
+from app.core.common.metrics import metrics_registry
+from app.core.schema.auth import RevokedTokenModel
+from app.services.authentication.tokens import TokenClaims
+from app.services.tm_db.service import TMMongoDBServicePool
+
+logger = logging.getLogger('uvicorn')
+
+# Revocations written by another worker with a slightly late clock are still picked up
+_SYNC_OVERLAP = timedelta(seconds=30)
+_EPOCH = datetime(1970, 1, 1)
+_MASK_64 = (1 << 64) - 1
+
+
+class BloomFilter:
+    """
+    Fixed-size bloom filter of token ids.
+
+    The bit positions are derived from the (cached) hash of the id string by double hashing,
+    so a lookup is `hashes` bit tests on a pre-allocated byte array. The hash of a string is
+    salted per process, a filter is never shared between processes.
+
+    Attributes:
+        capacity (int): The number of ids the filter is sized for.
+        count (int): The number of ids added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.count = 0
+        self._size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def add(self, key: str) -> None:
+        digest: int = hash(key) & _MASK_64
+        position, step = digest & 0xFFFFFFFF, (digest >> 32) | 1
+
+        for _ in range(self._hashes):
+            bit = position % self._size
+            self._bits[bit >> 3] |= 1 << (bit & 7)
+            position += step
+
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        digest: int = hash(key) & _MASK_64
+        position, step = digest & 0xFFFFFFFF, (digest >> 32) | 1
+        remaining: int = self._hashes
+
+        while remaining:
+            bit = position % self._size
+            if not self._bits[bit >> 3] & (1 << (bit & 7)):
+                return False
+            position += step
+            remaining -= 1
+
+        return True
+
+    def fill_ratio(self) -> float:
+        """
+        Get the expected share of bits set, the false-positive rate is about its power `hashes`.
+        """
+        return 1 - math.exp(-self._hashes * self.count / self._size)
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            'capacity': self.capacity,
+            'count': self.count,
+            'bits': self._size,
+            'hashes': self._hashes,
+            'fill_ratio': round(self.fill_ratio(), 6),
+        }
+
+
+class RevocationList:
+    """
+    The signed tokens revoked before their expiry, mirrored in memory on every worker.
+
+    Revocations are stored in the `RevokedTokens` collection, deleted by a TTL index once
+    the token expired anyway. A background poller pulls the revocations made since its
+    last pass every `REVOCATION_SYNC_SECONDS`, so checking a token never leaves the process:
+    a bloom filter answers for the vast majority of tokens, which were never revoked, and
+    the exact set of unexpired revocations settles the filter's positives. A token revoked
+    on another worker is accepted here until the next pass.
+
+    Attributes:
+        _bloom (BloomFilter): The filter of every revoked token id, rebuilt as they expire.
+        _revoked (Dict[str, float]): The expiry of each unexpired revoked token, by token id.
+        _sync_cursor (Optional[datetime]): The revocation date the next pass starts from.
+        _synced_at (Optional[float]): When the last successful pass started, as a timestamp.
+    """
+
+    def __init__(self):
+        self._bloom = self._build_bloom(config.REVOCATION_BLOOM_CAPACITY)
+        self._revoked: Dict[str, float] = {}
+        self._sync_cursor: Optional[datetime] = None
+        self._synced_at: Optional[float] = None
+        self._checks = 0
+        self._bloom_positives = 0
+        self._false_positives = 0
+        self._sync_errors = 0
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._poller_lock = threading.Lock()
+        self._poller: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _build_bloom(capacity: int) -> BloomFilter:
+        return BloomFilter(capacity, config.REVOCATION_BLOOM_ERROR_RATE)
+
+    def _rebuild_bloom(self) -> None:
+        """
+        Build a new filter from the exact set, dropping the expired ids. Called with the lock held.
+        """
+        capacity: int = config.REVOCATION_BLOOM_CAPACITY
+        while capacity < 2 * len(self._revoked):
+            capacity *= 2
+
+        bloom: BloomFilter = self._build_bloom(capacity)
+        for token_id in self._revoked:
+            bloom.add(token_id)
+        self._bloom = bloom
+
+    def _add(self, token_id: str, expires: float) -> None:
+        """
+        Add a revocation to the exact set and the filter. Called with the lock held.
+        """
+        if token_id in self._revoked:
+            return
+
+        self._revoked[token_id] = expires
+        if self._bloom.count >= self._bloom.capacity:
+            self._rebuild_bloom()
+        else:
+            self._bloom.add(token_id)
+
+    def revoke(self, pool: TMMongoDBServicePool, claims: TokenClaims) -> None:
+        """
+        Revoke a token on every worker, at once on this one.
+
+        Parameters:
+        - pool (TMMongoDBServicePool): The MongoDB service pool.
+        - claims (TokenClaims): The claims of the token to revoke.
+        """
+        record = RevokedTokenModel(
+            _id=claims.token_id,
+            expires_at=_EPOCH + timedelta(seconds=claims.expires),
+            date_revoked=datetime.utcnow()
+        )
+        pool.get_mongodb_service(DBCollectionEnum.REVOKED_TOKENS.value).update_one(
+            {'_id': record.id}, {'$setOnInsert': record.model_dump(by_alias=True)}, upsert=True
+        )
+
+        with self._lock:
+            self._add(claims.token_id, claims.expires)
+
+    def is_revoked(self, token_id: str) -> bool:
+        """
+        Check a token was revoked, in constant time and without touching the database.
+
+        Parameters:
+        - token_id (str): The id of the token to check.
+
+        Returns:
+        - bool: Whether the token was revoked.
+        """
+        self._checks += 1
+
+        if token_id not in self._bloom:
+            return False
+
+        self._bloom_positives += 1
+        if token_id in self._revoked:
+            return True
+
+        self._false_positives += 1
+        return False
+
+    def sync(self, pool: TMMongoDBServicePool) -> None:
+        """
+        Pull the revocations made since the last pass and forget the expired ones.
+
+        Parameters:
+        - pool (TMMongoDBServicePool): The MongoDB service pool.
+        """
+        with self._sync_lock:
+            query = {'date_revoked': {'$gte': self._sync_cursor - _SYNC_OVERLAP}} if self._sync_cursor else {}
+            started_at: datetime = datetime.utcnow()
+
+            records = list(
+                pool.get_mongodb_service(DBCollectionEnum.REVOKED_TOKENS.value).find(query, {'expires_at': 1})
+            )
+
+            now: float = time.time()
+            with self._lock:
+                for record in records:
+                    self._add(record['_id'], (record['expires_at'] - _EPOCH).total_seconds())
+
+                expired = [token_id for token_id, expires in self._revoked.items() if expires <= now]
+                for token_id in expired:
+                    del self._revoked[token_id]
+
+                # Expired ids only cost false positives, rebuild once they are a sizeable share
+                if expired and len(expired) * 10 >= self._bloom.count:
+                    self._rebuild_bloom()
+
+            self._sync_cursor = started_at
+            self._synced_at = now
+
+    def _poll(self, pool: TMMongoDBServicePool) -> None:
+        """
+        Sync the list every `REVOCATION_SYNC_SECONDS`, carrying on after errors.
+        """
+        while True:
+            time.sleep(config.REVOCATION_SYNC_SECONDS)
+
+            try:
+                self.sync(pool)
+            except (PyMongoError, DatabaseUnavailableException) as e:
+                self._sync_errors += 1
+                logger.warning(f'RevocationList sync failed, retrying: {str(e)}')
+
+    def start_poller(self, pool: TMMongoDBServicePool) -> None:
+        """
+        Load the revocations, then keep them in sync from a daemon thread, once.
+
+        Parameters:
+        - pool (TMMongoDBServicePool): The pool to get the collection from.
+        """
+        if self._poller:
+            return
+
+        with self._poller_lock:
+            if self._poller:
+                return
+
+            try:
+                self.sync(pool)
+            except (PyMongoError, DatabaseUnavailableException) as e:
+                self._sync_errors += 1
+                logger.warning(f'RevocationList initial sync failed, the poller will retry: {str(e)}')
+
+            self._poller = threading.Thread(target=self._poll, args=(pool,), name='tm-revocation-poller', daemon=True)
+            self._poller.start()
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Get the size, hit counters and freshness of the list.
+        """
+        return {
+            'revoked': len(self._revoked),
+            'bloom': self._bloom.snapshot(),
+            'checks': self._checks,
+            'bloom_positives': self._bloom_positives,
+            'false_positives': self._false_positives,
+            'false_positive_rate': round(self._false_positives / self._checks, 6) if self._checks else 0.0,
+            'refresh_lag_seconds': round(time.time() - self._synced_at, 3) if self._synced_at else None,
+            'sync_errors': self._sync_errors,
+        }
+
+
+revocation_list: RevocationList = RevocationList()
+metrics_registry.register('revocation', revocation_list.snapshot)
@@ -1,47 +1,92 @@
 import http
-from datetime import datetime
-from fastapi import HTTPException, Security
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException, Request, Security
 from fastapi.security import APIKeyHeader
+from pymongo.errors import PyMongoError
 
+from app.core.api.base_controller import BaseAPIController
+from app.core.api.exceptions import DatabaseUnavailableException
+from app.services.authentication.revocation import revocation_list
+from app.services.authentication.tokens import decode_signed_token, is_signed_token
+from app.services.credentials.service import CredentialRepository
+from app.services.tm_db.circuit_breaker import circuit_breaker_scope
 from app.services.tm_db.service import TMMongoDBServicePool
 
 
 header_auth_token = APIKeyHeader(name='X-API-Key', auto_error=False)
 
 
+class Principal(NamedTuple):
+    """
+    The identity behind an authenticated request, stored on `request.state.principal`.
+
+    Attributes:
+        user_id (str): The id of the credentials.
+        company_code (Optional[str]): The tenant of the credentials, None for the shared database.
+    """
+    user_id: str
+    company_code: Optional[str] = None
+
+
 class AuthenticationService:
     _mongo_db_service_provider: TMMongoDBServicePool = None
 
     def __init__(self, mongo_db_service: TMMongoDBServicePool):
         self._mongo_db_service_provider = mongo_db_service
 
-    def _token_is_valid(self, auth_token: str) -> bool:
+    def _get_principal(self, auth_token: str) -> Optional[Principal]:
         """
-        Validate the authentication token.
+        Validate the authentication token and resolve who it was issued to.
 
         Parameters:
         - auth_token (str): The authentication token.
 
         Returns:
-        - bool: A boolean indicator of whether the token is valid.
+        - Optional[Principal]: The identity of the token, None if the token is invalid.
         """
-        mongo_db_service = self._mongo_db_service_provider.get_mongodb_service('AuthCredentials')
-        user = mongo_db_service.find_one({'auth_token': auth_token})
+        if not auth_token:
+            return None
 
-        # Check if the token has expired
-        return bool(user and user.get('token_expires') > datetime.utcnow().timestamp())
+        # Signed tokens are checked in-process, opaque ones (e.g. issued before switching to
+        # AUTH_TOKEN_MODE=signed) still need the database until they expire
+        if is_signed_token(auth_token):
+            claims = decode_signed_token(auth_token)
+            if not claims:
+                return None
 
-    def authenticate(self, auth_token: str = Security(header_auth_token)) -> bool:
+            # The poller only starts with the workers in signed mode, signed tokens issued
+            # before switching back to opaque ones still have to see the revocations
+            revocation_list.start_poller(self._mongo_db_service_provider)
+            if revocation_list.is_revoked(claims.token_id):
+                return None
+            return Principal(claims.subject, claims.company_code)
+
+        session = CredentialRepository(self._mongo_db_service_provider).get_active_session(auth_token)
+        return Principal(session.get('user_id'), session.get('company_code')) if session else None
+
+    def authenticate(self, request: Request, auth_token: str = Security(header_auth_token)) -> bool:
         """
-        Authenticate the user using the provided authentication token.
+        Authenticate the user using the provided authentication token, the identity behind it
+        is stored on `request.state.principal`.
 
         Parameters:
+        - request (Request): The HTTP request.
         - auth_token (str): The authentication token.
 
         Returns:
         - bool: A boolean indicator of whether the user is authenticated.
         """
-        if not self._token_is_valid(auth_token):
+        # The session lookup goes through the circuit breaker like any request, so an outage seen
+        # by authentication opens it too, and is answered with 503 rather than an unhandled error
+        try:
+            with circuit_breaker_scope():
+                principal: Optional[Principal] = self._get_principal(auth_token)
+        except (DatabaseUnavailableException, PyMongoError) as e:
+            raise BaseAPIController.on_error(e)
+
+        if principal is None:
             raise HTTPException(status_code=http.HTTPStatus.FORBIDDEN, detail='Invalid API key or the key has expired.')
 
+        request.state.principal = principal
         return True
@@ -0,0 +1,139 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+from typing import NamedTuple, Optional
+
+import bcrypt
+
+from app.core.common.config import config
+
+_ALGORITHMS = {
+    'HS256': hashlib.sha256,
+    'HS384': hashlib.sha384,
+    'HS512': hashlib.sha512,
+}
+
+
+class TokenClaims(NamedTuple):
+    """
+    The claims of a signed access token.
+
+    Attributes:
+        subject (str): The id of the credentials the token was issued to.
+        token_id (str): The unique id of the token, what a revocation refers to.
+        expires (float): The expiry of the token, as a timestamp.
+        company_code (Optional[str]): The tenant of the credentials, None for the shared database.
+    """
+    subject: str
+    token_id: str
+    expires: float
+    company_code: Optional[str] = None
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+def _sign(signing_input: bytes) -> bytes:
+    return hmac.new(config.TM_SECRET.encode('utf-8'), signing_input, _ALGORITHMS[config.ALGORITHM]).digest()
+
+
+def is_signed_token(token: str) -> bool:
+    """
+    Check a token has the shape of a signed token, opaque tokens are plain hex digests.
+    """
+    return token.count('.') == 2
+
+
+def get_token_expiry() -> float:
+    """
+    Get the expiry of a token issued now, `AUTH_TOKEN_EXPIRY` seconds ahead.
+
+    `exp` is a POSIX timestamp checked against `time.time()`, tokens must be issued on the
+    same clock: `datetime.utcnow().timestamp()` reads the naive UTC time as local time and
+    skews the expiry by the UTC offset of the host.
+
+    Returns:
+    - float: The expiry, as a POSIX timestamp.
+    """
+    return time.time() + config.AUTH_TOKEN_EXPIRY
+
+
+def encode_signed_token(subject: str, expires: float, company_code: Optional[str] = None) -> str:
+    """
+    Issue a JWT signed with `TM_SECRET` using the HMAC `ALGORITHM`.
+
+    Parameters:
+    - subject (str): The id of the credentials the token is issued to.
+    - expires (float): The expiry of the token, as a timestamp.
+    - company_code (Optional[str]): The tenant of the credentials, carried in the `tnt` claim.
+
+    Returns:
+    - str: The signed token.
+    """
+    header: bytes = json.dumps({'alg': config.ALGORITHM, 'typ': 'JWT'}, separators=(',', ':')).encode('utf-8')
+    claims = {'sub': subject, 'jti': _b64encode(os.urandom(16)), 'iat': int(time.time()), 'exp': expires}
+    if company_code:
+        claims['tnt'] = company_code
+    payload: bytes = json.dumps(claims, separators=(',', ':')).encode('utf-8')
+
+    signing_input: bytes = f'{_b64encode(header)}.{_b64encode(payload)}'.encode('ascii')
+    return f'{signing_input.decode("ascii")}.{_b64encode(_sign(signing_input))}'
+
+
+def decode_signed_token(token: str) -> Optional[TokenClaims]:
+    """
+    Verify a signed token in-process, without a database lookup.
+
+    Parameters:
+    - token (str): The signed token.
+
+    Returns:
+    - Optional[TokenClaims]: The claims of the token, None if it is malformed, forged or expired.
+    """
+    try:
+        header, payload, signature = token.split('.')
+        signing_input: bytes = f'{header}.{payload}'.encode('ascii')
+
+        if not hmac.compare_digest(_b64decode(signature), _sign(signing_input)):
+            return None
+        if json.loads(_b64decode(header)).get('alg') != config.ALGORITHM:
+            return None
+
+        claims = json.loads(_b64decode(payload))
+        token_claims = TokenClaims(
+            str(claims['sub']), str(claims['jti']), float(claims['exp']), claims.get('tnt') or None
+        )
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+    if token_claims.expires <= time.time():
+        return None
+
+    return token_claims
+
+
+def issue_auth_token(subject: str, seed: bytes, expires: float, company_code: Optional[str] = None) -> str:
+    """
+    Issue an auth token in the mode selected by `AUTH_TOKEN_MODE`.
+
+    Parameters:
+    - subject (str): The id of the credentials the token is issued to.
+    - seed (bytes): The seed of an opaque token.
+    - expires (float): The expiry of the token, as a timestamp.
+    - company_code (Optional[str]): The tenant of the credentials, opaque tokens find it on their session.
+
+    Returns:
+    - str: A signed token in 'signed' mode, an opaque one otherwise.
+    """
+    if config.AUTH_TOKEN_MODE == 'signed':
+        return encode_signed_token(subject, expires, company_code)
+
+    return hashlib.sha256(seed + bcrypt.gensalt()).hexdigest()
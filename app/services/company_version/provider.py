@@ -0,0 +1,29 @@
+from app.services.company_version.service import CompanyVersionService
+from app.services.tm_db.provider import TMMongoDBServiceProvider
+
+
+class CompanyVersionServiceProvider(TMMongoDBServiceProvider):
+    """
+    A class that provides the per-company version counters to controllers.
+    """
+    _company_version_service: CompanyVersionService = None
+
+    def get_company_version_service(self) -> CompanyVersionService:
+        """
+        Lazy-loads the CompanyVersionService on top of the MongoDB service pool.
+
+        Returns:
+        - CompanyVersionService: The CompanyVersionService instance.
+        """
+        if not self._company_version_service:
+            self._company_version_service = CompanyVersionService(self.get_mongodb_service_pool())
+        return self._company_version_service
+
+    def set_company_version_service(self, service: CompanyVersionService):
+        """
+        Set the CompanyVersionService instance.
+
+        Parameters:
+        - service (CompanyVersionService): The CompanyVersionService instance to set.
+        """
+        self._company_version_service = service
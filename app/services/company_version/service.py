@@ -0,0 +1,103 @@
+from datetime import datetime
+from typing import Dict, Sequence, Optional
+
+from bson import ObjectId
+
+from pymongo import ReturnDocument
+from pymongo.collection import Collection
+
+from app.core.api.collections import DBCollectionEnum
+from app.services.tm_db.service import TMMongoDBServicePool
+
+
+class CompanyVersionService:
+    """
+    Service class to maintain the per-company version counters.
+    """
+    _mongo_db_service_provider: TMMongoDBServicePool = None
+
+    def __init__(self, mongo_db_service: TMMongoDBServicePool):
+        self._mongo_db_service_provider = mongo_db_service
+
+    def _get_collection(self) -> Collection:
+        return self._mongo_db_service_provider.get_mongodb_service(DBCollectionEnum.COMPANY_VERSIONS.value)
+
+    def get_board_company_id(self, board_id: str) -> Optional[str]:
+        """
+        Resolve the company owning a board, tasks only carry their `board_id`.
+
+        Parameters:
+        - board_id (str): The id of the board.
+
+        Returns:
+        - Optional[str]: The id of the company, None if the board doesn't exist.
+        """
+        board_filter = {'_id': ObjectId(board_id) if ObjectId.is_valid(board_id) else board_id}
+        board = self._mongo_db_service_provider.get_mongodb_service(DBCollectionEnum.BOARDS.value).find_one(
+            board_filter,
+            {'company_id': 1}
+        )
+        return board.get('company_id') if board else None
+
+    def bump(self, company_id: str) -> int:
+        """
+        Atomically increment the version of a company.
+
+        Writers stamp the returned version on the document they write as its `change_seq`,
+        delta sync pages on it. Inside the write transaction the counter document serializes
+        the writers of a company, so sequence order is commit order.
+
+        Parameters:
+        - company_id (str): The id of the company whose boards or tasks changed.
+
+        Returns:
+        - int: The new version of the company, 0 without a company id.
+        """
+        if not company_id:
+            return 0
+
+        document = self._get_collection().find_one_and_update(
+            {'company_id': company_id},
+            {
+                '$inc': {'version': 1},
+                '$set': {'date_updated': datetime.now()}
+            },
+            projection={'_id': 0, 'version': 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return document.get('version', 0)
+
+    def get_version(self, company_id: str) -> int:
+        """
+        Get the version of a company.
+
+        Parameters:
+        - company_id (str): The id of the company.
+
+        Returns:
+        - int: The current version, 0 if the company was never written to.
+        """
+        document = self._get_collection().find_one({'company_id': company_id}, {'_id': 0, 'version': 1})
+        return document.get('version', 0) if document else 0
+
+    def get_versions(self, company_ids: Sequence[str]) -> Dict[str, int]:
+        """
+        Get the versions of several companies in one round trip.
+
+        Parameters:
+        - company_ids (Sequence[str]): The ids of the companies.
+
+        Returns:
+        - Dict[str, int]: The current version per company id.
+        """
+        versions: Dict[str, int] = {company_id: 0 for company_id in company_ids}
+        q_response = self._get_collection().find(
+            {'company_id': {'$in': list(company_ids)}},
+            {'_id': 0, 'company_id': 1, 'version': 1}
+        )
+
+        for document in q_response:
+            versions[document.get('company_id')] = document.get('version', 0)
+
+        return versions
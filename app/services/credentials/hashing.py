@@ -0,0 +1,98 @@
+import binascii
+import hashlib
+import os
+from typing import Any, Mapping
+
+import bcrypt
+
+from app.core.common.config import config
+from app.core.schema.auth import PasswordHashParams
+
+# What every credential created before the parameters were stored was hashed with,
+# the bcrypt cost of those is read from the hash itself
+LEGACY_PBKDF2_ITERATIONS: int = 14
+
+
+def get_current_params() -> PasswordHashParams:
+    """
+    Get the parameters new password hashes are made with, `PASSWORD_PBKDF2_ITERATIONS` and
+    `PASSWORD_BCRYPT_ROUNDS`.
+    """
+    return PasswordHashParams(
+        pbkdf2_iterations=config.PASSWORD_PBKDF2_ITERATIONS,
+        bcrypt_rounds=config.PASSWORD_BCRYPT_ROUNDS
+    )
+
+
+def get_stored_params(credentials: Mapping[str, Any]) -> PasswordHashParams:
+    """
+    Get the parameters the password of credentials was hashed with.
+
+    Parameters:
+    - credentials (Mapping[str, Any]): The credentials, with their password hash and parameters if stored.
+
+    Returns:
+    - PasswordHashParams: The stored parameters, or the legacy ones for credentials without them.
+    """
+    if credentials.get('password_params'):
+        return PasswordHashParams(**credentials['password_params'])
+
+    # A bcrypt hash reads '$2b$<rounds>$...'
+    password_hash: bytes = credentials.get('password') or b''
+    try:
+        bcrypt_rounds = int(password_hash.split(b'$')[2])
+    except (IndexError, ValueError):
+        bcrypt_rounds = 0
+
+    return PasswordHashParams(pbkdf2_iterations=LEGACY_PBKDF2_ITERATIONS, bcrypt_rounds=bcrypt_rounds)
+
+
+def new_salt() -> bytes:
+    return binascii.hexlify(os.urandom(16))
+
+
+def hash_password(password: bytes, salt: bytes, params: PasswordHashParams) -> bytes:
+    """
+    Hash a password, the cost of a call is set by the parameters.
+
+    Parameters:
+    - password (bytes): The plain text password.
+    - salt (bytes): The salt of the PBKDF2 pre-hash, bcrypt draws its own.
+    - params (PasswordHashParams): The parameters to hash with.
+
+    Returns:
+    - bytes: The bcrypt hash, carrying its cost and salt.
+    """
+    return bcrypt.hashpw(
+        hashlib.pbkdf2_hmac('sha256', password, salt, params.pbkdf2_iterations),
+        bcrypt.gensalt(params.bcrypt_rounds)
+    )
+
+
+def verify_password(password: bytes, credentials: Mapping[str, Any]) -> bool:
+    """
+    Check a password against credentials, with the parameters they were hashed with.
+
+    Parameters:
+    - password (bytes): The plain text password.
+    - credentials (Mapping[str, Any]): The credentials, with their password hash, salt and parameters.
+
+    Returns:
+    - bool: Whether the password matches, False for credentials without a usable hash.
+    """
+    params: PasswordHashParams = get_stored_params(credentials)
+
+    try:
+        return bcrypt.checkpw(
+            hashlib.pbkdf2_hmac('sha256', password, credentials.get('salt') or b'', params.pbkdf2_iterations),
+            credentials.get('password') or b''
+        )
+    except ValueError:
+        return False
+
+
+def needs_rehash(credentials: Mapping[str, Any]) -> bool:
+    """
+    Check the password of credentials was hashed with other parameters than the current ones.
+    """
+    return get_stored_params(credentials) != get_current_params()
@@ -0,0 +1,29 @@
+from app.services.credentials.service import CredentialRepository
+from app.services.tm_db.provider import TMMongoDBServiceProvider
+
+
+class CredentialRepositoryProvider(TMMongoDBServiceProvider):
+    """
+    A class that provides the credential repository to controllers.
+    """
+    _credential_repository: CredentialRepository = None
+
+    def get_credential_repository(self) -> CredentialRepository:
+        """
+        Lazy-loads the CredentialRepository on top of the MongoDB service pool.
+
+        Returns:
+        - CredentialRepository: The CredentialRepository instance.
+        """
+        if not self._credential_repository:
+            self._credential_repository = CredentialRepository(self.get_mongodb_service_pool())
+        return self._credential_repository
+
+    def set_credential_repository(self, repository: CredentialRepository):
+        """
+        Set the CredentialRepository instance.
+
+        Parameters:
+        - repository (CredentialRepository): The CredentialRepository instance to set.
+        """
+        self._credential_repository = repository
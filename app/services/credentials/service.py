@@ -0,0 +1,207 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping, Optional
+
+from pymongo.collection import Collection
+
+from app.core.api.collections import DBCollectionEnum
+from app.core.common.config import config
+from app.core.schema.auth import PasswordHashParams, PrivateAuthInfo, SessionModel
+from app.services.tm_db.service import TMMongoDBServicePool
+
+# The fields sign-in needs, the rest of the credentials never leave the server
+_SIGN_IN_PROJECTION: Mapping[str, int] = {
+    'email': 1, 'password': 1, 'salt': 1, 'password_params': 1, 'token': 1, 'company_code': 1
+}
+
+
+class NegativeCache:
+    """
+    Bounded, expiring set of the emails known to have no credentials.
+
+    Credential-stuffing traffic mostly tries emails that don't exist, remembering them keeps
+    those attempts off the database. The cache is per process, an email signing up on
+    another worker may be refused by this one for up to `CREDENTIAL_NEGATIVE_CACHE_SECONDS`.
+    """
+
+    def __init__(self):
+        self._expires: 'OrderedDict[str, float]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, email: str) -> bool:
+        with self._lock:
+            expires: Optional[float] = self._expires.get(email)
+            if expires is None:
+                return False
+            if expires < time.monotonic():
+                del self._expires[email]
+                return False
+            return True
+
+    def add(self, email: str) -> None:
+        if config.CREDENTIAL_NEGATIVE_CACHE_SIZE <= 0:
+            return
+
+        with self._lock:
+            self._expires[email] = time.monotonic() + config.CREDENTIAL_NEGATIVE_CACHE_SECONDS
+            self._expires.move_to_end(email)
+
+            while len(self._expires) > config.CREDENTIAL_NEGATIVE_CACHE_SIZE:
+                self._expires.popitem(last=False)
+
+    def discard(self, email: str) -> None:
+        with self._lock:
+            self._expires.pop(email, None)
+
+
+unknown_emails: NegativeCache = NegativeCache()
+
+
+class CredentialRepository:
+    """
+    Repository of the `AuthCredentials` and `Sessions` collections.
+
+    Every lookup is a single indexed query, sign-in costs one round trip to check the password
+    and one to open the session. Sessions live in their own collection, a user may hold
+    several at once and a TTL index on `expires_at` deletes them once expired, so the
+    collection checked on every request only holds the live ones.
+    """
+    _mongo_db_service_provider: TMMongoDBServicePool = None
+
+    def __init__(self, mongo_db_service: TMMongoDBServicePool):
+        self._mongo_db_service_provider = mongo_db_service
+
+    def _get_collection(self) -> Collection:
+        return self._mongo_db_service_provider.get_mongodb_service(DBCollectionEnum.AUTH_CREDENTIALS.value)
+
+    def find_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the credentials of an email, as needed to check a password.
+
+        Parameters:
+        - email (str): The email of the user.
+
+        Returns:
+        - Optional[Dict[str, Any]]: The id, password hash, salt, hash parameters, token seed and tenant,
+            None if the email is unknown.
+        """
+        if email in unknown_emails:
+            return None
+
+        credentials = self._get_collection().find_one({'email': email}, _SIGN_IN_PROJECTION)
+        if credentials is None:
+            unknown_emails.add(email)
+
+        return credentials
+
+    def _get_sessions(self) -> Collection:
+        return self._mongo_db_service_provider.get_mongodb_service(DBCollectionEnum.SESSIONS.value)
+
+    def create_session(self, credentials: Mapping[str, Any], auth_token: str, token_expires: float) -> None:
+        """
+        Open a session for credentials read by `find_by_email`, alongside the other sessions of the user.
+
+        Parameters:
+        - credentials (Mapping[str, Any]): The credentials returned by `find_by_email`.
+        - auth_token (str): The auth token of the session.
+        - token_expires (float): The expiry of the auth token, as a POSIX timestamp, e.g. from `time.time()`.
+        """
+        session = SessionModel(
+            user_id=str(credentials['_id']),
+            email=credentials['email'],
+            auth_token=auth_token,
+            company_code=credentials.get('company_code'),
+            expires_at=datetime.fromtimestamp(token_expires, timezone.utc),
+            date_created=datetime.now(timezone.utc)
+        )
+        self._get_sessions().insert_one(session.model_dump())
+
+    def get_active_session(self, auth_token: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the unexpired session of an auth token, a single query on the unique `auth_token` index.
+
+        Returns:
+        - Optional[Dict[str, Any]]: The user id and tenant of the session, None if the token has none.
+        """
+        return self._get_sessions().find_one(
+            {'auth_token': auth_token, 'expires_at': {'$gt': datetime.now(timezone.utc)}},
+            {'_id': 0, 'user_id': 1, 'company_code': 1}
+        )
+
+    def is_session_active(self, auth_token: str) -> bool:
+        """
+        Check an auth token belongs to an unexpired session.
+        """
+        return self.get_active_session(auth_token) is not None
+
+    def refresh_session(self, current_auth_token: str, auth_token: str, token_expires: float) -> bool:
+        """
+        Replace the auth token of an unexpired session.
+
+        Parameters:
+        - current_auth_token (str): The auth token held by the client.
+        - auth_token (str): The new auth token.
+        - token_expires (float): The expiry of the new auth token, as a POSIX timestamp, e.g. from `time.time()`.
+
+        Returns:
+        - bool: Whether the token was replaced, False if the current token has no unexpired session.
+        """
+        updated = self._get_sessions().find_one_and_update(
+            {'auth_token': current_auth_token, 'expires_at': {'$gt': datetime.now(timezone.utc)}},
+            {'$set': {'auth_token': auth_token, 'expires_at': datetime.fromtimestamp(token_expires, timezone.utc)}},
+            projection={'_id': 1}
+        )
+        return updated is not None
+
+    def end_session(self, auth_token: str) -> Optional[str]:
+        """
+        Close the session of an auth token, the other sessions of the user stay open.
+
+        Parameters:
+        - auth_token (str): The auth token of the session.
+
+        Returns:
+        - Optional[str]: The email of the user, None if the token has no session.
+        """
+        session = self._get_sessions().find_one_and_delete({'auth_token': auth_token}, projection={'email': 1})
+        return session.get('email') if session else None
+
+    def create(self, credentials: PrivateAuthInfo) -> None:
+        """
+        Insert the credentials of a new user.
+
+        Raises:
+        - DuplicateKeyError: If the email already has credentials.
+        """
+        self._get_collection().insert_one(credentials.model_dump())
+        unknown_emails.discard(credentials.email)
+
+    def update_password_hash(
+            self, credentials: Mapping[str, Any], password_hash: bytes, salt: bytes, params: PasswordHashParams
+    ) -> bool:
+        """
+        Replace the password hash of credentials read by `find_by_email`, unless it changed since.
+
+        Parameters:
+        - credentials (Mapping[str, Any]): The credentials returned by `find_by_email`.
+        - password_hash (bytes): The new password hash.
+        - salt (bytes): The salt of the new hash.
+        - params (PasswordHashParams): The parameters of the new hash.
+
+        Returns:
+        - bool: Whether the hash was replaced.
+        """
+        result = self._get_collection().update_one(
+            {'_id': credentials['_id'], 'password': credentials['password']},
+            {'$set': {'password': password_hash, 'salt': salt, 'password_params': params.model_dump()}}
+        )
+        return result.modified_count > 0
+
+    def user_exists(self, email: str) -> bool:
+        """
+        Check a user exists, answered from the unique `email` index without reading the document.
+        """
+        users: Collection = self._mongo_db_service_provider.get_mongodb_service(DBCollectionEnum.USERS.value)
+        return users.find_one({'email': email}, {'_id': 0, 'email': 1}) is not None
@@ -0,0 +1,30 @@
+from app.services.deferred.service import DeferredJobService
+from app.services.tm_db.provider import TMMongoDBServiceProvider
+
+
+class DeferredJobServiceProvider(TMMongoDBServiceProvider):
+    """
+    A class that provides the deferred jobs to controllers. Controllers inheriting it may
+    answer `202` and process their requests on the queue workers, see `BaseAPIController.execution_mode`.
+    """
+    _deferred_job_service: DeferredJobService = None
+
+    def get_deferred_job_service(self) -> DeferredJobService:
+        """
+        Lazy-loads the DeferredJobService on top of the MongoDB service pool.
+
+        Returns:
+        - DeferredJobService: The DeferredJobService instance.
+        """
+        if not self._deferred_job_service:
+            self._deferred_job_service = DeferredJobService(self.get_mongodb_service_pool())
+        return self._deferred_job_service
+
+    def set_deferred_job_service(self, service: DeferredJobService):
+        """
+        Set the DeferredJobService instance.
+
+        Parameters:
+        - service (DeferredJobService): The DeferredJobService instance to set.
+        """
+        self._deferred_job_service = service
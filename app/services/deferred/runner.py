@@ -0,0 +1,70 @@
+import logging
+from http import HTTPStatus
+
+from bson.errors import InvalidDocument
+from fastapi import HTTPException
+from pydantic import ValidationError
+from pymongo.errors import PyMongoError
+
+from app.core.api.base_controller import APIControllerFactory, BaseAPIController
+from app.core.common.base_schema import APIRequestContext
+from app.core.common.config import config
+from app.services.deferred.service import DeferredJobService
+from app.services.tm_db.service import TMMongoDBServicePool
+
+logger = logging.getLogger('uvicorn')
+
+# Outages and timeouts are retried by the queue, any other error is the outcome of the request
+_RETRIED_STATUS_CODES = frozenset({HTTPStatus.SERVICE_UNAVAILABLE, HTTPStatus.GATEWAY_TIMEOUT})
+
+
+def run_deferred_request(job_id: str) -> None:
+    """
+    Process a deferred request through its controller, as the request thread would have, and
+    store its outcome in the job.
+
+    Parameters:
+    - job_id (str): The id of the job.
+    """
+    pool: TMMongoDBServicePool = TMMongoDBServicePool()
+    service: DeferredJobService = DeferredJobService(pool)
+
+    job = service.start(job_id)
+    if job is None:
+        logger.info(f'run_deferred_request skipping job {job_id}, already finished or expired')
+        return
+
+    factory: APIControllerFactory = APIControllerFactory()
+    factory.set_mongodb_service_pool(pool)
+    controller: BaseAPIController = factory.get_controller(job.request.controller_name, job.request.version)
+
+    # The job runs as the user who enqueued it, in the tenant resolved from their credentials back then
+    context: APIRequestContext = APIRequestContext(job_id=job.id, user_id=job.caller, company_code=job.company_code)
+
+    try:
+        request = controller.get_request_type().model_validate(job.request.payload)
+        output = controller.invoke(request, context)
+    except ValidationError as e:
+        service.fail(job.id, HTTPStatus.UNPROCESSABLE_ENTITY, str(e))
+        return
+    except HTTPException as e:
+        if e.status_code in _RETRIED_STATUS_CODES and job.attempts < config.QUEUE_MAX_ATTEMPTS:
+            raise
+        service.fail(job.id, e.status_code, str(e.detail))
+        return
+    except Exception as e:
+        # The queue retries unexpected errors, the last attempt records the error rather than
+        # leaving the job running once the message is dead-lettered
+        if job.attempts < config.QUEUE_MAX_ATTEMPTS:
+            raise
+        service.fail(job.id, HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+        return
+
+    result = [item.model_dump(mode='json') for item in output] if isinstance(output, list) \
+        else output.model_dump(mode='json')
+    try:
+        service.finish(job.id, HTTPStatus.OK, result)
+    except (InvalidDocument, PyMongoError) as e:
+        # The request ran, running it again to store its response would repeat its writes
+        logger.error(f'run_deferred_request could not store the response of job {job.id}: {str(e)}')
+        service.fail(job.id, HTTPStatus.INTERNAL_SERVER_ERROR, f'The response could not be stored: {str(e)}')
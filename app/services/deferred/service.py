@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from typing import Any, Optional
+
+import bson
+from pymongo import ReturnDocument
+from pymongo.collection import Collection
+
+from app.core.api.collections import DBCollectionEnum
+from app.core.api.exceptions import QueueUnavailableException
+from app.core.common.config import config
+from app.core.schema.job import DONE, FAILED, QUEUED, RUNNING, JobModel
+from app.services.tm_db.service import TMMongoDBServicePool
+from app.services.tm_queue.provider import TMQueuePublisher
+
+
+class DeferredJobService(TMQueuePublisher):
+    """
+    Service class to persist deferred requests and hand them to the queue workers.
+
+    A job is stored before its `run_deferred_request` message is published, so a worker
+    always finds the request it is asked to run, and a job whose message wasn't confirmed
+    is removed again. Workers move the job from 'queued' to 'running', then to 'done' with
+    the response of the request or 'failed' with its error. A job whose last delivery never
+    reported back, e.g. its worker crashed, is failed when next read.
+    """
+    _mongo_db_service_provider: TMMongoDBServicePool = None
+
+    def __init__(self, mongo_db_service: TMMongoDBServicePool):
+        self._mongo_db_service_provider = mongo_db_service
+
+    def _get_collection(self) -> Collection:
+        return self._mongo_db_service_provider.get_mongodb_service(DBCollectionEnum.JOBS.value)
+
+    def enqueue(self, job: JobModel) -> JobModel:
+        """
+        Store a job and publish it to the workers, once per job id.
+
+        Parameters:
+        - job (JobModel): The job to enqueue.
+
+        Returns:
+        - JobModel: The job, the one stored earlier when a job with the same id exists.
+
+        Raises:
+        - QueueUnavailableException: If the broker didn't confirm the job.
+        """
+        result = self._get_collection().update_one(
+            {'_id': job.id}, {'$setOnInsert': job.model_dump(by_alias=True)}, upsert=True
+        )
+        if result.upserted_id is None:
+            return JobModel.model_validate(self._get_collection().find_one({'_id': job.id}))
+
+        try:
+            self.get_tm_publisher().publish_job('run_deferred_request', {'job_id': job.id})
+        except QueueUnavailableException:
+            self._get_collection().delete_one({'_id': job.id})
+            raise
+
+        return job
+
+    def start(self, job_id: str) -> Optional[JobModel]:
+        """
+        Mark a job as started by a worker.
+
+        Parameters:
+        - job_id (str): The id of the job.
+
+        Returns:
+        - Optional[JobModel]: The job, None if it is already finished or expired.
+        """
+        document = self._get_collection().find_one_and_update(
+            {'_id': job_id, 'state': {'$in': [QUEUED, RUNNING]}},
+            {'$set': {'state': RUNNING, 'date_started': datetime.utcnow()}, '$inc': {'attempts': 1}},
+            return_document=ReturnDocument.AFTER
+        )
+        return JobModel.model_validate(document) if document else None
+
+    def finish(self, job_id: str, status_code: int, result: Any) -> None:
+        """
+        Store the response of a job, a response over `DEFERRED_JOB_MAX_RESULT_BYTES` fails the job instead.
+
+        Parameters:
+        - job_id (str): The id of the job.
+        - status_code (int): The HTTP status of the response.
+        - result (Any): The response, JSON serializable.
+        """
+        if len(bson.encode({'result': result})) > config.DEFERRED_JOB_MAX_RESULT_BYTES:
+            self.fail(
+                job_id,
+                HTTPStatus.INSUFFICIENT_STORAGE,
+                f'The response exceeds {config.DEFERRED_JOB_MAX_RESULT_BYTES} bytes, send the request synchronously.'
+            )
+            return
+
+        self._get_collection().update_one(
+            {'_id': job_id},
+            {'$set': {'state': DONE, 'status_code': status_code, 'result': result, 'date_finished': datetime.utcnow()}}
+        )
+
+    def fail(self, job_id: str, status_code: int, error: str) -> None:
+        """
+        Store the error of a job.
+
+        Parameters:
+        - job_id (str): The id of the job.
+        - status_code (int): The HTTP status of the error.
+        - error (str): The error message.
+        """
+        self._get_collection().update_one(
+            {'_id': job_id},
+            {'$set': {'state': FAILED, 'status_code': status_code, 'error': error, 'date_finished': datetime.utcnow()}}
+        )
+
+    def get(self, job_id: str, caller: str) -> Optional[JobModel]:
+        """
+        Get a job enqueued by a caller.
+
+        Parameters:
+        - job_id (str): The id of the job.
+        - caller (str): The user asking for the job.
+
+        Returns:
+        - Optional[JobModel]: The job, None if it doesn't exist or belongs to another caller.
+        """
+        document = self._get_collection().find_one({'_id': job_id, 'caller': caller})
+        if document and document.get('state') == RUNNING and document.get('attempts', 0) >= config.QUEUE_MAX_ATTEMPTS:
+            document = self._fail_abandoned(document)
+
+        return JobModel.model_validate(document) if document else None
+
+    def _fail_abandoned(self, document: Any) -> Any:
+        """
+        Fail a job started by its last delivery once that delivery's visibility timeout passed,
+        the queue dead-letters the message rather than delivering it again.
+        """
+        cutoff: datetime = datetime.utcnow() - timedelta(seconds=config.QUEUE_VISIBILITY_TIMEOUT_SECONDS)
+        if document.get('date_started') and document['date_started'] > cutoff:
+            return document
+
+        failed = self._get_collection().find_one_and_update(
+            {'_id': document['_id'], 'state': RUNNING, 'date_started': document.get('date_started')},
+            {'$set': {
+                'state': FAILED,
+                'status_code': HTTPStatus.INTERNAL_SERVER_ERROR,
+                'error': f'The job did not complete within {config.QUEUE_MAX_ATTEMPTS} attempts.',
+                'date_finished': datetime.utcnow()
+            }},
+            return_document=ReturnDocument.AFTER
+        )
+        return failed or self._get_collection().find_one({'_id': document['_id']})
@@ -0,0 +1,45 @@
+from app.core.common.config import config
+from app.services.idempotency.service import (
+    IdempotencyService,
+    IdempotencyStore,
+    MemoryIdempotencyStore,
+    MongoIdempotencyStore
+)
+from app.services.tm_db.provider import TMMongoDBServiceProvider
+
+
+class IdempotencyServiceProvider(TMMongoDBServiceProvider):
+    """
+    A class that provides the idempotency keys to controllers. Controllers inheriting it
+    accept the `Idempotency-Key` header, see `BaseAPIController.invoke`.
+    """
+    _idempotency_service: IdempotencyService = None
+    _memory_store: IdempotencyStore = None
+
+    def get_idempotency_service(self) -> IdempotencyService:
+        """
+        Lazy-loads the IdempotencyService on the store selected by `IDEMPOTENCY_STORE`.
+
+        Returns:
+        - IdempotencyService: The IdempotencyService instance.
+        """
+        if not self._idempotency_service:
+            if config.IDEMPOTENCY_STORE == 'memory':
+                # One store for the whole process, shared by every controller
+                if not IdempotencyServiceProvider._memory_store:
+                    IdempotencyServiceProvider._memory_store = MemoryIdempotencyStore()
+                store: IdempotencyStore = IdempotencyServiceProvider._memory_store
+            else:
+                store = MongoIdempotencyStore(self.get_mongodb_service_pool())
+
+            self._idempotency_service = IdempotencyService(store)
+        return self._idempotency_service
+
+    def set_idempotency_service(self, service: IdempotencyService):
+        """
+        Set the IdempotencyService instance.
+
+        Parameters:
+        - service (IdempotencyService): The IdempotencyService instance to set.
+        """
+        self._idempotency_service = service
@@ -0,0 +1,227 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Mapping, Optional
+
+from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError
+
+from app.core.api.collections import DBCollectionEnum
+from app.core.api.exceptions import IdempotencyKeyInProgressException, IdempotencyKeyReusedException
+from app.core.common.config import config
+from app.core.schema.idempotency import IdempotencyKeyModel
+from app.services.tm_db.service import TMMongoDBServicePool
+
+IN_FLIGHT: str = 'in_flight'
+COMPLETED: str = 'completed'
+
+
+class IdempotencyStore:
+    """
+    Storage of the idempotency keys, the primitives `IdempotencyService` builds on.
+    """
+
+    def insert(self, record: IdempotencyKeyModel) -> bool:
+        """
+        Insert a record, False if a record with the same key already exists.
+        """
+        raise NotImplementedError
+
+    def get(self, key: str) -> Optional[IdempotencyKeyModel]:
+        raise NotImplementedError
+
+    def take_over(self, key: str, lease_expires: datetime, new_lease_expires: datetime) -> bool:
+        """
+        Take over an in-flight record whose lease expired, False if someone else did first.
+        """
+        raise NotImplementedError
+
+    def complete(self, key: str, response: Mapping[str, Any]) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def wait(self, key: str, timeout: float) -> None:
+        """
+        Wait up to `timeout` seconds for the record to change.
+        """
+        raise NotImplementedError
+
+
+class MongoIdempotencyStore(IdempotencyStore):
+    """
+    Idempotency keys in the `IdempotencyKeys` collection, shared by every worker. A TTL index
+    on `expires_at` deletes them.
+    """
+    _poll_interval_seconds: float = 0.05
+
+    def __init__(self, mongo_db_service: TMMongoDBServicePool):
+        self._mongo_db_service_provider = mongo_db_service
+
+    def _get_collection(self) -> Collection:
+        return self._mongo_db_service_provider.get_mongodb_service(DBCollectionEnum.IDEMPOTENCY_KEYS.value)
+
+    def insert(self, record: IdempotencyKeyModel) -> bool:
+        try:
+            self._get_collection().insert_one(record.model_dump(by_alias=True))
+            return True
+        except DuplicateKeyError:
+            return False
+
+    def get(self, key: str) -> Optional[IdempotencyKeyModel]:
+        document = self._get_collection().find_one({'_id': key})
+        return IdempotencyKeyModel.model_validate(document) if document else None
+
+    def take_over(self, key: str, lease_expires: datetime, new_lease_expires: datetime) -> bool:
+        return bool(self._get_collection().find_one_and_update(
+            {'_id': key, 'state': IN_FLIGHT, 'lease_expires': lease_expires},
+            {'$set': {'lease_expires': new_lease_expires}}
+        ))
+
+    def complete(self, key: str, response: Mapping[str, Any]) -> None:
+        self._get_collection().update_one({'_id': key}, {'$set': {'state': COMPLETED, 'response': response}})
+
+    def delete(self, key: str) -> None:
+        self._get_collection().delete_one({'_id': key})
+
+    def wait(self, key: str, timeout: float) -> None:
+        time.sleep(min(timeout, self._poll_interval_seconds))
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """
+    Idempotency keys in process memory, for single-node deployments. Waiters are woken
+    up as soon as the record changes.
+    """
+
+    def __init__(self):
+        self._records: Dict[str, IdempotencyKeyModel] = {}
+        self._changed = threading.Condition()
+
+    def _purge(self) -> None:
+        now = datetime.utcnow()
+        for key in [key for key, record in self._records.items() if record.expires_at <= now]:
+            del self._records[key]
+
+    def insert(self, record: IdempotencyKeyModel) -> bool:
+        with self._changed:
+            self._purge()
+            if record.id in self._records:
+                return False
+            self._records[record.id] = record
+            return True
+
+    def get(self, key: str) -> Optional[IdempotencyKeyModel]:
+        with self._changed:
+            record = self._records.get(key)
+            return record.model_copy() if record else None
+
+    def take_over(self, key: str, lease_expires: datetime, new_lease_expires: datetime) -> bool:
+        with self._changed:
+            record = self._records.get(key)
+            if not record or record.state != IN_FLIGHT or record.lease_expires != lease_expires:
+                return False
+            record.lease_expires = new_lease_expires
+            return True
+
+    def complete(self, key: str, response: Mapping[str, Any]) -> None:
+        with self._changed:
+            record = self._records.get(key)
+            if record:
+                record.state = COMPLETED
+                record.response = response
+            self._changed.notify_all()
+
+    def delete(self, key: str) -> None:
+        with self._changed:
+            self._records.pop(key, None)
+            self._changed.notify_all()
+
+    def wait(self, key: str, timeout: float) -> None:
+        with self._changed:
+            record = self._records.get(key)
+            if record and record.state == IN_FLIGHT:
+                self._changed.wait(timeout)
+
+
+class IdempotencyService:
+    """
+    Service class to process a request at most once per `Idempotency-Key`.
+
+    The first request with a key claims it and stores its response once processed, repeats
+    get the stored response. A repeat arriving while the first request is still in flight
+    waits for its response, up to `IDEMPOTENCY_WAIT_SECONDS`. A request that failed releases
+    its key so it can be retried; one that never finished (e.g. a crashed worker) is taken
+    over once its lease of `IDEMPOTENCY_LEASE_SECONDS` expires. So does one whose response
+    couldn't be stored after its write committed, that request runs again.
+    """
+    _store: IdempotencyStore = None
+
+    def __init__(self, store: IdempotencyStore):
+        self._store = store
+
+    def claim(self, key: str, fingerprint: str) -> Optional[Mapping[str, Any]]:
+        """
+        Claim a key for processing, or get the response of the request that claimed it before.
+
+        Parameters:
+        - key (str): The idempotency key, scoped to the controller and the caller.
+        - fingerprint (str): The hash of the request payload.
+
+        Returns:
+        - Optional[Mapping[str, Any]]: The stored response, None if the key was claimed and the request must be processed.
+
+        Raises:
+        - IdempotencyKeyReusedException: If the key was used for another payload.
+        - IdempotencyKeyInProgressException: If the request holding the key didn't finish in time.
+        """
+        deadline: float = time.monotonic() + config.IDEMPOTENCY_WAIT_SECONDS
+
+        while True:
+            now: datetime = datetime.utcnow()
+            claimed: bool = self._store.insert(IdempotencyKeyModel(
+                id=key,
+                fingerprint=fingerprint,
+                state=IN_FLIGHT,
+                lease_expires=now + timedelta(seconds=config.IDEMPOTENCY_LEASE_SECONDS),
+                expires_at=now + timedelta(seconds=config.IDEMPOTENCY_TTL_SECONDS)
+            ))
+            if claimed:
+                return None
+
+            record: Optional[IdempotencyKeyModel] = self._store.get(key)
+            if record is None:
+                # Released or expired in between, claim it again
+                continue
+
+            if record.fingerprint != fingerprint:
+                raise IdempotencyKeyReusedException('Idempotency-Key was already used for another request.')
+
+            if record.state == COMPLETED:
+                return record.response
+
+            if record.lease_expires <= now and self._store.take_over(
+                key, record.lease_expires, now + timedelta(seconds=config.IDEMPOTENCY_LEASE_SECONDS)
+            ):
+                return None
+
+            remaining: float = deadline - time.monotonic()
+            if remaining <= 0:
+                raise IdempotencyKeyInProgressException(
+                    'A request with this Idempotency-Key is still in progress.', retry_after=1
+                )
+
+            self._store.wait(key, remaining)
+
+    def complete(self, key: str, response: Mapping[str, Any]) -> None:
+        """
+        Store the response of a claimed key, returned to every repeat until the key expires.
+        """
+        self._store.complete(key, response)
+
+    def release(self, key: str) -> None:
+        """
+        Release a claimed key after its request failed, so the client can retry it.
+        """
+        self._store.delete(key)
@@ -0,0 +1,29 @@
+from app.services.outbox.service import OutboxService
+from app.services.tm_db.provider import TMMongoDBServiceProvider
+
+
+class OutboxServiceProvider(TMMongoDBServiceProvider):
+    """
+    A class that provides the outbox to the controllers writing boards, tasks and companies.
+    """
+    _outbox_service: OutboxService = None
+
+    def get_outbox_service(self) -> OutboxService:
+        """
+        Lazy-loads the OutboxService on top of the MongoDB service pool.
+
+        Returns:
+        - OutboxService: The OutboxService instance.
+        """
+        if not self._outbox_service:
+            self._outbox_service = OutboxService(self.get_mongodb_service_pool())
+        return self._outbox_service
+
+    def set_outbox_service(self, service: OutboxService):
+        """
+        Set the OutboxService instance.
+
+        Parameters:
+        - service (OutboxService): The OutboxService instance to set.
+        """
+        self._outbox_service = service
@@ -0,0 +1,140 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from pymongo import ASCENDING
+from pymongo.errors import PyMongoError
+
+from app.core.api.collections import DBCollectionEnum
+from app.core.api.exceptions import DatabaseUnavailableException, QueueUnavailableException
+from app.core.common.config import config
+from app.core.common.metrics import metrics_registry
+from app.core.common.queue_model import QueueMessageModel
+from app.services.outbox.service import PENDING, SENT
+from app.services.tm_db.service import TMMongoDBServicePool
+from app.services.tm_queue.jobs import EVENTS_QUEUE
+from app.services.tm_queue.provider import TMQueuePublisher
+
+logger = logging.getLogger('uvicorn')
+
+
+class OutboxRelay(TMQueuePublisher):
+    """
+    Publishes the events of the outbox to the job queue, in batches.
+
+    Every `OUTBOX_RELAY_SECONDS` the relay claims up to `OUTBOX_BATCH_SIZE` pending events
+    for `OUTBOX_LEASE_SECONDS`, publishes them in a single confirmed publish and marks them
+    sent, sent events are deleted after `OUTBOX_RETENTION_SECONDS`. Several processes may run
+    a relay, the lease keeps them from publishing the same events, and the events of a relay
+    that died mid-batch are published again once its lease expired: delivery is at least
+    once, the message id of an event is its outbox id for consumers to skip duplicates.
+
+    Attributes:
+        _poller (Optional[threading.Thread]): The thread relaying the events, once started.
+    """
+
+    def __init__(self):
+        self._poller: Optional[threading.Thread] = None
+        self._published = 0
+        self._batches = 0
+        self._errors = 0
+        self._last_batch_at: Optional[float] = None
+
+    def relay_batch(self, pool: TMMongoDBServicePool) -> int:
+        """
+        Claim, publish and mark sent a batch of pending events.
+
+        Parameters:
+        - pool (TMMongoDBServicePool): The MongoDB service pool.
+
+        Returns:
+        - int: The events published.
+        """
+        outbox = pool.get_mongodb_service(DBCollectionEnum.OUTBOX.value)
+        now: datetime = datetime.utcnow()
+
+        candidates: List = [
+            record['_id'] for record in outbox.find(
+                {'state': PENDING, 'lease_expires': {'$lte': now}}, {'_id': 1}
+            ).sort('_id', ASCENDING).limit(config.OUTBOX_BATCH_SIZE)
+        ]
+        if not candidates:
+            return 0
+
+        # Another relay may claim some of the same events meanwhile, each keeps those it got
+        claim: str = uuid4().hex
+        outbox.update_many(
+            {'_id': {'$in': candidates}, 'state': PENDING, 'lease_expires': {'$lte': now}},
+            {'$set': {'claim': claim, 'lease_expires': now + timedelta(seconds=config.OUTBOX_LEASE_SECONDS)}}
+        )
+        records = list(
+            outbox.find({'_id': {'$in': candidates}, 'claim': claim}, {'event': 1}).sort('_id', ASCENDING)
+        )
+        if not records:
+            return 0
+
+        self.get_tm_publisher().publish(EVENTS_QUEUE, [
+            QueueMessageModel(job='company_event', payload=dict(record['event']), message_id=str(record['_id']))
+            for record in records
+        ])
+
+        date_sent: datetime = datetime.utcnow()
+        outbox.update_many(
+            {'_id': {'$in': [record['_id'] for record in records]}, 'claim': claim},
+            {'$set': {
+                'state': SENT,
+                'date_sent': date_sent,
+                'expires_at': date_sent + timedelta(seconds=config.OUTBOX_RETENTION_SECONDS)
+            }}
+        )
+
+        self._published += len(records)
+        self._batches += 1
+        self._last_batch_at = time.time()
+        return len(records)
+
+    def _poll(self, pool: TMMongoDBServicePool) -> None:
+        """
+        Relay the pending events every `OUTBOX_RELAY_SECONDS`, right away while full batches are pending.
+        """
+        while True:
+            try:
+                if self.relay_batch(pool) >= config.OUTBOX_BATCH_SIZE:
+                    continue
+            except (PyMongoError, DatabaseUnavailableException, QueueUnavailableException) as e:
+                self._errors += 1
+                logger.warning(f'OutboxRelay batch failed, retrying: {str(e)}')
+
+            time.sleep(config.OUTBOX_RELAY_SECONDS)
+
+    def start(self, pool: TMMongoDBServicePool) -> None:
+        """
+        Relay the outbox from a daemon thread, once.
+
+        Parameters:
+        - pool (TMMongoDBServicePool): The pool to get the collection from.
+        """
+        if self._poller:
+            return
+
+        self._poller = threading.Thread(target=self._poll, args=(pool,), name='tm-outbox-relay', daemon=True)
+        self._poller.start()
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Get the throughput and freshness of the relay.
+        """
+        return {
+            'running': self._poller is not None,
+            'published': self._published,
+            'batches': self._batches,
+            'errors': self._errors,
+            'last_batch_seconds_ago': round(time.time() - self._last_batch_at, 3) if self._last_batch_at else None,
+        }
+
+
+outbox_relay: OutboxRelay = OutboxRelay()
+metrics_registry.register('outbox', outbox_relay.snapshot)
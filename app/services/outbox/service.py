@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import Callable, Sequence, TypeVar
+
+from pymongo.collection import Collection
+
+from app.core.api.collections import DBCollectionEnum
+from app.core.common.event_models import CompanyEvent
+from app.core.schema.outbox import OutboxEventModel
+from app.services.tm_db.service import TMMongoDBServicePool
+
+PENDING: str = 'pending'
+SENT: str = 'sent'
+
+T = TypeVar('T')
+
+
+class OutboxService:
+    """
+    Service class to write the change events of a request to the outbox, with the change itself.
+
+    Within `run_in_transaction` the writes of the request and its events commit together, so
+    an event is never lost once the change is acknowledged, nor published for a change that
+    was rolled back. Where transactions aren't available (a standalone server, or a tenant
+    on its own cluster) the event is written right after the change. `OutboxRelay` publishes
+    the events to the job queue.
+    """
+    _mongo_db_service_provider: TMMongoDBServicePool = None
+
+    def __init__(self, mongo_db_service: TMMongoDBServicePool):
+        self._mongo_db_service_provider = mongo_db_service
+
+    def _get_collection(self) -> Collection:
+        return self._mongo_db_service_provider.get_mongodb_service(DBCollectionEnum.OUTBOX.value)
+
+    def run_in_transaction(self, collections: Sequence[str], callback: Callable[[], T]) -> T:
+        """
+        Run the writes of the callback and the events it records in one transaction, when available.
+
+        Writes of the same company all increment its CompanyVersions document, so concurrent
+        transactions conflict. The callback is run again on a `TransientTransactionError`,
+        the commit is retried on an `UnknownTransactionCommitResult`, both within the time
+        budget of the request. The callback must not have side effects outside the database.
+
+        Parameters:
+        - collections (Sequence[str]): The collections written to by the callback, besides the outbox.
+        - callback (Callable[[], T]): The writes.
+
+        Returns:
+        - T: The result of the callback.
+        """
+        session = self._mongo_db_service_provider.get_transaction_session(
+            [*collections, DBCollectionEnum.OUTBOX.value]
+        )
+        if session is None or session.in_transaction:
+            return callback()
+
+        return session.with_transaction(lambda _: callback())
+
+    def record(self, event: CompanyEvent) -> None:
+        """
+        Write an event to the outbox.
+
+        Parameters:
+        - event (CompanyEvent): The change event.
+        """
+        now: datetime = datetime.utcnow()
+        record = OutboxEventModel(
+            event=event.model_dump(mode='json'),
+            state=PENDING,
+            lease_expires=now,
+            date_created=now
+        )
+        self._get_collection().insert_one(record.model_dump(exclude_none=True))
@@ -0,0 +1,62 @@
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pymongo
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from app.core.api.collections import DBCollectionEnum
+from app.core.api.exceptions import DatabaseUnavailableException
+from app.core.common.config import config
+from app.core.api.rate_limit import RateLimit, RateLimitBackend
+from app.services.tm_db.service import TMMongoDBServicePool
+
+logger = logging.getLogger('uvicorn')
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class MongoRateLimitBackend(RateLimitBackend):
+    """
+    Fixed-window counters in the `RateLimits` collection, shared by every node.
+
+    Each hit is a single upsert incrementing the counter of the current window of the key,
+    the counters are deleted by a TTL index once their window is over. A key may get up to
+    twice its limit across the boundary of two windows. While the database can't be reached
+    requests are let through, the endpoints behind the limits fail on their own anyway.
+
+    Attributes:
+        pool (TMMongoDBServicePool): The MongoDB service pool.
+    """
+    blocking: bool = True
+
+    def __init__(self, pool: TMMongoDBServicePool):
+        self.pool = pool
+
+    def hit(self, key: str, rate_limit: RateLimit) -> Optional[float]:
+        now: float = time.time()
+        window_start: float = now - now % rate_limit.window_seconds
+        window_end: float = window_start + rate_limit.window_seconds
+
+        try:
+            with pymongo.timeout(config.REQUEST_TIMEOUT_SECONDS):
+                counter = self.pool.get_mongodb_service(DBCollectionEnum.RATE_LIMITS.value).find_one_and_update(
+                    {'_id': f'{key}:{int(window_start)}'},
+                    {
+                        '$inc': {'count': 1},
+                        '$setOnInsert': {'expires_at': _EPOCH + timedelta(seconds=window_end)},
+                    },
+                    projection={'count': 1},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER
+                )
+        except (PyMongoError, DatabaseUnavailableException) as e:
+            logger.warning(f'MongoRateLimitBackend hit failed, letting the request through: {str(e)}')
+            return None
+
+        if counter['count'] <= rate_limit.limit:
+            return None
+
+        return window_end - now
@@ -0,0 +1,203 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Dict, Iterator, List, Optional
+
+from pymongo.errors import ConnectionFailure, PyMongoError
+
+from app.core.api.exceptions import DatabaseUnavailableException
+from app.core.common.config import config
+
+
+class CircuitState(Enum):
+    """
+    Enum class for the states of a circuit breaker.
+
+    Attributes:
+        CLOSED (str): Calls go through, consecutive failures are counted.
+        OPEN (str): Calls fail fast until the cool-down period is over.
+        HALF_OPEN (str): A limited number of probe calls go through to test the server.
+    """
+    CLOSED: str = 'closed'
+    OPEN: str = 'open'
+    HALF_OPEN: str = 'half_open'
+
+
+def is_database_failure(e: Optional[BaseException]) -> bool:
+    """
+    Check an exception, or one of its causes, is a database connection failure or timeout.
+    """
+    while e is not None:
+        if isinstance(e, ConnectionFailure) or (isinstance(e, PyMongoError) and e.timeout):
+            return True
+        e = e.__cause__ or e.__context__
+    return False
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker around a MongoDB cluster.
+
+    It trips after `failure_threshold` consecutive requests failed on a connection error or
+    timeout, then fails every call fast for `reset_timeout_seconds` instead of letting them
+    pile up behind server selection. After the cool-down it lets `half_open_probes` requests
+    through, one success closes it again, one failure re-opens it.
+
+    Attributes:
+        name (str): The name of the cluster.
+        failure_threshold (int): The consecutive failures tripping the breaker.
+        reset_timeout_seconds (float): The cool-down period of an open breaker.
+        half_open_probes (int): The requests let through at once while half-open.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout_seconds: float, half_open_probes: int):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.half_open_probes = half_open_probes
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._times_opened = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    def _refresh_state(self) -> None:
+        if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout_seconds:
+            self._state = CircuitState.HALF_OPEN
+            self._probes_in_flight = 0
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._times_opened += 1
+
+    def before_call(self, probe: bool = True) -> None:
+        """
+        Let a call through or fail it fast.
+
+        Parameters:
+        - probe (bool): Whether the outcome of the call will be recorded, only such calls
+            can probe a half-open breaker.
+
+        Raises:
+        - DatabaseUnavailableException: If the breaker is open, or half-open with all probes in flight.
+        """
+        with self._lock:
+            self._refresh_state()
+
+            if self._state == CircuitState.CLOSED:
+                return
+
+            if self._state == CircuitState.HALF_OPEN and (not probe or self._probes_in_flight < self.half_open_probes):
+                if probe:
+                    self._probes_in_flight += 1
+                return
+
+            self._rejected += 1
+            remaining: float = self.reset_timeout_seconds - (time.monotonic() - self._opened_at)
+            raise DatabaseUnavailableException(
+                f'Circuit breaker of {self.name} is {self._state.value}.',
+                retry_after=max(1, round(remaining))
+            )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._consecutive_failures = 0
+            if self._state == CircuitState.HALF_OPEN:
+                self._state = CircuitState.CLOSED
+                self._probes_in_flight = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == CircuitState.HALF_OPEN or (
+                self._state == CircuitState.CLOSED and self._consecutive_failures >= self.failure_threshold
+            ):
+                self._open()
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Get the state and counters of the breaker.
+        """
+        with self._lock:
+            self._refresh_state()
+            return {
+                'state': self._state.value,
+                'consecutive_failures': self._consecutive_failures,
+                'times_opened': self._times_opened,
+                'rejected': self._rejected,
+            }
+
+
+def build_circuit_breaker(name: str) -> CircuitBreaker:
+    return CircuitBreaker(
+        name,
+        config.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        config.CIRCUIT_BREAKER_RESET_SECONDS,
+        config.CIRCUIT_BREAKER_HALF_OPEN_PROBES
+    )
+
+
+class CircuitBreakerScope:
+    """
+    The circuit breakers a request went through, told the outcome of the request once it is over.
+    """
+
+    def __init__(self):
+        self.breakers: List[CircuitBreaker] = []
+
+    def enter(self, breaker: CircuitBreaker) -> None:
+        """
+        Let the request through a breaker, once per request.
+
+        Raises:
+        - DatabaseUnavailableException: If the breaker fails the request fast.
+        """
+        if breaker not in self.breakers:
+            breaker.before_call(probe=True)
+            self.breakers.append(breaker)
+
+    def record(self, error: Optional[BaseException]) -> None:
+        for breaker in self.breakers:
+            if is_database_failure(error):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+
+_current_scope: ContextVar[Optional[CircuitBreakerScope]] = ContextVar('tm_circuit_breaker_scope', default=None)
+
+
+def get_circuit_breaker_scope() -> Optional[CircuitBreakerScope]:
+    """
+    Get the circuit breaker scope of the request being processed, None outside a request.
+    """
+    return _current_scope.get()
+
+
+@contextmanager
+def circuit_breaker_scope() -> Iterator[CircuitBreakerScope]:
+    """
+    Record the outcome of the block on every circuit breaker it went through.
+    """
+    scope = CircuitBreakerScope()
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    except BaseException as e:
+        scope.record(e)
+        raise
+    else:
+        scope.record(None)
+    finally:
+        _current_scope.reset(token)
@@ -0,0 +1,200 @@
+import base64
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Mapping, NamedTuple, Optional
+
+import bson
+from bson.errors import BSONError
+from bson.timestamp import Timestamp
+from pymongo import MongoClient
+from pymongo.client_session import ClientSession
+from pymongo.collection import Collection
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+    _ServerMode,
+)
+
+_READ_PREFERENCES = {
+    'primary': Primary,
+    'primaryPreferred': PrimaryPreferred,
+    'secondary': Secondary,
+    'secondaryPreferred': SecondaryPreferred,
+    'nearest': Nearest,
+}
+
+# Collection methods accepting a session, bound to the session of the request
+_SESSION_METHODS = frozenset({
+    'aggregate', 'bulk_write', 'count_documents', 'delete_many', 'delete_one', 'distinct', 'find',
+    'find_one', 'find_one_and_delete', 'find_one_and_replace', 'find_one_and_update', 'insert_many',
+    'insert_one', 'replace_one', 'update_many', 'update_one',
+})
+
+
+class ReadPolicy(NamedTuple):
+    """
+    Where the reads of a controller are served from.
+
+    Attributes:
+        mode (str): The read preference mode, 'primary', 'primaryPreferred', 'secondary',
+            'secondaryPreferred' or 'nearest'.
+        max_staleness_seconds (Optional[int]): How far behind the primary a secondary may be,
+            at least 90 seconds, None for no limit.
+    """
+    mode: str = 'primary'
+    max_staleness_seconds: Optional[int] = None
+
+    def get_read_preference(self) -> _ServerMode:
+        """
+        Get the pymongo read preference of the policy.
+        """
+        if self.mode == 'primary':
+            return Primary()
+
+        return _READ_PREFERENCES[self.mode](max_staleness=self.max_staleness_seconds or -1)
+
+
+PRIMARY = ReadPolicy()
+
+
+class SessionBoundCollection:
+    """
+    A collection running every operation in the causally consistent session of the request.
+    """
+
+    def __init__(self, collection: Collection, session: ClientSession):
+        self._collection = collection
+        self._session = session
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._collection, name)
+
+        if name in _SESSION_METHODS:
+            return functools.partial(attribute, session=self._session)
+        return attribute
+
+
+class ConsistencyScope:
+    """
+    The read policy and causally consistent sessions of a single request.
+
+    The sessions resume from the causal token the client got from its previous request,
+    so a read served by a secondary waits until that secondary has the client's writes.
+
+    Attributes:
+        read_policy (ReadPolicy): The read policy of the controller.
+        _causal_times (Dict[str, Dict[str, Any]]): The operation and cluster times received, per cluster.
+        _sessions (Dict[str, ClientSession]): The sessions started, per cluster.
+    """
+
+    def __init__(self, read_policy: ReadPolicy, causal_token: Optional[str] = None):
+        self.read_policy = read_policy
+        self._causal_times = self._decode_causal_token(causal_token)
+        self._sessions: Dict[str, ClientSession] = {}
+
+    @staticmethod
+    def _is_valid_causal_times(causal_times: Any) -> bool:
+        """
+        Check the times of a cluster have the shape `get_causal_token` writes, what the session accepts.
+        """
+        return isinstance(causal_times, Mapping) \
+            and isinstance(causal_times.get('operation_time'), Timestamp) \
+            and isinstance(causal_times.get('cluster_time'), Mapping) \
+            and isinstance(causal_times['cluster_time'].get('clusterTime'), Timestamp)
+
+    @classmethod
+    def _decode_causal_token(cls, causal_token: Optional[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Decode a causal token, an unreadable token, or the entries of clusters whose times
+        are malformed, are ignored rather than failing the request.
+        """
+        if not causal_token:
+            return {}
+
+        try:
+            decoded = bson.decode(base64.urlsafe_b64decode(causal_token.encode('ascii')))
+        except (BSONError, ValueError, TypeError):
+            return {}
+
+        return {key: causal_times for key, causal_times in decoded.items() if cls._is_valid_causal_times(causal_times)}
+
+    def get_session(self, cluster: Optional[str], client: MongoClient) -> ClientSession:
+        """
+        Get the causally consistent session of a cluster, started on first use.
+
+        Parameters:
+        - cluster (Optional[str]): The URI of the cluster, None for the configured server.
+        - client (MongoClient): The client of the cluster.
+
+        Returns:
+        - ClientSession: The session of the cluster.
+        """
+        key: str = cluster or ''
+
+        if key not in self._sessions:
+            session: ClientSession = client.start_session(causal_consistency=True)
+            causal_times = self._causal_times.get(key)
+
+            if causal_times:
+                session.advance_cluster_time(causal_times['cluster_time'])
+                session.advance_operation_time(causal_times['operation_time'])
+
+            self._sessions[key] = session
+
+        return self._sessions[key]
+
+    def get_causal_token(self) -> Optional[str]:
+        """
+        Get the token to hand back to the client, for its next request to read its own writes.
+
+        Returns:
+        - Optional[str]: The token, None if no session saw an operation.
+        """
+        causal_times = dict(self._causal_times)
+
+        for key, session in self._sessions.items():
+            if session.operation_time is not None and session.cluster_time is not None:
+                causal_times[key] = {'operation_time': session.operation_time, 'cluster_time': session.cluster_time}
+
+        if not causal_times:
+            return None
+
+        return base64.urlsafe_b64encode(bson.encode(causal_times)).decode('ascii')
+
+    def close(self) -> None:
+        for session in self._sessions.values():
+            session.end_session()
+        self._sessions.clear()
+
+
+_current_scope: ContextVar[Optional[ConsistencyScope]] = ContextVar('tm_consistency_scope', default=None)
+
+
+def get_consistency_scope() -> Optional[ConsistencyScope]:
+    """
+    Get the consistency scope of the request being processed, None outside a request.
+    """
+    return _current_scope.get()
+
+
+@contextmanager
+def consistency_scope(read_policy: ReadPolicy, causal_token: Optional[str] = None) -> Iterator[ConsistencyScope]:
+    """
+    Serve the collections opened within the block with the given read policy, in causally
+    consistent sessions resuming from the given causal token.
+
+    Parameters:
+    - read_policy (ReadPolicy): The read policy of the controller.
+    - causal_token (Optional[str]): The causal token of the client's previous request.
+    """
+    scope = ConsistencyScope(read_policy, causal_token)
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
+        scope.close()
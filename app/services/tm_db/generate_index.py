@@ -1,4 +1,4 @@
-from typing import Callable, Sequence, Optional
+from typing import Callable, Dict, List, Sequence, Optional
 
 from pymongo.collection import Collection
 
@@ -6,8 +6,12 @@ from pymongo.collection import Collection
 class MongoDBIndexService:
     """
     Service class for generating indexes for MongoDB collections.
+
+    The index declarations are recorded per collection, so collections opened later
+    (e.g. in a tenant database) get the same indexes through `apply_indexes`.
     """
     _service_from_factory: Optional[Collection] = None
+    _declared_indexes: Dict[str, List[dict]] = {}
 
     def _generate_unique_index(self, indexes: Sequence):
         """
@@ -37,6 +41,49 @@ class MongoDBIndexService:
         """
         self._service_from_factory.create_index(indexes, unique=True)
 
+    def _generate_ttl_index(self, indexes: Sequence):
+        """
+        Generates TTL indexes, documents are deleted once the date in the field is older than the given seconds.
+
+        Args:
+            indexes : The (field, expire after seconds) pairs of the indexes to be generated.
+        """
+        for field, expire_after_seconds in indexes:
+            self._service_from_factory.create_index(field, expireAfterSeconds=expire_after_seconds)
+
+    def _generate(self, indexes: dict):
+        """
+        Generates the declared indexes on the current service.
+
+        Args:
+            indexes : The index declarations of a schema.
+        """
+        if indexes.get('index'):
+            self._generate_index(indexes.get('index'))
+        if indexes.get('unique_index'):
+            self._generate_unique_index(indexes.get('unique_index'))
+        if indexes.get('composite_index'):
+            self._generate_composite_index(indexes.get('composite_index'))
+        if indexes.get('ttl_index'):
+            self._generate_ttl_index(indexes.get('ttl_index'))
+
+    @classmethod
+    def apply_indexes(cls, collection_name: str, collection: Collection):
+        """
+        Generates the indexes declared for a collection on another copy of it.
+
+        Args:
+            collection_name : The name of the collection.
+            collection : The collection to generate the indexes on.
+        """
+        index_service = cls()
+        index_service._service_from_factory = collection
+
+        for indexes in cls._declared_indexes.get(collection_name, []):
+            index_service._generate(indexes)
+
+        index_service._unset_service()
+
     def _unset_service(self):
         """
         Unset the service.
@@ -57,14 +104,9 @@ class MongoDBIndexService:
 
             if indexes:
                 collection_name: str = schema._collection.get_default()  # noqa
+                self._declared_indexes.setdefault(collection_name, []).append(indexes)
                 self._service_from_factory = service_from_factory.get_mongodb_service_from_collection(collection_name)
-
-                if indexes.get('index'):
-                    self._generate_index(indexes.get('index'))
-                if indexes.get('unique_index'):
-                    self._generate_unique_index(indexes.get('unique_index'))
-                if indexes.get('composite_index'):
-                    self._generate_composite_index(indexes.get('composite_index'))
+                self._generate(indexes)
 
         self._unset_service()
 
@@ -0,0 +1,112 @@
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo.collection import Collection
+
+from app.core.api.collections import DBCollectionEnum
+from app.core.schema.migration import MigrationModel
+from app.services.tm_db.service import TMMongoDBServicePool
+
+logger = logging.getLogger('uvicorn')
+
+
+def backfill_task_company_ids(pool: TMMongoDBServicePool) -> int:
+    """
+    Copy the company id of their board onto the tasks created before it was denormalized onto them.
+
+    Applied once by `run_migrations`. Tenant databases only hold tasks written since tenant
+    routing exists, which always carry their company id.
+
+    Parameters:
+    - pool (TMMongoDBServicePool): The MongoDB service pool.
+
+    Returns:
+    - int: The tasks updated.
+    """
+    tasks: Collection = pool.get_mongodb_service(DBCollectionEnum.TASKS.value)
+    boards: Collection = pool.get_mongodb_service(DBCollectionEnum.BOARDS.value)
+
+    board_ids = {task.get('board_id') for task in tasks.find({'company_id': None}, {'board_id': 1})}
+    company_ids: Dict[str, Optional[str]] = {}
+    for board_id in board_ids:
+        if not board_id:
+            continue
+        board = boards.find_one(
+            {'_id': ObjectId(board_id) if ObjectId.is_valid(board_id) else board_id}, {'company_id': 1}
+        )
+        company_ids[board_id] = board.get('company_id') if board else None
+
+    updated: int = 0
+    for board_id, company_id in company_ids.items():
+        if company_id:
+            updated += tasks.update_many(
+                {'board_id': board_id, 'company_id': None}, {'$set': {'company_id': company_id}}
+            ).modified_count
+
+    if updated:
+        logger.info(f'backfill_task_company_ids: set the company id of {updated} tasks')
+    return updated
+
+
+def backfill_change_seqs(pool: TMMongoDBServicePool) -> int:
+    """
+    Give the boards, tasks and tombstones written before delta sync paged on `change_seq` the
+    sequence 0, ordering them by `_id` ahead of every later write.
+
+    Applied once by `run_migrations`.
+
+    Parameters:
+    - pool (TMMongoDBServicePool): The MongoDB service pool.
+
+    Returns:
+    - int: The documents updated.
+    """
+    updated: int = 0
+    for collection in (DBCollectionEnum.BOARDS, DBCollectionEnum.TASKS, DBCollectionEnum.TOMBSTONES):
+        updated += pool.get_mongodb_service(collection.value).update_many(
+            {'change_seq': None}, {'$set': {'change_seq': 0}}
+        ).modified_count
+
+    if updated:
+        logger.info(f'backfill_change_seqs: set the change sequence of {updated} documents')
+    return updated
+
+
+# Applied in order, each once per deployment
+MIGRATIONS: List[Tuple[str, Callable[[TMMongoDBServicePool], int]]] = [
+    ('backfill_task_company_ids', backfill_task_company_ids),
+    ('backfill_change_seqs', backfill_change_seqs),
+]
+
+
+def run_migrations(pool: TMMongoDBServicePool) -> List[str]:
+    """
+    Apply the migrations not recorded in the `Migrations` collection yet, and record them.
+
+    The backfills scan whole collections, once recorded a start only pays a lookup by `_id`.
+    Workers starting together may each apply a pending migration, they are idempotent.
+
+    Parameters:
+    - pool (TMMongoDBServicePool): The MongoDB service pool.
+
+    Returns:
+    - List[str]: The names of the migrations applied.
+    """
+    migrations: Collection = pool.get_mongodb_service(DBCollectionEnum.MIGRATIONS.value)
+    applied = {
+        document['_id']
+        for document in migrations.find({'_id': {'$in': [name for name, _ in MIGRATIONS]}}, {'_id': 1})
+    }
+
+    names: List[str] = []
+    for name, migration in MIGRATIONS:
+        if name in applied:
+            continue
+
+        record = MigrationModel(_id=name, updated=migration(pool), date_applied=datetime.utcnow())
+        migrations.update_one({'_id': name}, {'$setOnInsert': record.model_dump(by_alias=True)}, upsert=True)
+        names.append(name)
+
+    return names
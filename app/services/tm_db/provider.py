@@ -1,7 +1,11 @@
+from typing import Any, Union
+
+from bson import ObjectId
 from pymongo.collection import Collection
 
 from app.core.api.collections import DBCollectionEnum
 from app.services.tm_db.service import TMMongoDBServicePool
+from app.services.tm_db.sharding import ShardTargetedCollection
 
 
 class TMMongoDBServiceProvider:
@@ -37,3 +41,43 @@ class TMMongoDBServiceProvider:
         - Collection: The MongoDB service for the specified collection.
         """
         return self._tm_mongo_db_service_pool.get_mongodb_service(collection)
+
+    def get_shard_targeted_collection(self, collection: str, **shard_key_values: Any) -> ShardTargetedCollection:
+        """
+        Get the MongoDB service of a collection, adding the shard key to every filter and document.
+
+        Parameters:
+        - collection (str): The collection for which the MongoDB service is needed.
+        - shard_key_values: The known shard key values, e.g. company_id and board_id for Tasks.
+
+        Returns:
+        - ShardTargetedCollection: The MongoDB service for the specified collection.
+        """
+        return ShardTargetedCollection(self.get_mongodb_service_from_collection(collection), **shard_key_values)
+
+    @staticmethod
+    def get_object_id(value: str) -> Union[ObjectId, str]:
+        """
+        Convert an id received through the API into the ObjectId it was stored with.
+
+        Parameters:
+        - value (str): The hex string representation of the id.
+
+        Returns:
+        - Union[ObjectId, str]: The ObjectId, or the value untouched if it isn't a valid ObjectId.
+        """
+        return ObjectId(value) if ObjectId.is_valid(value) else value
+
+    @staticmethod
+    def get_version_filter(expected_version: int) -> Any:
+        """
+        Get the filter matching a document at the given version, documents written before
+        versioning was introduced have no version field and count as version 0.
+
+        Parameters:
+        - expected_version (int): The version the client read.
+
+        Returns:
+        - Any: The filter value for the `version` field.
+        """
+        return {'$in': [0, None]} if expected_version == 0 else expected_version
@@ -1,39 +1,183 @@
-from typing import Dict
+import hashlib
+import re
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
-from pymongo import MongoClient
+import pymongo
+from pymongo import MongoClient, ReadPreference
+from pymongo.client_session import ClientSession
 from pymongo.collection import Collection
 from pymongo.database import Database
 
 from app.core.common.config import config
+from app.core.common.metrics import metrics_registry
+from app.services.tm_db.circuit_breaker import CircuitBreaker, build_circuit_breaker, get_circuit_breaker_scope
+from app.services.tm_db.consistency import PRIMARY, ReadPolicy, SessionBoundCollection, get_consistency_scope
+from app.services.tm_db.generate_index import MongoDBIndexService
+from app.services.tm_db.tenant import SHARED_TARGET, TenantTarget, resolve_target
 
 
 class TMMongoDBServicePool:
     """
     Pool for managing MongoDB instances for different clients.
 
+    Collections are routed per tenant (see `app.services.tm_db.tenant`), each target
+    cluster gets a single MongoClient shared by all of its collections. Within a request the
+    handles follow the read policy of the controller and run in its causally consistent
+    sessions (see `app.services.tm_db.consistency`). A circuit breaker per cluster fails
+    requests fast while the cluster is unreachable (see `app.services.tm_db.circuit_breaker`).
+
     Attributes:
-    - _service_pool (Dict[str, MongoClient]): Dictionary to store MongoClient instances for each client.
+    - _service_pool (Dict[Tuple[TenantTarget, str], Collection]): Collection handles per target and collection.
+    - _read_pool (Dict[Tuple[TenantTarget, str, ReadPolicy], Collection]): Collection handles per read policy.
+    - _clients (Dict[Optional[str], MongoClient]): MongoClient instances per cluster URI, None for the configured server.
+    - _circuit_breakers (Dict[Optional[str], CircuitBreaker]): Circuit breakers per cluster URI.
+    - _database (Optional[Database]): Database overriding the configured server, e.g. an in-process stand-in.
     """
-    _service_pool: Dict[str, Collection] = {}
+    _service_pool: Dict[Tuple[TenantTarget, str], Collection] = {}
+    _read_pool: Dict[Tuple[TenantTarget, str, ReadPolicy], Collection] = {}
+    _clients: Dict[Optional[str], MongoClient] = {}
+    _circuit_breakers: Dict[Optional[str], CircuitBreaker] = {}
+    _database: Optional[Database] = None
+
+    @classmethod
+    def use_database(cls, database: Optional[Database]) -> None:
+        """
+        Route every collection to the given database instead of the configured server.
+
+        Used by the benchmarks to run the application against an in-process stand-in,
+        tenant routing is bypassed while it is set.
+
+        Parameters:
+        - database (Optional[Database]): The database to use, None to go back to the configured server.
+        """
+        cls._database = database
+        cls._service_pool.clear()
+        cls._read_pool.clear()
+
+    @classmethod
+    def _get_mongodb_client(cls, uri: Optional[str] = None) -> MongoClient:
+        """
+        Get the MongoClient of a cluster, created once and reused for every collection on it.
+
+        Parameters:
+        - uri (Optional[str]): The URI of the cluster, None for the configured server.
+
+        Returns:
+        - MongoClient: The client of the cluster.
+        """
+        if uri not in cls._clients:
+            if uri is None:
+                _nosql_server: str = f'mongodb://{config.NOSQL_USER}:{config.NOSQL_PWD}@{config.NOSQL_URL}'
+                cls._clients[uri] = MongoClient(
+                    _nosql_server, config.NOSQL_PORT,
+                    serverSelectionTimeoutMS=config.NOSQL_SERVER_SELECTION_TIMEOUT_MS
+                )
+            else:
+                cls._clients[uri] = MongoClient(uri, serverSelectionTimeoutMS=config.NOSQL_SERVER_SELECTION_TIMEOUT_MS)
+
+        return cls._clients[uri]
+
+    @classmethod
+    def get_circuit_breaker(cls, uri: Optional[str] = None) -> CircuitBreaker:
+        """
+        Get the circuit breaker of a cluster.
+
+        Parameters:
+        - uri (Optional[str]): The URI of the cluster, None for the configured server.
+
+        Returns:
+        - CircuitBreaker: The circuit breaker of the cluster.
+        """
+        if uri not in cls._circuit_breakers:
+            cls._circuit_breakers[uri] = build_circuit_breaker(cls.get_cluster_label(uri))
+
+        return cls._circuit_breakers[uri]
 
     @staticmethod
-    def _get_mongodb_client() -> Database:
+    def get_cluster_label(uri: Optional[str] = None) -> str:
+        """
+        Get the name a cluster is reported under, in the public service metrics and in 503 responses.
+
+        URIs carry hosts and credentials, a dedicated cluster is named after a digest of its URI instead.
+
+        Parameters:
+        - uri (Optional[str]): The URI of the cluster, None for the configured server.
+
+        Returns:
+        - str: 'default' for the configured server, 'cluster-<first 8 hex digits of the SHA-256 of the URI>' otherwise.
+        """
+        if not uri:
+            return 'default'
+
+        return f"cluster-{hashlib.sha256(uri.encode('utf-8')).hexdigest()[:8]}"
+
+    @classmethod
+    def get_circuit_breaker_metrics(cls) -> Dict[str, Dict[str, object]]:
+        """
+        Get the state of the circuit breaker of every cluster.
         """
-        Get the MongoDB configuration based on the collection.
+        return {breaker.name: breaker.snapshot() for breaker in list(cls._circuit_breakers.values())}
+
+    def _get_database(self, target: TenantTarget) -> Database:
+        """
+        Get the database of a target.
 
         Parameters:
-        - collection (str): The collection for which the MongoDB configuration is needed.
+        - target (TenantTarget): The cluster and database to open.
 
         Returns:
-        - Database: The MongoDB configuration.
+        - Database: The database.
         """
-        _nosql_server: str = f'mongodb://{config.NOSQL_USER}:{config.NOSQL_PWD}@{config.NOSQL_URL}'
+        if self._database is not None:
+            return self._database
 
-        return MongoClient(_nosql_server, config.NOSQL_PORT)[config.NOSQL_DB]
+        return self._get_mongodb_client(target.uri)[target.database]
+
+    def get_change_stream_sources(self) -> List[Tuple[Union[MongoClient, Database], Optional[Mapping[str, Any]]]]:
+        """
+        Get what to watch to see the writes of every tenant.
+
+        In 'shared' mode that is the shared database. In 'database' mode tenant databases come and go,
+        so every cluster, the configured server and each one in `TENANT_URI_MAP`, is watched as a whole,
+        filtered on the shared database and the `<NOSQL_DB>_<company_code>` tenant databases.
+
+        Returns:
+        - List[Tuple[Union[MongoClient, Database], Optional[Mapping[str, Any]]]]: What to watch and the
+          `$match` on the namespace to add to the pipeline, None when no filter is needed.
+        """
+        if self._database is not None or config.TENANT_ROUTING_MODE != 'database':
+            return [(self._get_database(SHARED_TARGET), None)]
+
+        namespace_match = {'ns.db': {'$regex': f'^{re.escape(config.NOSQL_DB)}(_|$)'}}
+        uris: List[Optional[str]] = [None] + sorted(set(config.TENANT_URI_MAP.values()))
+
+        return [(self._get_mongodb_client(uri), namespace_match) for uri in uris]
+
+    def _check_reachable(self, uri: Optional[str]) -> None:
+        """
+        Fail fast when no server of a cluster is known to be up.
+
+        Within the `pymongo.timeout` of a request the driver waits for a server until the whole
+        budget is spent, rather than `NOSQL_SERVER_SELECTION_TIMEOUT_MS`. A cluster without a
+        reachable server is pinged under the selection cap instead, the nested timeout never
+        extends the request's deadline.
+
+        Parameters:
+        - uri (Optional[str]): The URI of the cluster, None for the configured server.
+
+        Raises:
+        - ServerSelectionTimeoutError: If no server answered within the cap.
+        """
+        client: MongoClient = self._get_mongodb_client(uri)
+        if client.topology_description.has_readable_server(ReadPreference.NEAREST):
+            return
+
+        with pymongo.timeout(config.NOSQL_SERVER_SELECTION_TIMEOUT_MS / 1000):
+            client.admin.command('ping', read_preference=ReadPreference.NEAREST)
 
     def get_mongodb_service(self, collection: str) -> Collection:
         """
-        Get the MongoDB instance for the specified collection.
+        Get the MongoDB instance for the specified collection, for the tenant of the current request.
 
         Parameters:
         - collection (str): The collection for which the MongoDB instance is needed.
@@ -41,7 +185,77 @@ class TMMongoDBServicePool:
         Returns:
         - Collection: The MongoDB instance for the specified collection.
         """
-        if collection not in self._service_pool:
-            self._service_pool[collection] = self._get_mongodb_client()[collection]
+        target: TenantTarget = SHARED_TARGET if self._database is not None else resolve_target(collection)
+        key: Tuple[TenantTarget, str] = (target, collection)
+
+        # Fail fast while the cluster is known to be unreachable, requests report back their outcome
+        breaker: CircuitBreaker = self.get_circuit_breaker(target.uri)
+        breaker_scope = get_circuit_breaker_scope()
+        if breaker_scope is not None:
+            breaker_scope.enter(breaker)
+        else:
+            breaker.before_call(probe=False)
+
+        if self._database is None:
+            self._check_reachable(target.uri)
+
+        if key not in self._service_pool:
+            service: Collection = self._get_database(target)[collection]
+
+            # Indexes of the shared database are created when the routers are mounted,
+            # a tenant database gets them the first time it is opened
+            if target != SHARED_TARGET:
+                MongoDBIndexService.apply_indexes(collection, service)
+
+            self._service_pool[key] = service
+
+        service: Collection = self._service_pool[key]
+        scope = get_consistency_scope()
+        if scope is None:
+            return service
+
+        if scope.read_policy != PRIMARY:
+            read_key: Tuple[TenantTarget, str, ReadPolicy] = (target, collection, scope.read_policy)
+
+            if read_key not in self._read_pool:
+                self._read_pool[read_key] = service.with_options(
+                    read_preference=scope.read_policy.get_read_preference()
+                )
+            service = self._read_pool[read_key]
+
+        # The in-process stand-in has no sessions
+        if self._database is not None:
+            return service
+
+        return SessionBoundCollection(service, scope.get_session(target.uri, service.database.client))
+
+    def get_transaction_session(self, collections: Sequence[str]) -> Optional[ClientSession]:
+        """
+        Get the session of the current request able to write to the given collections in one transaction.
+
+        Transactions need a replica set or a sharded cluster, and the collections must all live on
+        the same cluster, e.g. not when the tenant has its own cluster in `TENANT_URI_MAP`.
+
+        Parameters:
+        - collections (Sequence[str]): The collections written to.
+
+        Returns:
+        - Optional[ClientSession]: The session, None outside a request or when no transaction is possible.
+        """
+        scope = get_consistency_scope()
+        if scope is None or self._database is not None:
+            return None
+
+        uris = {resolve_target(collection).uri for collection in collections}
+        if len(uris) != 1:
+            return None
+
+        uri: Optional[str] = uris.pop()
+        client: MongoClient = self._get_mongodb_client(uri)
+        if client.topology_description.topology_type_name not in ('ReplicaSetWithPrimary', 'Sharded'):
+            return None
+
+        return scope.get_session(uri, client)
+
 
-        return self._service_pool[collection]
+metrics_registry.register('circuit_breakers', TMMongoDBServicePool.get_circuit_breaker_metrics)
@@ -0,0 +1,120 @@
+import logging
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+from pymongo.collection import Collection
+
+from app.core.api.collections import DBCollectionEnum
+from app.core.api.exceptions import ScatterGatherQueryException
+from app.core.common.config import config
+
+logger = logging.getLogger('uvicorn')
+
+# Shard key of each sharded collection, most significant field first. Keep in sync with
+# docker/sharded/init-sharding.js, a shard key can't be changed once a collection is sharded.
+SHARD_KEYS: Mapping[str, Tuple[str, ...]] = {
+    DBCollectionEnum.BOARDS.value: ('company_id',),
+    DBCollectionEnum.TASKS.value: ('company_id', 'board_id'),
+}
+
+
+def _is_targeted(value: Any) -> bool:
+    """
+    Check a filter value pins the shard key field to a known set of values.
+    """
+    if isinstance(value, Mapping):
+        return '$eq' in value or '$in' in value
+    return True
+
+
+class ShardTargetedCollection:
+    """
+    A collection adding the shard key to every filter and document, so each query is
+    routed by mongos to the shards owning the key instead of being broadcast to all of them.
+
+    Documents are always stamped with the known shard key values. Filters only get them with
+    `SHARDING_ENABLED`, so an unsharded deployment matches documents written before the shard
+    key fields were denormalized onto them; callers keep filtering on the fields they mean.
+    Queries whose filter doesn't pin the leading shard key field are scatter-gather queries,
+    reported according to `SHARD_QUERY_CHECK` ('off', 'warn' or 'raise').
+
+    Attributes:
+        _collection (Collection): The underlying collection.
+        _shard_key (Tuple[str, ...]): The shard key fields of the collection, empty if it isn't sharded.
+        _shard_key_values (Dict[str, Any]): The known shard key values merged into filters and documents.
+    """
+
+    def __init__(self, collection: Collection, **shard_key_values: Any):
+        self._collection = collection
+        self._shard_key = SHARD_KEYS.get(collection.name, ())
+        self._shard_key_values = {
+            field: value
+            for field, value in shard_key_values.items()
+            if field in self._shard_key and value is not None
+        }
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._collection, name)
+
+    def _report(self, operation: str, message: str) -> None:
+        if config.SHARD_QUERY_CHECK == 'raise':
+            raise ScatterGatherQueryException(f'{self._collection.name}.{operation}: {message}')
+        if config.SHARD_QUERY_CHECK == 'warn':
+            logger.warning(f'Scatter-gather query on {self._collection.name}.{operation}: {message}')
+
+    def _target(self, operation: str, query: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+        """
+        Add the known shard key values to a filter and check the leading field is pinned.
+        """
+        if not config.SHARDING_ENABLED:
+            return dict(query or {})
+
+        targeted: Dict[str, Any] = {**self._shard_key_values, **(query or {})}
+
+        if self._shard_key and not _is_targeted(targeted.get(self._shard_key[0], {})):
+            self._report(operation, f'filter {sorted(targeted)} misses shard key field {self._shard_key[0]!r}')
+
+        return targeted
+
+    def _stamp(self, operation: str, document: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Add the known shard key values to a document and check it holds the whole shard key.
+        """
+        stamped: Dict[str, Any] = {**self._shard_key_values, **document}
+        missing: Sequence[str] = [field for field in self._shard_key if stamped.get(field) is None]
+
+        if missing:
+            self._report(operation, f'document misses shard key fields {missing}')
+
+        return stamped
+
+    def find(self, filter: Optional[Mapping[str, Any]] = None, *args, **kwargs):
+        return self._collection.find(self._target('find', filter), *args, **kwargs)
+
+    def find_one(self, filter: Optional[Mapping[str, Any]] = None, *args, **kwargs):
+        return self._collection.find_one(self._target('find_one', filter), *args, **kwargs)
+
+    def find_one_and_update(self, filter: Mapping[str, Any], update, *args, **kwargs):
+        return self._collection.find_one_and_update(self._target('find_one_and_update', filter), update, *args, **kwargs)
+
+    def update_one(self, filter: Mapping[str, Any], update, *args, **kwargs):
+        return self._collection.update_one(self._target('update_one', filter), update, *args, **kwargs)
+
+    def update_many(self, filter: Mapping[str, Any], update, *args, **kwargs):
+        return self._collection.update_many(self._target('update_many', filter), update, *args, **kwargs)
+
+    def delete_one(self, filter: Mapping[str, Any], *args, **kwargs):
+        return self._collection.delete_one(self._target('delete_one', filter), *args, **kwargs)
+
+    def delete_many(self, filter: Mapping[str, Any], *args, **kwargs):
+        return self._collection.delete_many(self._target('delete_many', filter), *args, **kwargs)
+
+    def count_documents(self, filter: Mapping[str, Any], *args, **kwargs) -> int:
+        return self._collection.count_documents(self._target('count_documents', filter), *args, **kwargs)
+
+    def insert_one(self, document: Mapping[str, Any], *args, **kwargs):
+        return self._collection.insert_one(self._stamp('insert_one', document), *args, **kwargs)
+
+    def insert_many(self, documents: Sequence[Mapping[str, Any]], *args, **kwargs):
+        return self._collection.insert_many(
+            [self._stamp('insert_many', document) for document in documents], *args, **kwargs
+        )
@@ -0,0 +1,92 @@
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, NamedTuple, Optional
+
+from app.core.api.collections import DBCollectionEnum
+from app.core.common.config import config
+
+# Collections holding tenant data, routed per company_code. Users, credentials and the
+# company directory stay on the shared database, they are read before the tenant is known.
+TENANT_COLLECTIONS = frozenset({
+    DBCollectionEnum.BOARDS.value,
+    DBCollectionEnum.TASKS.value,
+    DBCollectionEnum.COMPANY_VERSIONS.value,
+    DBCollectionEnum.TOMBSTONES.value,
+})
+
+_COMPANY_CODE_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,32}$')
+
+_current_company_code: ContextVar[Optional[str]] = ContextVar('tm_company_code', default=None)
+
+
+class TenantTarget(NamedTuple):
+    """
+    Where the collections of a tenant live.
+
+    Attributes:
+        uri (Optional[str]): The URI of the tenant's cluster, None for the configured server.
+        database (str): The name of the database.
+    """
+    uri: Optional[str]
+    database: str
+
+
+SHARED_TARGET = TenantTarget(uri=None, database=config.NOSQL_DB)
+
+
+def get_company_code() -> Optional[str]:
+    """
+    Get the company_code of the request being processed, None outside a tenant scope.
+    """
+    return _current_company_code.get()
+
+
+@contextmanager
+def tenant_scope(company_code: Optional[str]) -> Iterator[None]:
+    """
+    Route the collections opened within the block to the given tenant.
+
+    Parameters:
+    - company_code (Optional[str]): The tenant, None for the shared database.
+    """
+    token = _current_company_code.set(company_code or None)
+    try:
+        yield
+    finally:
+        _current_company_code.reset(token)
+
+
+def is_valid_company_code(company_code: str) -> bool:
+    """
+    Check a company_code can safely be part of a database name.
+    """
+    return bool(_COMPANY_CODE_PATTERN.match(company_code))
+
+
+def resolve_target(collection: str, company_code: Optional[str] = None) -> TenantTarget:
+    """
+    Resolve where a collection lives for a tenant, according to `TENANT_ROUTING_MODE`.
+
+    - `shared`: every tenant shares the configured database.
+    - `database`: tenant collections live in a `<NOSQL_DB>_<company_code>` database, on the
+      cluster from `TENANT_URI_MAP` when the tenant has one, on the configured server otherwise.
+
+    Parameters:
+    - collection (str): The collection to open.
+    - company_code (Optional[str]): The tenant, defaults to the one of the current scope.
+
+    Returns:
+    - TenantTarget: The cluster and database holding the collection.
+    """
+    company_code = company_code or get_company_code()
+
+    if (config.TENANT_ROUTING_MODE != 'database'
+            or not company_code
+            or collection not in TENANT_COLLECTIONS):
+        return SHARED_TARGET
+
+    return TenantTarget(
+        uri=config.TENANT_URI_MAP.get(company_code),
+        database=f'{config.NOSQL_DB}_{company_code}'
+    )
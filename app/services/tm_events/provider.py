@@ -0,0 +1,34 @@
+from app.core.common.event_models import CompanyEvent
+from app.services.tm_events.service import TMEventBroker
+
+
+class TMEventBrokerProvider:
+    """
+    A class that provides the company event broker.
+
+    The broker is shared by every provider instance, so delegates and the
+    streaming endpoint publish to and read from the same subscribers.
+    """
+    _event_broker: TMEventBroker = None
+
+    def get_event_broker(self) -> TMEventBroker:
+        """
+        Lazy-loads the shared event broker.
+        """
+        if not TMEventBrokerProvider._event_broker:
+            TMEventBrokerProvider._event_broker = TMEventBroker()
+        return TMEventBrokerProvider._event_broker
+
+    def set_event_broker(self, broker: TMEventBroker):
+        """
+        Setter method to the shared event broker.
+        """
+        TMEventBrokerProvider._event_broker = broker
+
+    def publish_event(self, event: CompanyEvent) -> None:
+        """
+        Publish an event, unless the change stream is the producer of events.
+        """
+        broker = self.get_event_broker()
+        if not broker.uses_change_stream:
+            broker.publish(event)
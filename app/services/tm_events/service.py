@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, List, Set, Optional, Mapping, Any, Tuple, Union
+
+from pymongo import MongoClient
+from pymongo.database import Database
+from pymongo.errors import PyMongoError
+
+from app.core.api.collections import DBCollectionEnum
+from app.core.common.config import config
+from app.core.common.event_models import CompanyEvent, EventTypeOptions
+from app.services.tm_db.service import TMMongoDBServicePool
+from app.services.tm_db.tenant import resolve_target
+
+logger = logging.getLogger('uvicorn')
+
+
+class CompanyEventSubscription:
+    """
+    A subscriber to the events of one company, bound to the event loop serving its connection.
+
+    Events are buffered in a bounded queue. When a slow consumer lets the buffer fill up,
+    the backlog is dropped and replaced by a single RESYNC event, so memory per connection
+    stays bounded and the client knows to catch up through fetch_changes_since.
+    """
+
+    def __init__(self, company_id: str, database: str, loop: asyncio.AbstractEventLoop, buffer_size: int):
+        self.company_id = company_id
+        self.database = database
+        self.dropped_events: int = 0
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+
+    def offer(self, event: CompanyEvent) -> None:
+        """
+        Hand an event over to the subscriber, safe to call from any thread.
+        """
+        self._loop.call_soon_threadsafe(self._enqueue, event)
+
+    def _enqueue(self, event: CompanyEvent) -> None:
+        """
+        Buffer an event, runs on the event loop of the subscriber.
+        """
+        if self._queue.full():
+            self.dropped_events += self._queue.qsize()
+
+            while not self._queue.empty():
+                self._queue.get_nowait()
+
+            event = CompanyEvent(event_type=EventTypeOptions.RESYNC, company_id=self.company_id)
+
+        self._queue.put_nowait(event)
+
+    async def get(self, timeout: float) -> Optional[CompanyEvent]:
+        """
+        Wait for the next event.
+
+        Parameters:
+        - timeout (float): Seconds to wait before giving up.
+
+        Returns:
+        - Optional[CompanyEvent]: The next event, None if none arrived within the timeout.
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class TMEventBroker:
+    """
+    In-process fan-out of company events to subscribed connections.
+
+    Events are produced by the delegates of the write controllers, or by a MongoDB change
+    stream when `EVENTS_SOURCE` is 'change_stream'. Delegate events only reach subscribers
+    connected to the same worker; deployments running several workers should use the
+    change stream, which every worker tails on its own.
+
+    Subscriptions are keyed by the database the company's boards and tasks are routed to, see
+    `resolve_target`, so a subscriber only gets the events written in its own tenant's database.
+    """
+    _change_stream_collections = (
+        DBCollectionEnum.BOARDS.value,
+        DBCollectionEnum.TASKS.value,
+        DBCollectionEnum.TOMBSTONES.value
+    )
+
+    def __init__(self):
+        self._subscriptions: Dict[Tuple[str, str], Set[CompanyEventSubscription]] = {}
+        self._lock = threading.Lock()
+        self._change_stream_threads: List[threading.Thread] = []
+
+    @property
+    def uses_change_stream(self) -> bool:
+        return config.EVENTS_SOURCE == 'change_stream'
+
+    def subscribe(self, company_id: str, loop: asyncio.AbstractEventLoop) -> CompanyEventSubscription:
+        """
+        Subscribe to the events of a company, in the tenant of the current scope.
+
+        Parameters:
+        - company_id (str): The id of the company.
+        - loop (asyncio.AbstractEventLoop): The event loop serving the connection.
+
+        Returns:
+        - CompanyEventSubscription: The subscription to read events from.
+        """
+        database: str = resolve_target(DBCollectionEnum.BOARDS.value).database
+        subscription = CompanyEventSubscription(company_id, database, loop, config.EVENTS_BUFFER_SIZE)
+
+        with self._lock:
+            self._subscriptions.setdefault((database, company_id), set()).add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: CompanyEventSubscription) -> None:
+        """
+        Remove a subscription, e.g. once its connection closed.
+        """
+        with self._lock:
+            key: Tuple[str, str] = (subscription.database, subscription.company_id)
+            subscriptions = self._subscriptions.get(key, set())
+            subscriptions.discard(subscription)
+
+            if not subscriptions:
+                self._subscriptions.pop(key, None)
+
+    def publish(self, event: CompanyEvent, database: Optional[str] = None) -> None:
+        """
+        Fan an event out to the subscribers of its company, safe to call from any thread.
+
+        Parameters:
+        - event (CompanyEvent): The event.
+        - database (Optional[str]): The database the change was written in, the one of the current
+          tenant scope when None.
+        """
+        database = database or resolve_target(DBCollectionEnum.BOARDS.value).database
+
+        with self._lock:
+            subscriptions = list(self._subscriptions.get((database, event.company_id), ()))
+
+        for subscription in subscriptions:
+            try:
+                subscription.offer(event)
+            except RuntimeError:
+                # The event loop of the connection is gone
+                self.unsubscribe(subscription)
+
+    @staticmethod
+    def _to_payload(document: Mapping[str, Any]) -> Mapping[str, Any]:
+        payload = {key: value for key, value in document.items() if key != '_id'}
+        payload['id'] = str(document.get('_id'))
+        return payload
+
+    def _to_event(self, change: Mapping[str, Any]) -> Optional[CompanyEvent]:
+        """
+        Map a change stream document to a company event.
+        """
+        collection: str = change.get('ns', {}).get('coll')
+        document: Optional[Mapping[str, Any]] = change.get('fullDocument')
+
+        if not document or not document.get('company_id'):
+            return None
+
+        if collection == DBCollectionEnum.TOMBSTONES.value:
+            return CompanyEvent(
+                event_type=EventTypeOptions.ENTITY_DELETED,
+                company_id=document.get('company_id'),
+                entity_id=document.get('entity_id'),
+                payload=self._to_payload(document)
+            )
+
+        created: bool = change.get('operationType') == 'insert'
+        if collection == DBCollectionEnum.BOARDS.value:
+            event_type = EventTypeOptions.BOARD_CREATED if created else EventTypeOptions.BOARD_UPDATED
+        else:
+            event_type = EventTypeOptions.TASK_CREATED if created else EventTypeOptions.TASK_UPDATED
+
+        return CompanyEvent(
+            event_type=event_type,
+            company_id=document.get('company_id'),
+            entity_id=str(document.get('_id')),
+            payload=self._to_payload(document)
+        )
+
+    def _tail_change_stream(self, source: Union[MongoClient, Database],
+                            namespace_match: Optional[Mapping[str, Any]]) -> None:
+        """
+        Tail the change stream of the board, task and tombstone collections, resuming after errors.
+
+        Parameters:
+        - source (Union[MongoClient, Database]): The database, or the whole cluster, to watch.
+        - namespace_match (Optional[Mapping[str, Any]]): Filter on the databases of the cluster, None for a database.
+        """
+        match: Dict[str, Any] = {
+            'ns.coll': {'$in': list(self._change_stream_collections)},
+            'operationType': {'$in': ['insert', 'update', 'replace']}
+        }
+        if namespace_match:
+            match.update(namespace_match)
+
+        pipeline = [{'$match': match}]
+        resume_token = None
+
+        while True:
+            try:
+                with source.watch(pipeline, full_document='updateLookup', resume_after=resume_token) as stream:
+                    for change in stream:
+                        resume_token = stream.resume_token
+                        event = self._to_event(change)
+
+                        if event:
+                            self.publish(event, change.get('ns', {}).get('db'))
+
+            except PyMongoError as e:
+                logger.warning(f'TMEventBroker change stream interrupted, resuming: {str(e)}')
+                time.sleep(1)
+
+    def start_change_stream(self, pool: TMMongoDBServicePool) -> None:
+        """
+        Start tailing the change streams in daemon threads, once.
+
+        One thread per source from `TMMongoDBServicePool.get_change_stream_sources`: the shared
+        database, or with `TENANT_ROUTING_MODE=database` every cluster holding tenant databases.
+        Change streams need a replica set or sharded cluster.
+
+        Parameters:
+        - pool (TMMongoDBServicePool): The pool to get the sources from.
+        """
+        if self._change_stream_threads:
+            return
+
+        for index, (source, namespace_match) in enumerate(pool.get_change_stream_sources()):
+            thread = threading.Thread(
+                target=self._tail_change_stream,
+                args=(source, namespace_match),
+                name=f'tm-events-change-stream-{index}',
+                daemon=True
+            )
+            self._change_stream_threads.append(thread)
+            thread.start()
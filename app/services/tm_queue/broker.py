@@ -0,0 +1,234 @@
+import sqlite3
+import threading
+import time
+from typing import Dict, List, NamedTuple, Sequence
+
+from app.core.api.exceptions import QueueUnavailableException
+from app.core.common.config import config
+
+READY: str = 'ready'
+UNACKED: str = 'unacked'
+DEAD: str = 'dead'
+
+
+class QueueDelivery(NamedTuple):
+    """
+    A message delivered to a consumer, to be acked or nacked by it.
+
+    Attributes:
+        delivery_tag (int): The id of the message in the broker.
+        queue (str): The queue the message was published to.
+        body (str): The message, as published.
+        consumer (str): The consumer the message is delivered to.
+        attempts (int): The deliveries of the message so far, this one included.
+    """
+    delivery_tag: int
+    queue: str
+    body: str
+    consumer: str
+    attempts: int
+
+
+class QueueBroker:
+    """
+    A message broker, the primitives `TicketManagementQueueService` and `QueueWorker` build on.
+
+    Delivery is at least once: a message stays with its consumer until acked, and is delivered
+    again once nacked or once its consumer held it longer than the visibility timeout. A message
+    delivered `QUEUE_MAX_ATTEMPTS` times without an ack is dead-lettered.
+    """
+
+    def publish(self, queue: str, bodies: Sequence[str]) -> None:
+        """
+        Publish messages, returning once the broker confirmed it stored all of them.
+
+        Raises:
+        - QueueUnavailableException: If the broker didn't confirm the messages.
+        """
+        raise NotImplementedError
+
+    def consume(self, queues: Sequence[str], consumer: str, prefetch: int, timeout: float) -> List[QueueDelivery]:
+        """
+        Get the next messages of some queues, oldest first, so that the consumer holds at most
+        `prefetch` unacked messages.
+
+        Parameters:
+        - queues (Sequence[str]): The queues to consume from.
+        - consumer (str): The name of the consumer.
+        - prefetch (int): The unacked messages the consumer may hold at once.
+        - timeout (float): How long to wait for a message when the queues are empty.
+
+        Returns:
+        - List[QueueDelivery]: The messages delivered, empty if none arrived within the timeout.
+        """
+        raise NotImplementedError
+
+    def ack(self, delivery: QueueDelivery) -> None:
+        """
+        Acknowledge a message was processed, it is removed from the queue.
+        """
+        raise NotImplementedError
+
+    def nack(self, delivery: QueueDelivery, requeue: bool = True) -> None:
+        """
+        Reject a message, it is delivered again after a backoff unless it is out of attempts or not requeued.
+        """
+        raise NotImplementedError
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the messages of each queue per state.
+        """
+        raise NotImplementedError
+
+
+class SQLiteQueueBroker(QueueBroker):
+    """
+    A broker storing its queues in a SQLite database, for local runs and tests.
+
+    With a file path the queues are shared by every process on the host, e.g. the API and its
+    workers, and survive restarts. With ':memory:' they live in the process. A message is
+    confirmed once the transaction inserting it committed.
+
+    Attributes:
+        path (str): The path of the database file, or ':memory:'.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._published = threading.Condition(self._lock)
+
+        with self._lock:
+            if path != ':memory:':
+                self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS messages ('
+                ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+                ' queue TEXT NOT NULL,'
+                ' body TEXT NOT NULL,'
+                ' state TEXT NOT NULL,'
+                ' consumer TEXT,'
+                ' attempts INTEGER NOT NULL DEFAULT 0,'
+                ' visible_at REAL NOT NULL,'
+                ' published_at REAL NOT NULL'
+                ')'
+            )
+            self._connection.execute('CREATE INDEX IF NOT EXISTS messages_visible ON messages (queue, state, visible_at)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS messages_consumer ON messages (consumer, state)')
+
+    def _transaction(self, statements) -> object:
+        """
+        Run a function in an immediate transaction, called with the lock held.
+        """
+        self._connection.execute('BEGIN IMMEDIATE')
+        try:
+            result = statements(self._connection)
+        except BaseException:
+            self._connection.execute('ROLLBACK')
+            raise
+        self._connection.execute('COMMIT')
+        return result
+
+    def publish(self, queue: str, bodies: Sequence[str]) -> None:
+        if not bodies:
+            return
+
+        now: float = time.time()
+        rows = [(queue, body, READY, now, now) for body in bodies]
+
+        try:
+            with self._lock:
+                self._transaction(lambda connection: connection.executemany(
+                    'INSERT INTO messages (queue, body, state, visible_at, published_at) VALUES (?, ?, ?, ?, ?)', rows
+                ))
+                self._published.notify_all()
+        except sqlite3.Error as e:
+            raise QueueUnavailableException(
+                f'Publishing to {queue} was not confirmed: {str(e)}', retry_after=config.QUEUE_RETRY_AFTER_SECONDS
+            ) from e
+
+    def _deliver(
+            self, connection: sqlite3.Connection, queues: Sequence[str], consumer: str, prefetch: int
+    ) -> List[QueueDelivery]:
+        now: float = time.time()
+        in_queues: str = ', '.join('?' * len(queues))
+
+        # Messages whose consumer held them past the visibility timeout too often are given up on
+        connection.execute(
+            f'UPDATE messages SET state = ?, consumer = NULL'
+            f' WHERE queue IN ({in_queues}) AND state = ? AND visible_at <= ? AND attempts >= ?',
+            (DEAD, *queues, UNACKED, now, config.QUEUE_MAX_ATTEMPTS)
+        )
+
+        held: int = connection.execute(
+            'SELECT COUNT(*) FROM messages WHERE consumer = ? AND state = ? AND visible_at > ?',
+            (consumer, UNACKED, now)
+        ).fetchone()[0]
+        if held >= prefetch:
+            return []
+
+        rows = connection.execute(
+            f'SELECT id, queue, body, attempts FROM messages'
+            f' WHERE queue IN ({in_queues}) AND state IN (?, ?) AND visible_at <= ? ORDER BY id LIMIT ?',
+            (*queues, READY, UNACKED, now, prefetch - held)
+        ).fetchall()
+        if not rows:
+            return []
+
+        connection.executemany(
+            'UPDATE messages SET state = ?, consumer = ?, attempts = attempts + 1, visible_at = ? WHERE id = ?',
+            [(UNACKED, consumer, now + config.QUEUE_VISIBILITY_TIMEOUT_SECONDS, row[0]) for row in rows]
+        )
+        return [QueueDelivery(row[0], row[1], row[2], consumer, row[3] + 1) for row in rows]
+
+    def consume(self, queues: Sequence[str], consumer: str, prefetch: int, timeout: float) -> List[QueueDelivery]:
+        deadline: float = time.monotonic() + timeout
+
+        with self._lock:
+            while True:
+                deliveries = self._transaction(lambda connection: self._deliver(connection, queues, consumer, prefetch))
+                remaining: float = deadline - time.monotonic()
+                if deliveries or remaining <= 0:
+                    return deliveries
+
+                # Publishes of this process wake the consumer up, those of other processes are polled
+                self._published.wait(min(remaining, config.QUEUE_POLL_SECONDS))
+
+    def ack(self, delivery: QueueDelivery) -> None:
+        with self._lock:
+            self._connection.execute(
+                'DELETE FROM messages WHERE id = ? AND consumer = ?', (delivery.delivery_tag, delivery.consumer)
+            )
+
+    def nack(self, delivery: QueueDelivery, requeue: bool = True) -> None:
+        dead: bool = not requeue or delivery.attempts >= config.QUEUE_MAX_ATTEMPTS
+        backoff: float = config.QUEUE_RETRY_DELAY_SECONDS * 2 ** (delivery.attempts - 1)
+
+        with self._lock:
+            self._connection.execute(
+                'UPDATE messages SET state = ?, consumer = NULL, visible_at = ? WHERE id = ? AND consumer = ?',
+                (DEAD if dead else READY, time.time() + backoff, delivery.delivery_tag, delivery.consumer)
+            )
+            if not dead:
+                self._published.notify_all()
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            rows = self._connection.execute('SELECT queue, state, COUNT(*) FROM messages GROUP BY queue, state').fetchall()
+
+        queues: Dict[str, Dict[str, int]] = {}
+        for queue, state, count in rows:
+            queues.setdefault(queue, {READY: 0, UNACKED: 0, DEAD: 0})[state] = count
+        return queues
+
+
+def build_broker() -> QueueBroker:
+    """
+    Build the broker set by `QUEUE_BROKER`.
+    """
+    if config.QUEUE_BROKER == 'sqlite':
+        return SQLiteQueueBroker(config.QUEUE_SQLITE_PATH)
+
+    raise ValueError(f'Unknown QUEUE_BROKER {config.QUEUE_BROKER!r}')
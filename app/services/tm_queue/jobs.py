@@ -0,0 +1,137 @@
+import json
+import logging
+import smtplib
+import urllib.request
+from email.message import EmailMessage
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional
+
+from app.core.common.config import config
+
+logger = logging.getLogger('uvicorn')
+
+EMAILS_QUEUE: str = 'emails'
+LOGS_QUEUE: str = 'logs'
+EVENTS_QUEUE: str = 'events'
+DEFERRED_QUEUE: str = 'deferred'
+
+
+class QueueJob(NamedTuple):
+    """
+    A kind of job the workers run.
+
+    Attributes:
+        name (str): The name of the job, as published in `QueueMessageModel.job`.
+        queue (str): The queue the job is published to.
+        handler (Callable[[Mapping[str, Any]], None]): Runs the job with its payload, raises to retry it.
+    """
+    name: str
+    queue: str
+    handler: Callable[[Mapping[str, Any]], None]
+
+
+class JobRegistry:
+    """
+    Registry of the jobs, shared by the publishers, which look up the queue of a job, and the workers.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[str, QueueJob] = {}
+
+    def register(self, name: str, queue: str) -> Callable:
+        """
+        Register the decorated function as the handler of a job.
+
+        Parameters:
+        - name (str): The name of the job.
+        - queue (str): The queue the job is published to.
+        """
+        def decorator(handler: Callable[[Mapping[str, Any]], None]) -> Callable[[Mapping[str, Any]], None]:
+            self._jobs[name] = QueueJob(name, queue, handler)
+            return handler
+
+        return decorator
+
+    def get(self, name: str) -> Optional[QueueJob]:
+        return self._jobs.get(name)
+
+    def get_queues(self) -> List[str]:
+        return sorted({job.queue for job in self._jobs.values()})
+
+
+job_registry: JobRegistry = JobRegistry()
+
+
+@job_registry.register('send_email', EMAILS_QUEUE)
+def send_email(payload: Mapping[str, Any]) -> None:
+    """
+    Send an email through `SMTP_HOST`, or log it when no server is set.
+
+    The API doesn't publish it yet, it is there for operators and integrations to enqueue.
+
+    Payload:
+    - to (str): The recipient.
+    - subject (str): The subject.
+    - body (str): The plain text body.
+    """
+    message = EmailMessage()
+    message['From'] = config.SMTP_SENDER
+    message['To'] = payload['to']
+    message['Subject'] = payload['subject']
+    message.set_content(payload['body'])
+
+    if not config.SMTP_HOST:
+        logger.info(f'send_email: no SMTP_HOST set, not sending to {payload["to"]}: {payload["subject"]}')
+        return
+
+    with smtplib.SMTP(config.SMTP_HOST, config.SMTP_PORT, timeout=30) as smtp:
+        smtp.send_message(message)
+
+
+@job_registry.register('collect_log', LOGS_QUEUE)
+def collect_log(payload: Mapping[str, Any]) -> None:
+    """
+    Collect a process log, see `SentryLog`, into the log of the worker.
+    """
+    level: int = logging.ERROR if str(payload.get('log_type')).upper() == 'ERROR' else logging.INFO
+    logger.log(level, f'{payload.get("process_name")}: {json.dumps(payload, default=str)}')
+
+
+@job_registry.register('company_event', EVENTS_QUEUE)
+def company_event(payload: Mapping[str, Any]) -> None:
+    """
+    Deliver a change event relayed from the outbox, see `CompanyEvent`, as a JSON POST to
+    `EVENTS_WEBHOOK_URL`, or log it when no endpoint is set.
+
+    Events are delivered at least once, and not always in order when a relay failed mid-batch:
+    consumers skip the events of an entity older than the version they already processed.
+    An error status or an unreachable endpoint raises, so the queue retries the event.
+    """
+    summary: str = f'{payload.get("event_type")} of {payload.get("company_id")}: {payload.get("entity_id")}'
+
+    if not config.EVENTS_WEBHOOK_URL:
+        logger.info(f'company_event: no EVENTS_WEBHOOK_URL set, not delivering {summary}')
+        return
+
+    request = urllib.request.Request(
+        config.EVENTS_WEBHOOK_URL,
+        data=json.dumps(payload, default=str).encode('utf-8'),
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+    # urlopen raises on 4xx and 5xx answers
+    with urllib.request.urlopen(request, timeout=30):
+        logger.info(f'company_event: delivered {summary}')
+
+
+@job_registry.register('run_deferred_request', DEFERRED_QUEUE)
+def run_deferred_request(payload: Mapping[str, Any]) -> None:
+    """
+    Process a request its controller deferred, see `BaseAPIController.execution_mode`.
+
+    Payload:
+    - job_id (str): The id of the job holding the request.
+    """
+    # The controllers publish this job, they are only imported once it runs
+    from app.services.deferred.runner import run_deferred_request as run
+
+    run(payload['job_id'])
@@ -1,58 +1,40 @@
-import json
-from typing import TypeVar
+from typing import Dict
 
-from pydantic import BaseModel
-
-
-IT = TypeVar('IT', bound=BaseModel)
+from app.core.common.metrics import metrics_registry
+from app.services.tm_queue.broker import build_broker
+from app.services.tm_queue.service import TicketManagementQueueService
 
 
 class TMQueuePublisher:
+    """
+    A class that provides the ticket management queue.
 
-    @staticmethod
-    def _get_tm_queue_config(self):
-        """
-        Get the ticket management queue configuration
-        """
-        pass
+    The publisher is shared by every provider instance, so the whole process publishes
+    through a single broker connection.
+    """
+    _tm_publisher: TicketManagementQueueService = None
 
-    def get_tm_publisher(self):
+    def get_tm_publisher(self) -> TicketManagementQueueService:
         """
-        Lazy-loads the ticket management publisher
+        Lazy-loads the ticket management publisher, on the broker set by `QUEUE_BROKER`.
         """
-        pass
+        if not TMQueuePublisher._tm_publisher:
+            TMQueuePublisher._tm_publisher = TicketManagementQueueService(build_broker())
+        return TMQueuePublisher._tm_publisher
 
-    def set_tm_publisher(self, publisher):
+    def set_tm_publisher(self, publisher: TicketManagementQueueService):
         """
         Setter method to the ticket management publisher
         """
-        pass
-
+        TMQueuePublisher._tm_publisher = publisher
 
-class SentryQueueService(TMQueuePublisher):
-    """
-    A class that provides the sentry queue service
-    """
-
-    def _send_with_retries(self, message: str, retries: int = 5):
-        """
-        Send a log to the sentry service with retries
-        """
-        try:
-            # Make sure the publisher is connected
-            # self.get_tm_publisher().send(message)
-            pass
-        except Exception as e:
-            if retries > 0:
-                # Reconnect the publisher before retrying
-                # self.get_tm_publisher().reconnect()
-                self._send_with_retries(message, retries - 1)
-            else:
-                raise e
-
-    def send_log(self, sentry_log: IT):
+    @staticmethod
+    def get_queue_metrics() -> Dict[str, Dict[str, int]]:
         """
-        Publish a log to the tm queue service
+        Get the depth of every queue, once the publisher is in use.
         """
-        json_string = json.dumps(sentry_log.model_dump(mode='json'))
-        self._send_with_retries(json_string)
+        publisher = TMQueuePublisher._tm_publisher
+        return publisher.broker.snapshot() if publisher else {}
+
+
+metrics_registry.register('queues', TMQueuePublisher.get_queue_metrics)
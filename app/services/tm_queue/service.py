@@ -1,6 +1,71 @@
+import logging
+import time
+from typing import Any, Mapping, Sequence
+
+from app.core.api.exceptions import QueueUnavailableException
+from app.core.common.config import config
+from app.core.common.queue_model import QueueMessageModel
+from app.services.tm_queue.broker import QueueBroker
+from app.services.tm_queue.jobs import job_registry
+
+logger = logging.getLogger('uvicorn')
+
+
 class TicketManagementQueueService:
     """
     Service class to interact
     with the Ticket Management Queue.
+
+    Jobs are published to the queue registered for them in `job_registry` and run by the
+    workers (`python -m app.services.tm_queue.worker`), slow side effects such as sending
+    emails stay off the request path. A publish returns once the broker confirmed it stored
+    the messages, it is retried `QUEUE_PUBLISH_RETRIES` times before failing.
+
+    Attributes:
+        broker (QueueBroker): The broker the messages are published to.
     """
 
+    def __init__(self, broker: QueueBroker):
+        self.broker = broker
+
+    def publish(self, queue: str, messages: Sequence[QueueMessageModel]) -> None:
+        """
+        Publish messages to a queue, all of them or none.
+
+        Parameters:
+        - queue (str): The queue to publish to.
+        - messages (Sequence[QueueMessageModel]): The messages to publish.
+
+        Raises:
+        - QueueUnavailableException: If the broker didn't confirm the messages.
+        """
+        bodies = [message.model_dump_json() for message in messages]
+
+        for attempt in range(config.QUEUE_PUBLISH_RETRIES):
+            try:
+                self.broker.publish(queue, bodies)
+                return
+            except QueueUnavailableException as e:
+                if attempt == config.QUEUE_PUBLISH_RETRIES - 1:
+                    raise
+                logger.warning(f'TicketManagementQueueService publish to {queue} failed, retrying: {str(e)}')
+                time.sleep(0.1 * 2 ** attempt)
+
+    def publish_job(self, job: str, payload: Mapping[str, Any]) -> str:
+        """
+        Publish a job to its queue.
+
+        Parameters:
+        - job (str): The name of the job.
+        - payload (Mapping[str, Any]): The arguments of the job, JSON serializable.
+
+        Returns:
+        - str: The id of the message.
+        """
+        queue_job = job_registry.get(job)
+        if queue_job is None:
+            raise ValueError(f'Unknown job {job!r}')
+
+        message = QueueMessageModel(job=job, payload=dict(payload))
+        self.publish(queue_job.queue, [message])
+        return message.message_id
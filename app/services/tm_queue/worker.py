@@ -0,0 +1,169 @@
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+from pydantic import ValidationError
+
+from app.core.common.config import config
+from app.core.common.queue_model import QueueMessageModel
+from app.services.tm_queue.broker import QueueBroker, QueueDelivery, build_broker
+from app.services.tm_queue.jobs import job_registry
+
+logger = logging.getLogger('uvicorn')
+
+
+class QueueWorker:
+    """
+    Runs the jobs published to some queues.
+
+    The worker holds at most `prefetch` unacked messages, run `concurrency` at a time by a
+    thread pool. A job is acked once it returned, a job raising is nacked and delivered again
+    after a backoff, a message that isn't a known job is dead-lettered at once.
+
+    Attributes:
+        broker (QueueBroker): The broker to consume from.
+        queues (Sequence[str]): The queues to consume from.
+        name (str): The consumer name of the worker.
+        prefetch (int): The unacked messages the worker holds at once.
+        concurrency (int): The jobs run at once.
+    """
+
+    def __init__(
+            self,
+            broker: QueueBroker,
+            queues: Sequence[str],
+            name: Optional[str] = None,
+            prefetch: Optional[int] = None,
+            concurrency: Optional[int] = None
+    ):
+        self.broker = broker
+        self.queues = list(queues)
+        self.name = name or f'{socket.gethostname()}:{os.getpid()}'
+        self.prefetch = prefetch or config.QUEUE_PREFETCH
+        self.concurrency = concurrency or config.QUEUE_WORKER_CONCURRENCY
+        self._in_flight = 0
+        self._slots = threading.Condition()
+        self._stopping = threading.Event()
+
+    def handle(self, delivery: QueueDelivery) -> None:
+        """
+        Run the job of a message, then ack or nack it.
+        """
+        try:
+            message = QueueMessageModel.model_validate_json(delivery.body)
+        except ValidationError as e:
+            logger.error(f'QueueWorker dead-lettering malformed message {delivery.delivery_tag}: {str(e)}')
+            self.broker.nack(delivery, requeue=False)
+            return
+
+        job = job_registry.get(message.job)
+        if job is None:
+            logger.error(f'QueueWorker dead-lettering message {message.message_id} of unknown job {message.job}')
+            self.broker.nack(delivery, requeue=False)
+            return
+
+        try:
+            job.handler(message.payload)
+        except Exception as e:
+            logger.warning(
+                f'QueueWorker job {message.job} {message.message_id} failed, attempt {delivery.attempts}: {str(e)}'
+            )
+            self.broker.nack(delivery)
+        else:
+            self.broker.ack(delivery)
+
+    def _run_delivery(self, delivery: QueueDelivery) -> None:
+        try:
+            self.handle(delivery)
+        except Exception as e:
+            # The broker couldn't be told, the message is delivered again after the visibility timeout
+            logger.error(f'QueueWorker settling message {delivery.delivery_tag} failed: {str(e)}')
+        finally:
+            with self._slots:
+                self._in_flight -= 1
+                self._slots.notify()
+
+    def run(self) -> None:
+        """
+        Consume and run jobs until `stop` is called, then wait for the jobs in flight.
+        """
+        logger.info(f'QueueWorker {self.name} consuming {", ".join(self.queues)}')
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='tm-queue-job') as executor:
+            while not self._stopping.is_set():
+                with self._slots:
+                    while self._in_flight >= self.prefetch and not self._stopping.is_set():
+                        self._slots.wait(config.QUEUE_POLL_SECONDS)
+
+                if self._stopping.is_set():
+                    break
+
+                # The broker tops the worker up to `prefetch` unacked messages
+                try:
+                    deliveries: List[QueueDelivery] = self.broker.consume(
+                        self.queues, self.name, self.prefetch, config.QUEUE_POLL_SECONDS
+                    )
+                except Exception as e:
+                    logger.warning(f'QueueWorker consuming {", ".join(self.queues)} failed, retrying: {str(e)}')
+                    self._stopping.wait(config.QUEUE_POLL_SECONDS)
+                    continue
+
+                with self._slots:
+                    self._in_flight += len(deliveries)
+                for delivery in deliveries:
+                    executor.submit(self._run_delivery, delivery)
+
+        logger.info(f'QueueWorker {self.name} stopped')
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+
+def run_worker(queues: Sequence[str], prefetch: Optional[int], concurrency: Optional[int]) -> None:
+    """
+    Run a worker in this process until it receives SIGTERM or SIGINT.
+    """
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    worker = QueueWorker(build_broker(), queues, prefetch=prefetch, concurrency=concurrency)
+
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    signal.signal(signal.SIGINT, lambda *_: worker.stop())
+    worker.run()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Run the ticket management queue workers.')
+    parser.add_argument('--queues', nargs='+', default=job_registry.get_queues())
+    parser.add_argument('--processes', type=int, default=1)
+    parser.add_argument('--prefetch', type=int, default=None, help='QUEUE_PREFETCH by default.')
+    parser.add_argument('--concurrency', type=int, default=None, help='QUEUE_WORKER_CONCURRENCY by default.')
+    args = parser.parse_args(argv)
+
+    if args.processes == 1:
+        run_worker(args.queues, args.prefetch, args.concurrency)
+        return
+
+    processes = [
+        multiprocessing.Process(
+            target=run_worker, args=(args.queues, args.prefetch, args.concurrency), name=f'tm-queue-worker-{index}'
+        )
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    # The workers stop on their own signal, the parent only waits for them
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: [process.terminate() for process in processes])
+    for process in processes:
+        process.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+"""
+Load-test and benchmark suite for the Ticket Management API.
+
+Run `python -m benchmarks --help` for the available commands.
+"""
@@ -0,0 +1,72 @@
+import statistics
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+# bcrypt accepts cost factors from 4 to 31, each step doubles the time of a hash
+MIN_BCRYPT_ROUNDS: int = 4
+MAX_BCRYPT_ROUNDS: int = 31
+# The lowest cost factor worth deploying, whatever the hardware
+RECOMMENDED_MIN_BCRYPT_ROUNDS: int = 10
+
+
+class Calibration(NamedTuple):
+    """
+    The password hashing cost picked for a target time per hash.
+
+    Attributes:
+        target_ms (float): The target time per hash.
+        pbkdf2_iterations (int): The iterations of the PBKDF2 pre-hash measured with.
+        timings_ms (Dict[int, float]): The median time per hash of each bcrypt cost factor measured.
+        bcrypt_rounds (Optional[int]): The highest cost factor within the target, None if even the lowest exceeds it.
+    """
+    target_ms: float
+    pbkdf2_iterations: int
+    timings_ms: Dict[int, float]
+    bcrypt_rounds: Optional[int]
+
+
+def time_hash(bcrypt_rounds: int, pbkdf2_iterations: int, samples: int) -> float:
+    """
+    Get the median time of a password hash with the given parameters, in milliseconds.
+    """
+    from app.core.schema.auth import PasswordHashParams
+    from app.services.credentials.hashing import hash_password, new_salt
+
+    params = PasswordHashParams(pbkdf2_iterations=pbkdf2_iterations, bcrypt_rounds=bcrypt_rounds)
+    password: bytes = b'calibration-password'
+    salt: bytes = new_salt()
+
+    samples_ms: List[float] = []
+    for _ in range(samples):
+        started = time.perf_counter_ns()
+        hash_password(password, salt, params)
+        samples_ms.append((time.perf_counter_ns() - started) / 1_000_000)
+
+    return statistics.median(samples_ms)
+
+
+def calibrate(target_ms: float, pbkdf2_iterations: int, samples: int = 5) -> Calibration:
+    """
+    Measure increasing bcrypt cost factors on this machine until a hash takes longer than the target.
+
+    Verifying a password costs as much as hashing it, the target is the share of the sign-in
+    latency budget spent on it. Run it on the deployed hardware, under no other load.
+
+    Parameters:
+    - target_ms (float): The target time per hash, in milliseconds.
+    - pbkdf2_iterations (int): The iterations of the PBKDF2 pre-hash.
+    - samples (int): The hashes timed per cost factor.
+
+    Returns:
+    - Calibration: The time of each cost factor measured and the one to deploy.
+    """
+    timings_ms: Dict[int, float] = {}
+    bcrypt_rounds: Optional[int] = None
+
+    for rounds in range(MIN_BCRYPT_ROUNDS, MAX_BCRYPT_ROUNDS + 1):
+        timings_ms[rounds] = time_hash(rounds, pbkdf2_iterations, samples)
+        if timings_ms[rounds] > target_ms:
+            break
+        bcrypt_rounds = rounds
+
+    return Calibration(target_ms, pbkdf2_iterations, timings_ms, bcrypt_rounds)
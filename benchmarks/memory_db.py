@@ -0,0 +1,390 @@
+import copy
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from bson import ObjectId
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+_MISSING = object()
+
+
+def _get_field(document: Mapping[str, Any], path: str) -> Any:
+    """
+    Get a possibly dotted field of a document, _MISSING if absent.
+    """
+    value: Any = document
+    for part in path.split('.'):
+        if not isinstance(value, Mapping) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _compare(value: Any, operator: str, operand: Any) -> bool:
+    if operator == '$exists':
+        return (value is not _MISSING) == bool(operand)
+
+    value = None if value is _MISSING else value
+
+    if operator == '$eq':
+        return value == operand or (isinstance(value, list) and operand in value)
+    if operator == '$ne':
+        return not _compare(value, '$eq', operand)
+    if operator == '$in':
+        return any(_compare(value, '$eq', candidate) for candidate in operand)
+    if operator == '$nin':
+        return not _compare(value, '$in', operand)
+
+    if value is None or operand is None:
+        return False
+
+    try:
+        if operator == '$gt':
+            return value > operand
+        if operator == '$gte':
+            return value >= operand
+        if operator == '$lt':
+            return value < operand
+        if operator == '$lte':
+            return value <= operand
+    except TypeError:
+        return False
+
+    raise OperationFailure(f'Unsupported query operator {operator}')
+
+
+def matches(document: Mapping[str, Any], query: Optional[Mapping[str, Any]]) -> bool:
+    """
+    Check a document against a MongoDB query filter.
+    """
+    for key, condition in (query or {}).items():
+        if key == '$and':
+            if not all(matches(document, sub_query) for sub_query in condition):
+                return False
+            continue
+        if key == '$or':
+            if not any(matches(document, sub_query) for sub_query in condition):
+                return False
+            continue
+
+        value = _get_field(document, key)
+        if isinstance(condition, Mapping) and condition and all(op.startswith('$') for op in condition):
+            if not all(_compare(value, operator, operand) for operator, operand in condition.items()):
+                return False
+        elif not _compare(value, '$eq', condition):
+            return False
+
+    return True
+
+
+def _project(document: Mapping[str, Any], projection: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    document = copy.deepcopy(dict(document))
+    if not projection:
+        return document
+
+    if isinstance(projection, (list, tuple)):
+        projection = {field: 1 for field in projection}
+
+    include_id = bool(projection.get('_id', 1))
+    included = [field for field, flag in projection.items() if flag and field != '_id']
+
+    if included:
+        projected = {field: document[field] for field in included if field in document}
+    else:
+        projected = {field: value for field, value in document.items() if projection.get(field, 1)}
+
+    if include_id and '_id' in document:
+        projected['_id'] = document['_id']
+    else:
+        projected.pop('_id', None)
+
+    return projected
+
+
+def _sort(documents: List[Dict[str, Any]], sort: Sequence[Tuple[str, int]]) -> List[Dict[str, Any]]:
+    for field, direction in reversed(list(sort)):
+        documents.sort(
+            key=lambda document: (
+                _get_field(document, field) not in (None, _MISSING),
+                _get_field(document, field) if _get_field(document, field) not in (None, _MISSING) else 0
+            ),
+            reverse=direction != ASCENDING
+        )
+    return documents
+
+
+def _apply_update(document: Dict[str, Any], update: Mapping[str, Any], inserting: bool) -> None:
+    for operator, fields in update.items():
+        if operator == '$set' or (operator == '$setOnInsert' and inserting):
+            document.update(copy.deepcopy(fields))
+        elif operator == '$inc':
+            for field, amount in fields.items():
+                document[field] = document.get(field, 0) + amount
+        elif operator == '$max':
+            for field, value in fields.items():
+                if document.get(field) is None or value > document[field]:
+                    document[field] = copy.deepcopy(value)
+        elif operator == '$unset':
+            for field in fields:
+                document.pop(field, None)
+        elif operator == '$push':
+            for field, value in fields.items():
+                document.setdefault(field, []).append(copy.deepcopy(value))
+        elif operator != '$setOnInsert':
+            raise OperationFailure(f'Unsupported update operator {operator}')
+
+
+class InsertOneResult:
+    def __init__(self, inserted_id: Any):
+        self.inserted_id = inserted_id
+        self.acknowledged = True
+
+
+class UpdateResult:
+    def __init__(self, matched_count: int, modified_count: int, upserted_id: Any = None):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+        self.acknowledged = True
+
+
+class DeleteResult:
+    def __init__(self, deleted_count: int):
+        self.deleted_count = deleted_count
+        self.acknowledged = True
+
+
+class MemoryCursor:
+    """
+    Lazily evaluated cursor supporting the sort/skip/limit chain used by the controllers.
+    """
+
+    def __init__(self, collection: 'MemoryCollection', query: Optional[Mapping[str, Any]], projection: Any):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort: List[Tuple[str, int]] = []
+        self._skip: int = 0
+        self._limit: int = 0
+        self._iterator = None
+
+    def sort(self, key_or_list: Union[str, Sequence[Tuple[str, int]]], direction: int = ASCENDING) -> 'MemoryCursor':
+        self._sort = [(key_or_list, direction)] if isinstance(key_or_list, str) else list(key_or_list)
+        return self
+
+    def skip(self, skip: int) -> 'MemoryCursor':
+        self._skip = skip
+        return self
+
+    def limit(self, limit: int) -> 'MemoryCursor':
+        self._limit = limit
+        return self
+
+    def max_time_ms(self, max_time_ms: Optional[int]) -> 'MemoryCursor':
+        return self
+
+    def _evaluate(self) -> List[Dict[str, Any]]:
+        documents = _sort(self._collection.select(self._query), self._sort)
+        documents = documents[self._skip:]
+        if self._limit:
+            documents = documents[:self._limit]
+        return [_project(document, self._projection) for document in documents]
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        if self._iterator is None:
+            self._iterator = iter(self._evaluate())
+        return next(self._iterator)
+
+
+class MemoryCollection:
+    """
+    In-process stand-in for a pymongo Collection, covering the operations used by the application.
+    """
+
+    def __init__(self, database: 'MemoryDatabase', name: str):
+        self.database = database
+        self.name = name
+        self._documents: Dict[Any, Dict[str, Any]] = {}
+        self._unique_indexes: List[List[str]] = []
+        self._indexes: List[Any] = []
+        self._lock = threading.RLock()
+
+    def with_options(self, **kwargs) -> 'MemoryCollection':
+        return self
+
+    def create_index(self, keys: Any, unique: bool = False, **kwargs) -> str:
+        keys = [(keys, ASCENDING)] if isinstance(keys, str) else list(keys)
+        self._indexes.append((keys, unique, kwargs))
+        if unique:
+            self._unique_indexes.append([field for field, _ in keys])
+        return '_'.join(f'{field}_{direction}' for field, direction in keys)
+
+    def _check_unique(self, document: Mapping[str, Any], ignore_id: Any = _MISSING) -> None:
+        for fields in self._unique_indexes:
+            key = [_get_field(document, field) for field in fields]
+            for other_id, other in self._documents.items():
+                if other_id != ignore_id and [_get_field(other, field) for field in fields] == key:
+                    raise DuplicateKeyError(f'E11000 duplicate key error collection: {self.name} index: {fields}')
+
+    def select(self, query: Optional[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [document for document in self._documents.values() if matches(document, query)]
+
+    def insert_one(self, document: Mapping[str, Any], **kwargs) -> InsertOneResult:
+        with self._lock:
+            document = copy.deepcopy(dict(document))
+            document.setdefault('_id', ObjectId())
+
+            if document['_id'] in self._documents:
+                raise DuplicateKeyError(f'E11000 duplicate key error collection: {self.name} index: _id_')
+
+            self._check_unique(document)
+            self._documents[document['_id']] = document
+            return InsertOneResult(document['_id'])
+
+    def insert_many(self, documents: Sequence[Mapping[str, Any]], **kwargs) -> List[Any]:
+        return [self.insert_one(document).inserted_id for document in documents]
+
+    def find(self, filter: Optional[Mapping[str, Any]] = None, projection: Any = None, **kwargs) -> MemoryCursor:
+        cursor = MemoryCursor(self, filter, projection)
+        if kwargs.get('sort'):
+            cursor.sort(kwargs['sort'])
+        if kwargs.get('skip'):
+            cursor.skip(kwargs['skip'])
+        if kwargs.get('limit'):
+            cursor.limit(kwargs['limit'])
+        return cursor
+
+    def find_one(self, filter: Optional[Mapping[str, Any]] = None, projection: Any = None, **kwargs) -> Optional[Dict]:
+        return next(self.find(filter, projection, **kwargs).limit(1), None)
+
+    def _upsert_document(self, filter: Mapping[str, Any], update: Mapping[str, Any]) -> Dict[str, Any]:
+        document = {
+            key: value for key, value in filter.items()
+            if not key.startswith('$') and not (isinstance(value, Mapping) and any(k.startswith('$') for k in value))
+        }
+        _apply_update(document, update, inserting=True)
+        return document
+
+    def update_one(self, filter: Mapping[str, Any], update: Mapping[str, Any], upsert: bool = False, **kwargs) -> UpdateResult:
+        with self._lock:
+            current = next(iter(self.select(filter)), None)
+
+            if current is None:
+                if not upsert:
+                    return UpdateResult(0, 0)
+                inserted_id = self.insert_one(self._upsert_document(filter, update)).inserted_id
+                return UpdateResult(0, 0, inserted_id)
+
+            updated = copy.deepcopy(current)
+            _apply_update(updated, update, inserting=False)
+            self._check_unique(updated, ignore_id=current['_id'])
+            self._documents[current['_id']] = updated
+            return UpdateResult(1, int(updated != current))
+
+    def update_many(self, filter: Mapping[str, Any], update: Mapping[str, Any], upsert: bool = False, **kwargs) -> UpdateResult:
+        with self._lock:
+            matched = self.select(filter)
+            modified = 0
+
+            for current in matched:
+                updated = copy.deepcopy(current)
+                _apply_update(updated, update, inserting=False)
+                self._documents[current['_id']] = updated
+                modified += int(updated != current)
+
+            if not matched and upsert:
+                inserted_id = self.insert_one(self._upsert_document(filter, update)).inserted_id
+                return UpdateResult(0, 0, inserted_id)
+
+            return UpdateResult(len(matched), modified)
+
+    def find_one_and_update(self,
+                            filter: Mapping[str, Any],
+                            update: Mapping[str, Any],
+                            projection: Any = None,
+                            sort: Optional[Sequence[Tuple[str, int]]] = None,
+                            upsert: bool = False,
+                            return_document: bool = ReturnDocument.BEFORE,
+                            **kwargs) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            current = next(iter(_sort(self.select(filter), sort or [])), None)
+
+            if current is None:
+                if not upsert:
+                    return None
+                inserted_id = self.insert_one(self._upsert_document(filter, update)).inserted_id
+                if return_document == ReturnDocument.AFTER:
+                    return _project(self._documents[inserted_id], projection)
+                return None
+
+            updated = copy.deepcopy(current)
+            _apply_update(updated, update, inserting=False)
+            self._check_unique(updated, ignore_id=current['_id'])
+            self._documents[current['_id']] = updated
+            return _project(updated if return_document == ReturnDocument.AFTER else current, projection)
+
+    def delete_one(self, filter: Mapping[str, Any], **kwargs) -> DeleteResult:
+        with self._lock:
+            current = next(iter(self.select(filter)), None)
+            if current is None:
+                return DeleteResult(0)
+            del self._documents[current['_id']]
+            return DeleteResult(1)
+
+    def find_one_and_delete(self, filter: Mapping[str, Any], projection: Any = None, **kwargs) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            current = next(iter(_sort(self.select(filter), kwargs.get('sort') or [])), None)
+            if current is None:
+                return None
+            del self._documents[current['_id']]
+            return _project(current, projection)
+
+    def delete_many(self, filter: Mapping[str, Any], **kwargs) -> DeleteResult:
+        with self._lock:
+            matched = self.select(filter)
+            for document in matched:
+                del self._documents[document['_id']]
+            return DeleteResult(len(matched))
+
+    def count_documents(self, filter: Mapping[str, Any], **kwargs) -> int:
+        return len(self.select(filter))
+
+    def estimated_document_count(self, **kwargs) -> int:
+        return len(self._documents)
+
+    def drop(self) -> None:
+        with self._lock:
+            self._documents.clear()
+
+    def watch(self, *args, **kwargs):
+        raise OperationFailure('Change streams are not supported by the in-process database.')
+
+
+class MemoryDatabase:
+    """
+    In-process stand-in for a pymongo Database, used by the benchmarks.
+    """
+    def __init__(self, name: str = 'benchmark'):
+        self.name = name
+        self._collections: Dict[str, MemoryCollection] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = MemoryCollection(self, name)
+            return self._collections[name]
+
+    def get_collection(self, name: str, **kwargs) -> MemoryCollection:
+        return self[name]
+
+    def list_collection_names(self) -> List[str]:
+        return list(self._collections)
+
+    def watch(self, *args, **kwargs):
+        raise OperationFailure('Change streams are not supported by the in-process database.')
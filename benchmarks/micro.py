@@ -0,0 +1,143 @@
+import gc
+import time
+import tracemalloc
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+from benchmarks.report import AllocationSummary, LatencySummary, ScenarioResult
+
+# Controllers measured by default: a cheap read, a read scaling with the tree and a write
+HOT_PATH_CONTROLLERS: Tuple[str, ...] = ('fetch_user_by_email', 'fetch_companies', 'post_update_task')
+
+
+def measure(operation: Callable[[], Any], iterations: int, warmup: int = 50) -> ScenarioResult:
+    """
+    Time an operation iteration by iteration, then measure its allocations with tracemalloc.
+
+    Timing and allocation tracking run separately, tracemalloc slows allocations down.
+
+    Parameters:
+    - operation (Callable): The operation to measure.
+    - iterations (int): The number of timed iterations.
+    - warmup (int): The number of untimed iterations run first.
+
+    Returns:
+    - ScenarioResult: The latency, throughput and allocations of the operation.
+    """
+    for _ in range(warmup):
+        operation()
+
+    samples_ms: List[float] = []
+    gc.collect()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        iteration_started = time.perf_counter_ns()
+        operation()
+        samples_ms.append((time.perf_counter_ns() - iteration_started) / 1_000_000)
+    duration = time.perf_counter() - started
+
+    allocation_iterations = max(1, min(iterations, 200))
+    peaks: List[int] = []
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    before = tracemalloc.take_snapshot()
+    for _ in range(allocation_iterations):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        operation()
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    after = tracemalloc.take_snapshot()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    allocated_blocks = sum(
+        stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0
+    )
+
+    return ScenarioResult(
+        requests=iterations,
+        errors=0,
+        concurrency=1,
+        duration_s=duration,
+        throughput_rps=iterations / duration if duration else 0.0,
+        latency_ms=LatencySummary.from_samples(samples_ms),
+        allocations=AllocationSummary(
+            peak_bytes_per_op=sum(peaks) / len(peaks),
+            retained_bytes_per_op=(retained - baseline) / allocation_iterations,
+            retained_blocks_per_op=allocated_blocks / allocation_iterations,
+        ),
+    )
+
+
+def _payloads(tenant: Any) -> Mapping[str, Mapping[str, Any]]:
+    task_id, board_id = tenant.task_ids[0]
+    return {
+        'fetch_user_by_email': {'email': tenant.users[0].email},
+        'fetch_companies': {'page': 1, 'page_size': 5},
+        'post_update_task': {
+            'id': task_id,
+            'position': 1,
+            'name': 'Task edited',
+            'description': 'Edited by the microbenchmark',
+            'board_id': board_id,
+        },
+    }
+
+
+def stages(controller: Any, payload: Mapping[str, Any], client: Any, path: str, headers: Mapping[str, str]) -> Dict[str, Callable[[], Any]]:
+    """
+    Build one callable per stage of the controller hot path.
+
+    route_builder -> handler -> BaseAPIController.invoke -> validate_request -> process_request
+    -> delegate.on_process_finished -> response validation.
+    """
+    from app.core.common.base_schema import APIProcessReport, APIRequestContext
+
+    request_type = controller.get_request_type()
+    response_type = controller.get_response_type()
+    request = request_type.model_validate(payload)
+    output = controller.process_request(request)
+    report = APIProcessReport(status_code=HTTPStatus.OK, response=output, message=None, request=request)
+    output_payload = output.model_dump()
+
+    return {
+        'http_round_trip': lambda: client.post(path, json=payload, headers=headers),
+        'request_parsing': lambda: request_type.model_validate(payload),
+        'validate_request': lambda: controller.validate_request(request),
+        'process_request': lambda: controller.process_request(request),
+        'process_report': lambda: APIProcessReport(
+            status_code=HTTPStatus.OK, response=output, message=None, request=request
+        ),
+        'on_process_finished': lambda: controller.delegate.on_process_finished(report),
+        'response_validation': lambda: response_type.model_validate(output_payload).model_dump_json(),
+        'invoke': lambda: controller.invoke(request, APIRequestContext()),
+    }
+
+
+def run_micro(database: Any, iterations: int, controllers=HOT_PATH_CONTROLLERS) -> Dict[str, ScenarioResult]:
+    """
+    Measure every stage of the hot path of the given controllers against the given database.
+    """
+    from fastapi.testclient import TestClient
+
+    from app.api import v1
+    from app.main import app
+    from benchmarks.generator import SeededTenant, reset, seed_api_key, seed_tree, seed_users, TREE_COLLECTIONS, USER_COLLECTIONS
+
+    reset(database, TREE_COLLECTIONS + USER_COLLECTIONS)
+    tenant = seed_api_key(database, seed_users(database, SeededTenant(), 1))
+    seed_tree(database, tenant, 5, 5, 10)
+
+    client = TestClient(app)
+    headers = {'X-API-Key': tenant.api_key}
+    payloads = _payloads(tenant)
+    results: Dict[str, ScenarioResult] = {}
+
+    for name in controllers:
+        controller = v1.factory.get_controller(name, v1.VERSION)
+        path = f'/{v1.VERSION}{controller.get_path()}'
+
+        for stage, operation in stages(controller, payloads[name], client, path, headers).items():
+            results[f'{name}.{stage}'] = measure(operation, iterations)
+
+    return results
@@ -0,0 +1,156 @@
+import json
+import math
+import platform
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Mapping, Any, Sequence, Optional
+
+from pydantic import BaseModel, Field
+
+
+def percentile(sorted_samples: Sequence[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of already sorted samples.
+    """
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, math.ceil(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+class LatencySummary(BaseModel):
+    """
+    Latency distribution of a scenario, in milliseconds.
+    """
+    p50: float
+    p95: float
+    p99: float
+    mean: float
+    max: float
+
+    @classmethod
+    def from_samples(cls, samples_ms: Sequence[float]) -> 'LatencySummary':
+        ordered = sorted(samples_ms)
+        return cls(
+            p50=percentile(ordered, 0.50),
+            p95=percentile(ordered, 0.95),
+            p99=percentile(ordered, 0.99),
+            mean=sum(ordered) / len(ordered) if ordered else 0.0,
+            max=ordered[-1] if ordered else 0.0,
+        )
+
+
+class AllocationSummary(BaseModel):
+    """
+    Memory allocated per operation, measured with tracemalloc.
+
+    Attributes:
+        peak_bytes_per_op (float): The mean allocation high-water mark of one operation.
+        retained_bytes_per_op (float): The memory still held after the operation, leaks and caches.
+        retained_blocks_per_op (float): The memory blocks still held after the operation.
+    """
+    peak_bytes_per_op: float
+    retained_bytes_per_op: float
+    retained_blocks_per_op: float
+
+
+class ScenarioResult(BaseModel):
+    """
+    Result of one scenario run.
+
+    Attributes:
+        requests (int): The number of requests sent.
+        errors (int): The number of requests answered with an unexpected status code.
+        concurrency (int): The number of concurrent clients.
+        duration_s (float): The wall time of the run.
+        throughput_rps (float): The completed requests per second.
+        latency_ms (LatencySummary): The latency distribution.
+        status_codes (Dict[str, int]): The number of responses per status code.
+        allocations (Optional[AllocationSummary]): The allocations per operation, microbenchmarks only.
+    """
+    requests: int
+    errors: int
+    concurrency: int
+    duration_s: float
+    throughput_rps: float
+    latency_ms: LatencySummary
+    status_codes: Dict[str, int] = Field(default_factory=dict)
+    allocations: Optional[AllocationSummary] = None
+
+
+class BenchmarkReport(BaseModel):
+    """
+    A benchmark run, stored as JSON so two runs can be compared.
+    """
+    created: datetime = Field(default_factory=datetime.now)
+    target: str
+    git_commit: str = ''
+    python: str = Field(default_factory=platform.python_version)
+    machine: str = Field(default_factory=platform.platform)
+    parameters: Mapping[str, Any] = Field(default_factory=dict)
+    scenarios: Dict[str, ScenarioResult] = Field(default_factory=dict)
+
+    def save(self, path: str) -> None:
+        with open(path, 'w') as output:
+            output.write(self.model_dump_json(indent=2))
+
+    @classmethod
+    def load(cls, path: str) -> 'BenchmarkReport':
+        with open(path) as source:
+            return cls.model_validate(json.load(source))
+
+
+def current_git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def compare(baseline: BenchmarkReport, candidate: BenchmarkReport, threshold_pct: float) -> List[str]:
+    """
+    Compare two runs scenario by scenario and print the relative changes.
+
+    Parameters:
+    - baseline (BenchmarkReport): The reference run.
+    - candidate (BenchmarkReport): The run to check.
+    - threshold_pct (float): The slowdown, in percent, above which a metric counts as a regression.
+
+    Returns:
+    - List[str]: The regressions found, empty if none.
+    """
+    regressions: List[str] = []
+    print(f'{"scenario":48} {"metric":12} {"baseline":>12} {"candidate":>12} {"change":>9}')
+
+    for name, before in baseline.scenarios.items():
+        after = candidate.scenarios.get(name)
+        if not after:
+            print(f'{name:48} missing from candidate')
+            continue
+
+        metrics = [
+            ('p50_ms', before.latency_ms.p50, after.latency_ms.p50, False),
+            ('p95_ms', before.latency_ms.p95, after.latency_ms.p95, False),
+            ('p99_ms', before.latency_ms.p99, after.latency_ms.p99, False),
+            ('rps', before.throughput_rps, after.throughput_rps, True),
+        ]
+        if before.allocations and after.allocations:
+            metrics.append((
+                'peak_bytes', before.allocations.peak_bytes_per_op, after.allocations.peak_bytes_per_op, False
+            ))
+
+        for metric, old, new, higher_is_better in metrics:
+            change = ((new - old) / old * 100) if old else 0.0
+            slowdown = -change if higher_is_better else change
+            flag = ' <-- regression' if slowdown > threshold_pct else ''
+            print(f'{name:48} {metric:12} {old:12.3f} {new:12.3f} {change:+8.1f}%{flag}')
+
+            if flag:
+                regressions.append(f'{name} {metric} {change:+.1f}%')
+
+        if after.errors > before.errors:
+            regressions.append(f'{name} errors {before.errors} -> {after.errors}')
+
+    return regressions
@@ -0,0 +1,151 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from benchmarks.generator import SeededTenant, reset, seed_tree
+from benchmarks.report import LatencySummary, ScenarioResult
+
+# (companies, boards per company, tasks per board)
+TREE_SIZES: Sequence[Tuple[int, int, int]] = ((10, 2, 10), (10, 5, 20), (10, 10, 50))
+QUICK_TREE_SIZES: Sequence[Tuple[int, int, int]] = ((5, 2, 5), (5, 5, 10))
+
+
+class LoadDriver:
+    """
+    Drives the real FastAPI application in-process with concurrent clients and records latencies.
+    """
+
+    def __init__(self, app: Any):
+        self._app = app
+        self._local = threading.local()
+
+    def _client(self):
+        from fastapi.testclient import TestClient
+
+        if not hasattr(self._local, 'client'):
+            self._local.client = TestClient(self._app)
+        return self._local.client
+
+    def send_once(self, send: Callable[[Any, int], Any]) -> Any:
+        """
+        Send a single request outside of any measurement, e.g. to warm up or read an ETag.
+        """
+        return send(self._client(), 0)
+
+    def run(self,
+            requests: int,
+            concurrency: int,
+            send: Callable[[Any, int], Any],
+            expected: Sequence[int] = (200,)) -> ScenarioResult:
+        """
+        Send `requests` requests from `concurrency` clients.
+
+        Parameters:
+        - requests (int): The number of requests to send.
+        - concurrency (int): The number of concurrent clients.
+        - send (Callable): Sends request number `i` with the given client and returns the response.
+        - expected (Sequence[int]): The status codes counting as success.
+
+        Returns:
+        - ScenarioResult: The throughput and latency of the run.
+        """
+        latencies_ms: List[float] = [0.0] * requests
+        status_codes: List[int] = [0] * requests
+
+        def call(index: int) -> None:
+            started = time.perf_counter()
+            try:
+                status_codes[index] = send(self._client(), index).status_code
+            except Exception:
+                status_codes[index] = 599
+            latencies_ms[index] = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(call, range(requests)))
+        duration = time.perf_counter() - started
+
+        return ScenarioResult(
+            requests=requests,
+            errors=sum(1 for status_code in status_codes if status_code not in expected),
+            concurrency=concurrency,
+            duration_s=duration,
+            throughput_rps=requests / duration if duration else 0.0,
+            latency_ms=LatencySummary.from_samples(latencies_ms),
+            status_codes={str(code): count for code, count in sorted(Counter(status_codes).items())},
+        )
+
+
+def signin_storm(driver: LoadDriver, database: Any, tenant: SeededTenant, requests: int, concurrency: int) -> Dict[str, ScenarioResult]:
+    """
+    Many clients signing in at once, dominated by password hashing.
+    """
+    def send(client, index: int):
+        user = tenant.users[index % len(tenant.users)]
+        return client.post('/public/post_signin', json={'email': user.email, 'password': user.password})
+
+    return {'signin_storm': driver.run(requests, concurrency, send)}
+
+
+def fetch_companies_scaling(driver: LoadDriver,
+                            database: Any,
+                            tenant: SeededTenant,
+                            requests: int,
+                            concurrency: int,
+                            sizes: Sequence[Tuple[int, int, int]] = TREE_SIZES) -> Dict[str, ScenarioResult]:
+    """
+    fetch_companies at increasing tree sizes, as full downloads and as conditional requests.
+    """
+    headers = {'X-API-Key': tenant.api_key}
+    results: Dict[str, ScenarioResult] = {}
+
+    for companies, boards, tasks in sizes:
+        reset(database)
+        seed_tree(database, tenant, companies, boards, tasks)
+        label = f'{companies}x{boards}x{tasks}'
+
+        def send_full(client, index: int):
+            return client.post('/v1/fetch_companies', json={'page': 1, 'page_size': companies}, headers=headers)
+
+        etag = driver.send_once(send_full).headers.get('etag')
+
+        def send_conditional(client, index: int):
+            return client.post(
+                '/v1/fetch_companies',
+                json={'page': 1, 'page_size': companies},
+                headers={**headers, 'If-None-Match': etag or ''}
+            )
+
+        results[f'fetch_companies[{label}]'] = driver.run(requests, concurrency, send_full)
+        results[f'fetch_companies_not_modified[{label}]'] = driver.run(requests, concurrency, send_conditional, (304,))
+
+    return results
+
+
+def task_updates(driver: LoadDriver,
+                 database: Any,
+                 tenant: SeededTenant,
+                 requests: int,
+                 concurrency: int,
+                 size: Tuple[int, int, int] = (10, 5, 20)) -> Dict[str, ScenarioResult]:
+    """
+    Write-heavy scenario: concurrent task edits spread over the whole tree.
+    """
+    reset(database)
+    tenant.task_ids.clear()
+    seed_tree(database, tenant, *size)
+    headers = {'X-API-Key': tenant.api_key}
+
+    def send(client, index: int):
+        task_id, board_id = tenant.task_ids[(index * 7919) % len(tenant.task_ids)]
+        return client.post('/v1/post_update_task', headers=headers, json={
+            'id': task_id,
+            'position': index + 1,
+            'name': f'Task edited {index}',
+            'description': f'Edited by request {index}',
+            'board_id': board_id,
+        })
+
+    return {f'task_updates[{"x".join(map(str, size))}]': driver.run(requests, concurrency, send)}
@@ -0,0 +1,37 @@
+// Configures sharding through mongos, idempotent so it can be re-run after adding collections.
+// Keep SHARD_KEYS in sync with app/services/tm_db/sharding.py.
+const DB_NAME = process.env.NOSQL_DB || 'ticket_management';
+const SHARD_KEYS = {
+  Boards: { company_id: 1 },
+  Tasks: { company_id: 1, board_id: 1 },
+};
+
+for (const shard of ['shard1/shard1:27018', 'shard2/shard2:27018']) {
+  sh.addShard(shard);
+}
+
+const admin = db.getSiblingDB('admin');
+if (!admin.getUser(process.env.NOSQL_USER)) {
+  admin.createUser({ user: process.env.NOSQL_USER, pwd: process.env.NOSQL_PWD, roles: ['root'] });
+}
+
+const database = db.getSiblingDB(DB_NAME);
+sh.enableSharding(DB_NAME);
+
+// Tasks created before company ids were denormalized onto them get it from their board,
+// documents missing shard key fields would all land on the chunk of the null key
+database.Tasks.aggregate([
+  { $match: { company_id: { $exists: false } } },
+  { $addFields: { board_oid: { $toObjectId: '$board_id' } } },
+  { $lookup: { from: 'Boards', localField: 'board_oid', foreignField: '_id', as: 'board' } },
+  { $unwind: '$board' },
+  { $project: { company_id: '$board.company_id' } },
+  { $merge: { into: 'Tasks', on: '_id', whenMatched: 'merge', whenNotMatched: 'discard' } },
+]);
+
+for (const [collection, key] of Object.entries(SHARD_KEYS)) {
+  database[collection].createIndex(key);
+  sh.shardCollection(`${DB_NAME}.${collection}`, key);
+}
+
+printjson(sh.status());
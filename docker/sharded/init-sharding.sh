@@ -0,0 +1,26 @@
+#!/usr/bin/env bash
+# Initiates the replica sets of docker-compose.sharded.yml, then configures sharding through mongos.
+set -euo pipefail
+
+wait_for() {
+  until mongosh --quiet --host "$1" --eval 'db.adminCommand({ ping: 1 })' > /dev/null 2>&1; do
+    sleep 1
+  done
+}
+
+wait_for configsvr:27019
+mongosh --quiet --host configsvr:27019 --eval '
+  try { rs.status() } catch (e) {
+    rs.initiate({ _id: "cfg", configsvr: true, members: [{ _id: 0, host: "configsvr:27019" }] })
+  }'
+
+for shard in shard1 shard2; do
+  wait_for "$shard:27018"
+  mongosh --quiet --host "$shard:27018" --eval "
+    try { rs.status() } catch (e) {
+      rs.initiate({ _id: '$shard', members: [{ _id: 0, host: '$shard:27018' }] })
+    }"
+done
+
+wait_for mongos:27017
+mongosh --quiet --host mongos:27017 /docker/sharded/init-sharding.js
@@ -0,0 +1,67 @@
+"""
+Fixtures running the application against the in-process MongoDB stand-in of the benchmarks
+(`benchmarks.memory_db`), no server needed.
+
+The stand-in has no sessions, so writes run without transactions, as on a standalone server.
+"""
+import os
+import uuid
+from typing import Any, Dict, Optional
+
+import pytest
+
+
+class APIClient:
+    """
+    Calls the API as the seeded API key, one company per test keeps the tests apart.
+    """
+
+    def __init__(self, client, database, api_key: str):
+        self.client = client
+        self.database = database
+        self.headers: Dict[str, str] = {'X-API-Key': api_key}
+
+    def post(self, path: str, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        return self.client.post(path, json=body, headers={**self.headers, **(headers or {})})
+
+    def create_company(self) -> Dict[str, Any]:
+        response = self.post('/v1/post_create_company', {'name': f'Company {uuid.uuid4().hex}', 'description': 'd'})
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    def create_board(self, company_id: str, position: int = 1) -> Dict[str, Any]:
+        response = self.post('/v1/post_create_board', {
+            'name': f'Board {uuid.uuid4().hex}', 'description': 'd', 'position': position, 'company_id': company_id
+        })
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    def create_task(self, board_id: str, position: int = 1) -> Dict[str, Any]:
+        response = self.post('/v1/post_create_task', {
+            'name': f'Task {uuid.uuid4().hex}', 'description': 'd', 'position': position, 'board_id': board_id
+        })
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    def get_version(self, company_id: str) -> int:
+        response = self.post('/v1/fetch_company_version', {'company_id': company_id})
+        assert response.status_code == 200, response.text
+        return response.json()['version']
+
+
+@pytest.fixture(scope='session')
+def api():
+    os.environ.setdefault('OUTBOX_RELAY', 'false')
+
+    from benchmarks.environment import open_database
+    database = open_database('memory', name=f'tm_test_{uuid.uuid4().hex[:8]}')
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.services.tm_db.service import TMMongoDBServicePool
+    from benchmarks.generator import SeededTenant, seed_api_key
+
+    tenant = seed_api_key(database, SeededTenant())
+
+    yield APIClient(TestClient(app), database, tenant.api_key)
+    TMMongoDBServicePool.use_database(None)
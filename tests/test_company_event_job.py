@@ -0,0 +1,48 @@
+"""
+The company_event job delivering outbox events to the configured webhook.
+"""
+import json
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+
+def _serve(status: int, received: list) -> HTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append(json.loads(self.rfile.read(int(self.headers['Content-Length']))))
+            self.send_response(status)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.mark.parametrize('status', [200, 500])
+def test_company_event_posts_to_the_webhook(api, monkeypatch, status):
+    from app.core.common.config import config
+    from app.services.tm_queue.jobs import company_event
+
+    received: list = []
+    server = _serve(status, received)
+    monkeypatch.setattr(config, 'EVENTS_WEBHOOK_URL', f'http://127.0.0.1:{server.server_port}/events')
+    event = {'event_type': 'task_updated', 'company_id': 'company', 'entity_id': 'task'}
+
+    try:
+        if status == 200:
+            company_event(event)
+        else:
+            # Raising hands the event back to the queue for a retry
+            with pytest.raises(urllib.error.HTTPError):
+                company_event(event)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert received == [event]
@@ -0,0 +1,65 @@
+"""
+Requests failing on an unreachable database.
+"""
+import pytest
+from pymongo.errors import ServerSelectionTimeoutError
+
+from app.core.api.collections import DBCollectionEnum
+
+
+def _unreachable(*args, **kwargs):
+    raise ServerSelectionTimeoutError('10.1.2.3:27017: [Errno 111] Connection refused, Topology Description: ...')
+
+
+def test_authentication_outage_is_answered_with_503_and_opens_the_breaker(api, monkeypatch):
+    from app.core.common.config import config
+    from app.services.tm_db.service import TMMongoDBServicePool
+
+    monkeypatch.setattr(TMMongoDBServicePool, '_circuit_breakers', {})
+    monkeypatch.setattr(api.database[DBCollectionEnum.SESSIONS.value], 'find_one', _unreachable)
+
+    for _ in range(config.CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+        response = api.post('/v1/fetch_company_version', {'company_id': 'any'})
+        assert response.status_code == 503
+        assert 'Retry-After' in response.headers
+        assert '10.1.2.3' not in response.text
+
+    assert TMMongoDBServicePool.get_circuit_breaker_metrics()['default']['state'] == 'open'
+
+
+def test_outage_responses_do_not_show_the_cluster_hosts(api, monkeypatch):
+    from app.services.tm_db.service import TMMongoDBServicePool
+
+    monkeypatch.setattr(TMMongoDBServicePool, '_circuit_breakers', {})
+    monkeypatch.setattr(api.database[DBCollectionEnum.AUTH_CREDENTIALS.value], 'find_one', _unreachable)
+
+    response = api.post('/public/post_signin', {'email': 'user@example.com', 'password': 'secret'})
+
+    assert response.status_code == 503
+    assert '10.1.2.3' not in response.text
+    assert 'Topology' not in response.text
+
+
+def test_unreachable_cluster_fails_within_the_selection_cap(api, monkeypatch):
+    import time
+
+    import pymongo
+    from pymongo import MongoClient
+    from app.core.common.config import config
+    from app.services.tm_db.service import TMMongoDBServicePool
+
+    client = MongoClient('mongodb://127.0.0.1:1', serverSelectionTimeoutMS=300, connect=False)
+    monkeypatch.setattr(config, 'NOSQL_SERVER_SELECTION_TIMEOUT_MS', 300)
+    monkeypatch.setattr(TMMongoDBServicePool, '_database', None)
+    monkeypatch.setattr(TMMongoDBServicePool, '_clients', {None: client})
+    monkeypatch.setattr(TMMongoDBServicePool, '_service_pool', {})
+    monkeypatch.setattr(TMMongoDBServicePool, '_circuit_breakers', {})
+
+    started: float = time.monotonic()
+    try:
+        with pytest.raises(ServerSelectionTimeoutError), pymongo.timeout(10):
+            TMMongoDBServicePool().get_mongodb_service(DBCollectionEnum.SESSIONS.value).find_one({})
+    finally:
+        client.close()
+
+    assert time.monotonic() - started < 5
@@ -0,0 +1,69 @@
+"""
+fetch_changes_since paging on the (change_seq, _id) cursor.
+"""
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.api.collections import DBCollectionEnum
+
+
+def sync(api, company_id: str, since: Optional[str] = None, limit: int = 500) -> Tuple[Set[str], Set[str], str]:
+    """
+    Page through the changes after `since`, returning the board and task ids seen and the last cursor.
+    """
+    boards: Set[str] = set()
+    tasks: Set[str] = set()
+    for _ in range(100):
+        response = api.post('/v1/fetch_changes_since', {'company_id': company_id, 'since': since, 'limit': limit})
+        assert response.status_code == 200, response.text
+        page: Dict[str, Any] = response.json()
+        boards.update(board['id'] for board in page['boards'])
+        tasks.update(task['id'] for task in page['tasks'])
+        since = page['next_cursor']
+        if not page['has_more']:
+            return boards, tasks, since
+    raise AssertionError('fetch_changes_since never reported the end of the changes')
+
+
+def test_paging_returns_every_document_once_across_ties(api):
+    company = api.create_company()
+    # Documents written before change_seq existed share the sequence 0, `_id` breaks the ties
+    legacy: List[str] = [
+        str(api.database[DBCollectionEnum.BOARDS.value].insert_one({
+            'name': f'Legacy {i}', 'description': 'd', 'position': i, 'company_id': company['id'],
+            'version': 1, 'change_seq': 0
+        }).inserted_id)
+        for i in range(3)
+    ]
+    boards = [api.create_board(company['id'], position=i) for i in range(3)]
+    tasks = [api.create_task(boards[0]['id'], position=i) for i in range(4)]
+
+    seen_boards, seen_tasks, _ = sync(api, company['id'], limit=1)
+
+    assert seen_boards == set(legacy) | {board['id'] for board in boards}
+    assert seen_tasks == {task['id'] for task in tasks}
+
+
+def test_cursor_only_returns_later_changes(api):
+    company = api.create_company()
+    board = api.create_board(company['id'])
+    task = api.create_task(board['id'])
+    untouched = api.create_task(board['id'], position=2)
+    _, _, cursor = sync(api, company['id'])
+
+    response = api.post('/v1/post_update_task', {'id': task['id'], 'board_id': board['id'], 'name': 'Renamed'})
+    assert response.status_code == 200, response.text
+
+    seen_boards, seen_tasks, next_cursor = sync(api, company['id'], since=cursor)
+    assert seen_boards == set()
+    assert seen_tasks == {task['id']}
+    assert untouched['id'] not in seen_tasks
+
+    assert sync(api, company['id'], since=next_cursor)[:2] == (set(), set())
+
+
+def test_invalid_cursor_is_rejected(api):
+    company = api.create_company()
+
+    response = api.post('/v1/fetch_changes_since', {'company_id': company['id'], 'since': 'not-a-cursor'})
+
+    assert response.status_code != 200
@@ -0,0 +1,49 @@
+"""
+Company event subscriptions stay within the tenant of the caller.
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.core.api.collections import DBCollectionEnum
+
+
+def test_subscribing_with_another_tenant_header_is_forbidden(api):
+    api_key: str = uuid.uuid4().hex
+    api.database[DBCollectionEnum.SESSIONS.value].insert_one({
+        'user_id': 'tenant-user', 'auth_token': api_key, 'company_code': 'acme',
+        'expires_at': datetime.now(timezone.utc) + timedelta(days=1)
+    })
+
+    response = api.client.get(
+        '/v1/subscribe_company_events',
+        params={'company_id': 'any'},
+        headers={'X-API-Key': api_key, 'X-Company-Code': 'globex'}
+    )
+
+    assert response.status_code == 403
+
+
+def test_events_only_reach_subscribers_of_the_same_tenant(api, monkeypatch):
+    from app.core.common.config import config
+    from app.core.common.event_models import CompanyEvent, EventTypeOptions
+    from app.services.tm_db.tenant import tenant_scope
+    from app.services.tm_events.service import TMEventBroker
+
+    monkeypatch.setattr(config, 'TENANT_ROUTING_MODE', 'database')
+    broker = TMEventBroker()
+    loop = asyncio.new_event_loop()
+
+    try:
+        with tenant_scope('acme'):
+            acme = broker.subscribe('company', loop)
+        with tenant_scope('globex'):
+            globex = broker.subscribe('company', loop)
+            broker.publish(CompanyEvent(event_type=EventTypeOptions.BOARD_UPDATED, company_id='company'))
+
+        loop.run_until_complete(asyncio.sleep(0))
+
+        assert loop.run_until_complete(globex.get(0.1)) is not None
+        assert loop.run_until_complete(acme.get(0.1)) is None
+    finally:
+        loop.close()
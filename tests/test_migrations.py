@@ -0,0 +1,24 @@
+"""
+Data migrations run once, then are recorded.
+"""
+from app.core.api.collections import DBCollectionEnum
+
+
+def test_migrations_are_applied_once(api, monkeypatch):
+    from benchmarks.memory_db import MemoryDatabase
+    from app.services.tm_db.migrations import MIGRATIONS, run_migrations
+    from app.services.tm_db.service import TMMongoDBServicePool
+
+    database = MemoryDatabase('tm_test_migrations')
+    monkeypatch.setattr(TMMongoDBServicePool, '_database', database)
+    monkeypatch.setattr(TMMongoDBServicePool, '_service_pool', {})
+    boards = database[DBCollectionEnum.BOARDS.value]
+
+    boards.insert_one({'name': 'Before', 'company_id': 'company'})
+    assert run_migrations(TMMongoDBServicePool()) == [name for name, _ in MIGRATIONS]
+    assert boards.find_one({'name': 'Before'})['change_seq'] == 0
+
+    # Recorded migrations don't scan the collections again
+    boards.insert_one({'name': 'After', 'company_id': 'company'})
+    assert run_migrations(TMMongoDBServicePool()) == []
+    assert 'change_seq' not in boards.find_one({'name': 'After'})
@@ -0,0 +1,50 @@
+"""
+Conditional updates sent with the `expected_version` the client read.
+"""
+import pytest
+from bson import ObjectId
+
+
+@pytest.mark.parametrize('kind', ['board', 'task'])
+def test_stale_expected_version_conflicts(api, kind):
+    company = api.create_company()
+    board = api.create_board(company['id'])
+    entity = board if kind == 'board' else api.create_task(board['id'])
+    body = {'id': entity['id'], 'board_id': board['id']} if kind == 'task' else {'id': entity['id']}
+
+    first = api.post(f'/v1/post_update_{kind}', {**body, 'name': 'First', 'expected_version': entity['version']})
+    assert first.status_code == 200, first.text
+    assert first.json()['version'] == entity['version'] + 1
+    version = api.get_version(company['id'])
+
+    # A second writer still holding the version it read before the first update
+    second = api.post(f'/v1/post_update_{kind}', {**body, 'name': 'Second', 'expected_version': entity['version']})
+    assert second.status_code == 409
+    assert api.get_version(company['id']) == version
+
+    third = api.post(f'/v1/post_update_{kind}', {**body, 'name': 'Third', 'expected_version': first.json()['version']})
+    assert third.status_code == 200, third.text
+
+
+def test_missing_task_is_not_a_conflict(api):
+    company = api.create_company()
+    board = api.create_board(company['id'])
+
+    response = api.post('/v1/post_update_task', {
+        'id': str(ObjectId()), 'board_id': board['id'], 'name': 'Missing', 'expected_version': 1
+    })
+
+    assert response.status_code not in (200, 409)
+
+
+def test_task_of_another_company_is_not_a_conflict(api):
+    owner = api.create_company()
+    other = api.create_company()
+    board = api.create_board(owner['id'])
+    task = api.create_task(board['id'])
+
+    response = api.post('/v1/post_update_task', {
+        'id': task['id'], 'board_id': board['id'], 'company_id': other['id'], 'name': 'Hijacked', 'expected_version': 0
+    })
+
+    assert response.status_code not in (200, 409)
@@ -0,0 +1,95 @@
+"""
+Concurrent writes to the same company inside the outbox transaction.
+
+Transactions need a replica set, point `TM_TEST_REPLICA_SET_URL` at one to run these tests, e.g.
+`TM_TEST_REPLICA_SET_URL=mongodb://localhost:27017/?replicaSet=rs0 python -m pytest tests`.
+"""
+import os
+import threading
+import uuid
+from typing import List
+
+import pytest
+
+from benchmarks.environment import configure_environment
+
+REPLICA_SET_URL = os.environ.get('TM_TEST_REPLICA_SET_URL')
+
+pytestmark = pytest.mark.skipif(not REPLICA_SET_URL, reason='TM_TEST_REPLICA_SET_URL is not set')
+
+
+@pytest.fixture(scope='module')
+def v1():
+    os.environ.setdefault('NOSQL_DB', f'tm_test_{uuid.uuid4().hex[:8]}')
+    os.environ.setdefault('OUTBOX_RELAY', 'false')
+    configure_environment()
+
+    from pymongo import MongoClient
+    from app.services.tm_db.service import TMMongoDBServicePool
+
+    client = MongoClient(REPLICA_SET_URL)
+    client.admin.command('ping')
+    if client.topology_description.topology_type_name not in ('ReplicaSetWithPrimary', 'Sharded'):
+        pytest.skip('TM_TEST_REPLICA_SET_URL is not a replica set or a sharded cluster')
+    TMMongoDBServicePool._clients[None] = client
+
+    from app.api import v1 as v1_package
+    from app.core.common.config import config
+
+    yield v1_package
+    client.drop_database(config.NOSQL_DB)
+
+
+def invoke(v1, controller: str, payload: dict):
+    from app.core.common.base_schema import APIRequestContext
+
+    ctrl = v1.factory.get_controller(controller, v1.VERSION)
+    return ctrl.invoke(ctrl.get_request_type().model_validate(payload), APIRequestContext())
+
+
+def test_concurrent_updates_in_the_same_company_all_commit(v1):
+    from app.core.api.collections import DBCollectionEnum
+
+    company = invoke(v1, 'post_create_company', {'name': 'Acme', 'description': 'd'})
+    board = invoke(v1, 'post_create_board', {
+        'name': 'Board', 'description': 'd', 'position': 1, 'company_id': company.id
+    })
+    tasks = [
+        invoke(v1, 'post_create_task', {'name': f'Task {i}', 'description': 'd', 'position': i, 'board_id': board.id})
+        for i in range(2)
+    ]
+
+    pool = v1.tm_db_service_pool
+    versions = pool.get_mongodb_service(DBCollectionEnum.COMPANY_VERSIONS.value)
+    outbox = pool.get_mongodb_service(DBCollectionEnum.OUTBOX.value)
+    version_before: int = versions.find_one({'company_id': company.id})['version']
+    events_before: int = outbox.count_documents({'event.company_id': company.id})
+
+    rounds: int = 10
+    barrier = threading.Barrier(len(tasks))
+    errors: List[BaseException] = []
+
+    def update(task_id: str) -> None:
+        for position in range(1, rounds + 1):
+            barrier.wait()
+            try:
+                invoke(v1, 'post_update_task', {
+                    'id': task_id, 'board_id': board.id, 'company_id': company.id, 'position': position
+                })
+            except BaseException as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=update, args=(task.id,)) for task in tasks]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert versions.find_one({'company_id': company.id})['version'] == version_before + rounds * len(tasks)
+    assert outbox.count_documents({'event.company_id': company.id}) == events_before + rounds * len(tasks)
+
+    # Every committed write got its own change sequence
+    task_collection = pool.get_mongodb_service(DBCollectionEnum.TASKS.value)
+    change_seqs = [task['change_seq'] for task in task_collection.find({'board_id': board.id})]
+    assert len(set(change_seqs)) == len(change_seqs)
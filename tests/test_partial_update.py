@@ -0,0 +1,50 @@
+"""
+Partial updates only write the fields the client sent.
+"""
+import uuid
+
+import pytest
+
+from app.core.api.collections import DBCollectionEnum
+
+
+@pytest.mark.parametrize('kind', ['board', 'task'])
+def test_position_zero_and_empty_description_are_written(api, kind):
+    company = api.create_company()
+    board = api.create_board(company['id'], position=3)
+    entity = board if kind == 'board' else api.create_task(board['id'], position=3)
+    body = {'id': entity['id'], 'board_id': board['id']} if kind == 'task' else {'id': entity['id']}
+
+    response = api.post(f'/v1/post_update_{kind}', {**body, 'position': 0, 'description': ''})
+
+    assert response.status_code == 200, response.text
+    assert response.json()['position'] == 0
+    assert response.json()['description'] == ''
+    assert response.json()['name'] == entity['name']
+
+
+def test_fields_not_sent_are_left_untouched(api):
+    company = api.create_company()
+    board = api.create_board(company['id'])
+    task = api.create_task(board['id'], position=4)
+    name: str = f'Renamed {uuid.uuid4().hex}'
+
+    response = api.post('/v1/post_update_task', {'id': task['id'], 'board_id': board['id'], 'name': name})
+
+    assert response.status_code == 200, response.text
+    stored = api.database[DBCollectionEnum.TASKS.value].find_one({'name': name})
+    assert stored['position'] == 4
+    assert stored['description'] == task['description']
+
+
+@pytest.mark.parametrize('changes', [{}, {'name': ''}, {'name': None}, {'position': None}])
+def test_empty_or_null_changes_are_rejected(api, changes):
+    company = api.create_company()
+    board = api.create_board(company['id'])
+    task = api.create_task(board['id'])
+    version = api.get_version(company['id'])
+
+    response = api.post('/v1/post_update_task', {'id': task['id'], 'board_id': board['id'], **changes})
+
+    assert response.status_code != 200
+    assert api.get_version(company['id']) == version
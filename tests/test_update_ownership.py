@@ -0,0 +1,68 @@
+"""
+Updates naming a company that doesn't own the board or task.
+"""
+from bson import ObjectId
+
+from app.core.api.collections import DBCollectionEnum
+
+
+def test_task_update_naming_another_company_is_rejected(api):
+    owner = api.create_company()
+    other = api.create_company()
+    board = api.create_board(owner['id'])
+    task = api.create_task(board['id'])
+    owner_version, other_version = api.get_version(owner['id']), api.get_version(other['id'])
+    outbox = api.database[DBCollectionEnum.OUTBOX.value]
+    other_events: int = outbox.count_documents({'event.company_id': other['id']})
+
+    response = api.post('/v1/post_update_task', {
+        'id': task['id'], 'board_id': board['id'], 'company_id': other['id'], 'name': 'Hijacked'
+    })
+
+    assert response.status_code != 200
+    assert api.get_version(owner['id']) == owner_version
+    assert api.get_version(other['id']) == other_version
+
+    stored = api.database[DBCollectionEnum.TASKS.value].find_one({'_id': ObjectId(task['id'])})
+    assert stored['version'] == task['version']
+    assert outbox.count_documents({'event.company_id': other['id']}) == other_events
+
+
+def test_task_update_naming_another_board_is_rejected(api):
+    company = api.create_company()
+    board = api.create_board(company['id'])
+    other_board = api.create_board(company['id'], position=2)
+    task = api.create_task(board['id'])
+    version = api.get_version(company['id'])
+
+    response = api.post('/v1/post_update_task', {'id': task['id'], 'board_id': other_board['id'], 'name': 'Moved'})
+
+    assert response.status_code != 200
+    assert api.get_version(company['id']) == version
+
+
+def test_board_update_naming_another_company_is_rejected(api):
+    owner = api.create_company()
+    other = api.create_company()
+    board = api.create_board(owner['id'])
+    owner_version, other_version = api.get_version(owner['id']), api.get_version(other['id'])
+
+    response = api.post('/v1/post_update_board', {'id': board['id'], 'company_id': other['id'], 'name': 'Hijacked'})
+
+    assert response.status_code != 200
+    assert api.get_version(owner['id']) == owner_version
+    assert api.get_version(other['id']) == other_version
+
+
+def test_update_stamps_the_owning_company_sequence(api):
+    company = api.create_company()
+    board = api.create_board(company['id'])
+    task = api.create_task(board['id'])
+
+    response = api.post('/v1/post_update_task', {
+        'id': task['id'], 'board_id': board['id'], 'company_id': company['id'], 'name': 'Renamed'
+    })
+
+    assert response.status_code == 200, response.text
+    stored = api.database[DBCollectionEnum.TASKS.value].find_one({'_id': ObjectId(task['id'])})
+    assert stored['change_seq'] == api.get_version(company['id'])